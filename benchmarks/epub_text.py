@@ -0,0 +1,45 @@
+"""
+Compare the HTML-to-text backends on large synthetic EPUBs.
+
+    python -m benchmarks.epub_text --chapters 50 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.synthetic import make_epub
+from smartdeck.extract.epub import extract_epub
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chapters", type=int, nargs="+", default=[50, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for chapters in args.chapters:
+            book = make_epub(Path(tmp) / f"book{chapters}.epub", chapters)
+            size_mb = book.stat().st_size / 2**20
+            results = {}
+            for backend in ("bs4", "fast"):
+                best = float("inf")
+                for _ in range(args.repeat):
+                    t0 = time.perf_counter()
+                    pages = extract_epub(book, html_backend=backend)
+                    best = min(best, time.perf_counter() - t0)
+                results[backend] = (best, pages)
+            assert results["bs4"][1] == results["fast"][1], "backends disagree"
+            slow, fast = results["bs4"][0], results["fast"][0]
+            print(
+                f"{chapters:5d} chapters ({size_mb:5.1f} MB): "
+                f"bs4 {slow:7.3f}s  fast {fast:7.3f}s  x{slow / fast:4.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Accuracy and throughput of the form-table lemmatizer against the full
+pipeline.  The table is built from the first half of the book and both
+lemmatizers run on the second half, so the fallback path is exercised.
+
+    python -m benchmarks.fastlemma --book novel.epub --lang en
+    python -m benchmarks.fastlemma --chapters 40      # synthetic book
+
+Accuracy is the share of the full pipeline's tokens whose lemma the fast
+path gives for the same surface form (tokenization differences aside);
+token counts of both are printed so those differences are visible too.
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import synthetic
+from smartdeck.extract import extract_epub, extract_pdf
+from smartdeck.nlp.fastlemma import (
+    FastLemmatizer,
+    FormTable,
+    pairs_from_pipeline,
+    write_form_table,
+)
+from smartdeck.nlp.processing import tokenize_pages
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--book", type=Path, help="EPUB or PDF (default: synthetic)")
+    parser.add_argument("--chapters", type=int, default=40)
+    parser.add_argument("--lang", default="en")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        book = args.book or synthetic.make_epub(Path(tmp) / "book.epub", args.chapters)
+        texts = (
+            extract_epub(book) if book.suffix.lower() == ".epub" else extract_pdf(book)
+        )
+        half = max(1, len(texts) // 2)
+        train, test = texts[:half], texts[half:] or texts
+
+        t0 = time.perf_counter()
+        table_path = Path(tmp) / "forms.sdfl"
+        forms = write_form_table(pairs_from_pipeline(train, args.lang), table_path)
+        print(
+            f"table: {forms:,d} forms from {len(train)} pages "
+            f"in {time.perf_counter() - t0:.2f}s"
+        )
+
+        t0 = time.perf_counter()
+        full = tokenize_pages(test, args.lang)
+        full_s = time.perf_counter() - t0
+
+        with FormTable(table_path) as table:
+            lemmatizer = FastLemmatizer(table, args.lang)
+            t0 = time.perf_counter()
+            fast = lemmatizer.lemmatize(test)
+            fast_s = time.perf_counter() - t0
+            fallback = lemmatizer.fallback_forms
+            lookup = dict(lemmatizer._cache)
+
+    n_full = sum(map(len, full))
+    n_fast = sum(map(len, fast))
+    agree = sum(
+        lookup.get(w["text"].lower()) == w["lemma"] for page in full for w in page
+    )
+    print(
+        f"full pipeline: {n_full:9,d} tokens {full_s:8.2f}s "
+        f"{n_full / max(full_s, 1e-9):12,.0f} tokens/s"
+    )
+    print(
+        f"form table:    {n_fast:9,d} tokens {fast_s:8.2f}s "
+        f"{n_fast / max(fast_s, 1e-9):12,.0f} tokens/s "
+        f"({fallback:,d} forms via fallback)"
+    )
+    print(
+        f"speedup {full_s / max(fast_s, 1e-9):.1f}x, "
+        f"lemma accuracy {agree / max(n_full, 1):.2%}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Time `Vault.remove_source` for sources of growing size in vaults of
+growing size; removal should scale with the source, not the vault.
+
+    python -m benchmarks.remove_scaling --vault-words 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from smartdeck.vault import Vault
+
+
+def _fill(vault: Vault, words: int) -> None:
+    """Bulk-load `words` lemmas owned by one background deck."""
+    with vault._conn() as con:
+        con.execute("INSERT INTO sources(kind, ident) VALUES('deck', 'background')")
+        con.executemany(
+            "INSERT INTO known_words(id, lang, lemma) VALUES(?, 'en', ?)",
+            ((i, f"bg{i:08d}") for i in range(1, words + 1)),
+        )
+        con.execute(
+            "INSERT INTO word_sources(word_id, src_id) "
+            "SELECT id, (SELECT id FROM sources WHERE ident='background') "
+            "FROM known_words"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--vault-words", type=int, nargs="+", default=[100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--source-words", type=int, nargs="+", default=[10, 100, 1_000, 10_000]
+    )
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.vault_words:
+            vault = Vault(Path(tmp) / f"vault{size}.db")
+            _fill(vault, size)
+            for n in args.source_words:
+                ident = f"deck{n}"
+                # half new words, half shared with the background deck
+                own = [f"{ident}-{i}" for i in range(n - n // 2)]
+                shared = [f"bg{i:08d}" for i in range(1, n // 2 + 1)]
+                vault.add_words("en", own + shared, kind="deck", ident=ident)
+                t0 = time.perf_counter()
+                vault.remove_source("deck", ident)
+                elapsed = time.perf_counter() - t0
+                print(
+                    f"vault {size:9,d} words  source {n:7,d} words: "
+                    f"{elapsed * 1000:8.2f} ms"
+                )
+
+
+if __name__ == "__main__":
+    main()
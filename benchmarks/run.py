@@ -0,0 +1,264 @@
+"""
+End-to-end benchmark runner on synthetic books, decks and vaults.
+
+    python -m benchmarks.run --scale small medium
+    python -m benchmarks.run --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --compare benchmarks/baseline.json --tolerance 0.25
+
+Each benchmark reports the best and mean wall time over `--repeat` runs.
+`--compare` exits with status 1 when a benchmark is slower than its
+baseline by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import statistics
+import sys
+import tempfile
+import time
+from functools import cached_property
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from benchmarks import synthetic
+from smartdeck.deck.builder import build_deck
+from smartdeck.deck.excerpt import capture_excerpts
+from smartdeck.deck.ranking import lemma_forms, rank_excerpts
+from smartdeck.extract import extract_epub, extract_pdf
+from smartdeck.ingest.apkg import ingest_apkg
+from smartdeck.nlp import processing
+from smartdeck.vault import Vault
+
+SCALES: Dict[str, dict] = {
+    "small": dict(chapters=5, pdf_pages=10, vault_words=1_000, apkg_notes=500, top=50),
+    "medium": dict(
+        chapters=40, pdf_pages=60, vault_words=20_000, apkg_notes=5_000, top=200
+    ),
+    "large": dict(
+        chapters=200, pdf_pages=300, vault_words=200_000, apkg_notes=50_000, top=1_000
+    ),
+}
+
+
+class _StubToken:
+    __slots__ = ("text", "lemma_", "pos_", "is_alpha")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.lemma_ = text.lower()
+        self.pos_ = "X"
+        self.is_alpha = True
+
+
+class _StubNLP:
+    """Regex tokenizer standing in for spaCy, to time the code around it."""
+
+    _WORD = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+")
+
+    def pipe(self, texts, batch_size=20):
+        for text in texts:
+            yield [_StubToken(m.group()) for m in self._WORD.finditer(text)]
+
+
+class Fixtures:
+    """Synthetic inputs for one scale, created lazily in `root`."""
+
+    def __init__(self, root: Path, scale: str, stub_nlp: bool) -> None:
+        self.root = root
+        self.params = SCALES[scale]
+        self.stub_nlp = stub_nlp
+
+    @cached_property
+    def epub(self) -> Path:
+        return synthetic.make_epub(self.root / "book.epub", self.params["chapters"])
+
+    @cached_property
+    def pdf(self) -> Path:
+        return synthetic.make_pdf(self.root / "book.pdf", self.params["pdf_pages"])
+
+    @cached_property
+    def apkg(self) -> Path:
+        return synthetic.make_apkg(self.root / "deck.apkg", self.params["apkg_notes"])
+
+    @cached_property
+    def vault(self) -> Vault:
+        return synthetic.make_vault(self.root / "vault.db", self.params["vault_words"])
+
+    @cached_property
+    def texts(self) -> List[str]:
+        return extract_epub(self.epub)
+
+    @cached_property
+    def lemmas(self) -> List[str]:
+        return [w["lemma"] for w in self.tokenize()]
+
+    @cached_property
+    def top_lemmas(self) -> List[str]:
+        _, unknowns, _ = self.vault.coverage("en", self.lemmas)
+        return [lemma for lemma, _ in unknowns.most_common(self.params["top"])]
+
+    def tokenize(self):
+        if not self.stub_nlp:
+            return processing.tokenize_lemmas(self.texts, lang="en")
+        original = processing._spacy_model
+        processing._spacy_model = lambda lang: _StubNLP()
+        try:
+            return processing.tokenize_lemmas(self.texts, lang="en")
+        finally:
+            processing._spacy_model = original
+
+
+# name → setup(fixtures) returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[Fixtures], Callable[[], object]]] = {}
+
+
+def benchmark(name: str):
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@benchmark("extract_epub")
+def _extract_epub(fx: Fixtures):
+    path = fx.epub
+    return lambda: extract_epub(path)
+
+
+@benchmark("extract_pdf")
+def _extract_pdf(fx: Fixtures):
+    path = fx.pdf
+    return lambda: extract_pdf(path)
+
+
+@benchmark("tokenize_lemmas")
+def _tokenize(fx: Fixtures):
+    fx.texts
+    return fx.tokenize
+
+
+@benchmark("vault_coverage")
+def _coverage(fx: Fixtures):
+    vault, lemmas = fx.vault, fx.lemmas
+    return lambda: vault.coverage("en", lemmas)
+
+
+@benchmark("capture_excerpts")
+def _excerpts(fx: Fixtures):
+    texts, top = fx.texts, fx.top_lemmas
+    return lambda: capture_excerpts(texts, top)
+
+
+@benchmark("rank_excerpts")
+def _rank_excerpts(fx: Fixtures):
+    texts, top = fx.texts, fx.top_lemmas
+    known, forms = fx.vault.known_lemmas("en"), lemma_forms(fx.tokenize())
+    return lambda: rank_excerpts(texts, top, known, forms)
+
+
+@benchmark("build_deck")
+def _build_deck(fx: Fixtures):
+    occ = capture_excerpts(fx.texts, fx.top_lemmas)
+    entries = [
+        (lemma, "translation", "ipa", "NOUN", occ[lemma][0], "sentence", occ[lemma][1])
+        for lemma in fx.top_lemmas
+    ]
+    out = fx.root / "out.apkg"
+    return lambda: build_deck("Synthetic", entries, str(out))
+
+
+@benchmark("ingest_apkg")
+def _ingest(fx: Fixtures):
+    path = fx.apkg
+    counter = iter(range(sys.maxsize))
+
+    def run():
+        # a fresh vault every time, so each run does the full insert
+        vault = Vault(fx.root / f"ingest-{next(counter)}.db")
+        ingest_apkg(path, lang="en", vault=vault)
+
+    return run
+
+
+def run_benchmarks(
+    names: List[str],
+    scales: List[str],
+    repeat: int,
+    stub_nlp: bool,
+) -> Dict[str, dict]:
+    results: Dict[str, dict] = {}
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            fx = Fixtures(Path(tmp), scale, stub_nlp)
+            for name in names:
+                fn = BENCHMARKS[name](fx)
+                times = []
+                for _ in range(repeat):
+                    t0 = time.perf_counter()
+                    fn()
+                    times.append(time.perf_counter() - t0)
+                key = f"{name}[{scale}]"
+                results[key] = {"best": min(times), "mean": statistics.mean(times)}
+                print(
+                    f"{key:32s} best {min(times):9.4f}s  "
+                    f"mean {statistics.mean(times):9.4f}s",
+                    flush=True,
+                )
+    return results
+
+
+def compare(
+    results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float
+) -> int:
+    """Print the ratio to the baseline per benchmark; return # regressions."""
+    regressions = 0
+    print(f"\ncompared to baseline (tolerance {tolerance:.0%}):")
+    for key, res in results.items():
+        if key not in baseline:
+            print(f"  {key:32s} (no baseline)")
+            continue
+        ratio = res["best"] / max(baseline[key]["best"], 1e-9)
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"  {key:32s} x{ratio:5.2f}{flag}")
+    return regressions
+
+
+def main(argv: List[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--scale", nargs="+", choices=SCALES, default=["small"])
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--real-nlp",
+        action="store_true",
+        help="Use the real spaCy model instead of the regex stub",
+    )
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--compare", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.only, args.scale, args.repeat, not args.real_nlp)
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2))
+        print(f"\nbaseline written to {args.save_baseline}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""Generate synthetic input files for the benchmarks."""
+
+from __future__ import annotations
+
+import random
+import zipfile
+from pathlib import Path
+from typing import List
+
+_WORDS = (
+    "the of and to in a is that for it as was with be by on not he this "
+    "are or his from at which but have an they you were her she there "
+    "would their we him been has when who will more no if out so said "
+    "what up its about into than them can only other new some could time "
+    "these two may then do first any my now such like our over man me "
+    "even most made after also did many before must through back years "
+    "where much your way well down should because each just those people"
+).split()
+
+
+def vocabulary(size: int, seed: int = 0) -> List[str]:
+    """Common words plus `size` made-up lemmas to act as the long tail."""
+    rng = random.Random(seed)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    rare = {
+        "".join(rng.choice(letters) for _ in range(rng.randint(4, 11)))
+        for _ in range(size)
+    }
+    return _WORDS + sorted(rare)
+
+
+def sentences(n: int, vocab: List[str], seed: int = 0) -> List[str]:
+    """`n` sentences with a Zipf-like word distribution over `vocab`."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(len(vocab))]
+    out = []
+    for _ in range(n):
+        words = rng.choices(vocab, weights, k=rng.randint(6, 20))
+        out.append(" ".join(words).capitalize() + rng.choice(".!?"))
+    return out
+
+
+def make_epub(
+    path: Path,
+    chapters: int,
+    paragraphs: int = 40,
+    vocab_size: int = 5000,
+    seed: int = 0,
+) -> Path:
+    """Write an EPUB with `chapters` spine documents of prose."""
+    vocab = vocabulary(vocab_size, seed)
+    rng = random.Random(seed)
+    manifest, spine = [], []
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("mimetype", "application/epub+zip", zipfile.ZIP_STORED)
+        z.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0"?>'
+            '<container xmlns="urn:oasis:names:tc:opendocument:xmlns:container"'
+            ' version="1.0"><rootfiles><rootfile full-path="OEBPS/content.opf"'
+            ' media-type="application/oebps-package+xml"/></rootfiles></container>',
+        )
+        for c in range(chapters):
+            paras = [
+                "<p>"
+                + " ".join(sentences(rng.randint(3, 8), vocab, rng.random()))
+                + " <em>emphasis</em> &amp; more&nbsp;text.</p>"
+                for _ in range(paragraphs)
+            ]
+            html = (
+                '<?xml version="1.0" encoding="utf-8"?>\n'
+                '<html xmlns="http://www.w3.org/1999/xhtml"><head>'
+                f"<title>Chapter {c + 1}</title><style>p {{ margin: 0 }}</style>"
+                f"</head><body><h1>Chapter {c + 1}</h1>\n"
+                + "\n".join(paras)
+                + "</body></html>"
+            )
+            z.writestr(f"OEBPS/ch{c:04d}.xhtml", html)
+            manifest.append(
+                f'<item id="ch{c}" href="ch{c:04d}.xhtml"'
+                ' media-type="application/xhtml+xml"/>'
+            )
+            spine.append(f'<itemref idref="ch{c}"/>')
+        z.writestr(
+            "OEBPS/content.opf",
+            '<?xml version="1.0"?>'
+            '<package xmlns="http://www.idpf.org/2007/opf" version="2.0">'
+            "<metadata/><manifest>" + "".join(manifest) + "</manifest>"
+            "<spine>" + "".join(spine) + "</spine></package>",
+        )
+    return path
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(
+    path: Path,
+    pages: int,
+    lines_per_page: int = 40,
+    vocab_size: int = 5000,
+    seed: int = 0,
+) -> Path:
+    """Write a text-only PDF (Helvetica, one column) with running headers."""
+    vocab = vocabulary(vocab_size, seed)
+    rng = random.Random(seed)
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in once the page ids are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for p in range(pages):
+        lines = [f"Synthetic Book - Page {p + 1}"]
+        while len(lines) < lines_per_page:
+            lines.extend(sentences(1, vocab, rng.random()))
+        ops = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        ops += [f"({_pdf_escape(line[:95])}) '" for line in lines[:lines_per_page]]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        objects.append(
+            b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream)
+        )
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {pages} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    path.write_bytes(bytes(out))
+    return path
+
+
+def make_apkg(path: Path, notes: int, seed: int = 0) -> Path:
+    """Write an Anki package whose first field holds `notes` distinct words."""
+    import genanki
+
+    words = vocabulary(notes, seed)[:notes]
+    model = genanki.Model(
+        1607392319,
+        "Simple Model",
+        fields=[{"name": "Front"}, {"name": "Back"}],
+        templates=[{"name": "Card 1", "qfmt": "{{Front}}", "afmt": "{{Back}}"}],
+    )
+    deck = genanki.Deck(2059400110, name="Synthetic Deck")
+    for word in words:
+        deck.add_note(genanki.Note(model=model, fields=[word, ""]))
+    genanki.Package(deck).write_to_file(str(path))
+    return path
+
+
+def make_vault(
+    path: Path,
+    words: int,
+    sources: int = 10,
+    lang: str = "en",
+    seed: int = 0,
+):
+    """Create a vault knowing `words` lemmas spread over `sources` decks."""
+    from smartdeck.vault import Vault
+
+    vault = Vault(path)
+    lemmas = vocabulary(words, seed)[:words]
+    per_source = max(1, len(lemmas) // sources)
+    for s in range(sources):
+        chunk = lemmas[s * per_source : (s + 1) * per_source]
+        vault.add_words(lang, chunk, kind="deck", ident=f"synthetic-{s}")
+    return vault
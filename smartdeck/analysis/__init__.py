@@ -0,0 +1,18 @@
+"""Book-level analyses built on top of the vault's coverage."""
+
+from .curve import CoverageCurve, coverage_curve, paginate_lemmas, write_curve
+from .estimate import CoverageEstimate, estimate_coverage, split_units
+from .streaming import SpillCounter, StreamingCoverage, stream_coverage
+
+__all__ = [
+    "CoverageCurve",
+    "coverage_curve",
+    "paginate_lemmas",
+    "write_curve",
+    "CoverageEstimate",
+    "estimate_coverage",
+    "split_units",
+    "SpillCounter",
+    "StreamingCoverage",
+    "stream_coverage",
+]
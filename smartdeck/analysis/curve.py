@@ -0,0 +1,155 @@
+"""
+Coverage per page and per chapter, and the cumulative new-word curve.
+
+Everything comes from one lemmatization of the book: EPUB chapters are
+lemmatized whole, as for plain coverage, and cut into pages by token
+offset afterwards.  Each page's token and unknown-token counts are
+tallied once, and page, chapter and
+running figures are differences of prefix sums over those counts.  The
+unknown set is the key set of `Vault.coverage`'s counter, so no page
+ever goes back to the vault.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from itertools import accumulate
+from pathlib import Path
+from typing import Collection, List, Sequence, Tuple, TypedDict
+
+# tokens per page when an EPUB chapter is cut into pages for the curve
+PAGE_TOKENS = 300
+
+
+class PagePoint(TypedDict):
+    page: int  # 1-based
+    chapter: int | None  # 1-based, None without chapter structure
+    tokens: int
+    unknown: int  # unknown tokens on the page
+    new: int  # unknown lemmas first met on the page
+    coverage: float
+    cumulative_coverage: float  # pages 1..page
+    cumulative_new: int
+
+
+class ChapterPoint(TypedDict):
+    chapter: int
+    first_page: int
+    last_page: int
+    tokens: int
+    unknown: int
+    new: int
+    coverage: float
+
+
+class CoverageCurve(TypedDict):
+    coverage: float
+    pages: List[PagePoint]
+    chapters: List[ChapterPoint]
+
+
+def paginate_lemmas(
+    chapters: Sequence[Sequence[str]], tokens: int = PAGE_TOKENS
+) -> Tuple[List[Sequence[str]], List[int]]:
+    """
+    Cut each chapter's lemmas into pages of `tokens` lemmas.  Returns the
+    pages and the index of each chapter's first page.
+    """
+    pages: List[Sequence[str]] = []
+    starts: List[int] = []
+    for lemmas in chapters:
+        starts.append(len(pages))
+        pages.extend(lemmas[i : i + tokens] for i in range(0, len(lemmas), tokens))
+        if not lemmas:
+            pages.append(lemmas)
+    return pages, starts
+
+
+def _ratio(unknown: int, tokens: int) -> float:
+    return 1.0 - unknown / tokens if tokens else 1.0
+
+
+def coverage_curve(
+    page_lemmas: Sequence[Sequence[str]],
+    unknown: Collection[str],
+    chapter_starts: Sequence[int] | None = None,
+) -> CoverageCurve:
+    """
+    Build the curve from each page's lemmas and the book's unknown lemmas
+    (`unknown`, e.g. the counter returned by `Vault.coverage`).
+    `chapter_starts` are the 0-based first pages of the chapters.
+    """
+    tokens: List[int] = []
+    misses: List[int] = []
+    fresh: List[int] = []
+    seen: set[str] = set()
+    for lemmas in page_lemmas:
+        n_unknown = n_new = 0
+        for lemma in lemmas:
+            if lemma in unknown:
+                n_unknown += 1
+                if lemma not in seen:
+                    seen.add(lemma)
+                    n_new += 1
+        tokens.append(len(lemmas))
+        misses.append(n_unknown)
+        fresh.append(n_new)
+
+    # prefix sums with a leading 0: the total over pages [a, b) is S[b] - S[a]
+    cum_tokens = [0, *accumulate(tokens)]
+    cum_unknown = [0, *accumulate(misses)]
+    cum_new = [0, *accumulate(fresh)]
+
+    n_pages = len(tokens)
+    starts = sorted({0, *chapter_starts}) if chapter_starts else []
+    bounds = [s for s in starts if s < n_pages] + [n_pages]
+    chapter_of = [None] * n_pages
+    chapters: List[ChapterPoint] = []
+    for number, (a, b) in enumerate(zip(bounds, bounds[1:]), start=1):
+        chapter_of[a:b] = [number] * (b - a)
+        chapters.append(
+            ChapterPoint(
+                chapter=number,
+                first_page=a + 1,
+                last_page=b,
+                tokens=cum_tokens[b] - cum_tokens[a],
+                unknown=cum_unknown[b] - cum_unknown[a],
+                new=cum_new[b] - cum_new[a],
+                coverage=_ratio(
+                    cum_unknown[b] - cum_unknown[a], cum_tokens[b] - cum_tokens[a]
+                ),
+            )
+        )
+
+    pages = [
+        PagePoint(
+            page=i + 1,
+            chapter=chapter_of[i],
+            tokens=tokens[i],
+            unknown=misses[i],
+            new=fresh[i],
+            coverage=_ratio(misses[i], tokens[i]),
+            cumulative_coverage=_ratio(cum_unknown[i + 1], cum_tokens[i + 1]),
+            cumulative_new=cum_new[i + 1],
+        )
+        for i in range(n_pages)
+    ]
+    return CoverageCurve(
+        coverage=_ratio(cum_unknown[-1], cum_tokens[-1]),
+        pages=pages,
+        chapters=chapters,
+    )
+
+
+def write_curve(curve: CoverageCurve, dest: str | Path) -> Path:
+    """Write the curve as JSON, or per-page CSV rows for a `.csv` `dest`."""
+    dest = Path(dest)
+    if dest.suffix.lower() == ".csv":
+        with open(dest, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=list(PagePoint.__annotations__))
+            writer.writeheader()
+            writer.writerows(curve["pages"])
+    else:
+        dest.write_text(json.dumps(curve, indent=2), encoding="utf-8")
+    return dest
@@ -0,0 +1,150 @@
+"""
+Coverage estimated from a sample of the book.
+
+The text is cut into page-sized units of `unit_words` words and the units
+into `strata` contiguous runs (so beginning, middle and end are all
+represented).  Units are drawn round-robin over the strata in random order
+and lemmatized one at a time; coverage is the combined ratio estimate
+
+    R = Σ_h N_h ū_h / Σ_h N_h n̄_h        (unknown tokens / tokens)
+
+with its linearised stratified variance.  Sampling stops as soon as both
+ends of the confidence interval fall in the same `coverage_tier`, or when
+every unit has been read (the result is then exact).
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from statistics import NormalDist
+from typing import Callable, Collection, Iterable, List, Sequence, TypedDict
+
+from smartdeck.vault.db import CoverageTier, count_unknown, coverage_tier
+
+# (texts) -> lemmas, e.g. a wrapper around `tokenize_lemmas`
+Lemmatize = Callable[[List[str]], List[str]]
+
+UNIT_WORDS = 300  # about one printed page
+STRATA = 10
+MIN_PER_STRATUM = 2  # needed for a within-stratum variance
+
+
+class CoverageEstimate(TypedDict):
+    coverage: float
+    low: float  # confidence interval on token coverage
+    high: float
+    confidence: float
+    tier: CoverageTier
+    determined: bool  # low and high fall in the same tier
+    exact: bool  # every unit was lemmatized
+    sampled_units: int
+    total_units: int
+    sampled_tokens: int
+    unknowns: Counter[str]  # unknown lemmas seen in the sample
+
+
+def split_units(texts: Iterable[str], unit_words: int = UNIT_WORDS) -> List[str]:
+    """Cut `texts` into chunks of about `unit_words` whitespace words."""
+    units: List[str] = []
+    for text in texts:
+        words = text.split()
+        units.extend(
+            " ".join(words[i : i + unit_words])
+            for i in range(0, len(words), unit_words)
+        )
+    return units
+
+
+def _variance(values: Sequence[float]) -> float:
+    n = len(values)
+    if n < 2:
+        return 0.0
+    mean = sum(values) / n
+    return sum((v - mean) ** 2 for v in values) / (n - 1)
+
+
+def estimate_coverage(
+    texts: Iterable[str],
+    known: Collection[str],
+    lemmatize: Lemmatize,
+    confidence: float = 0.95,
+    unit_words: int = UNIT_WORDS,
+    strata: int = STRATA,
+    max_units: int | None = None,
+    seed: int | None = None,
+) -> CoverageEstimate:
+    """
+    Estimate the token coverage of `texts` against the `known` lemmas by
+    lemmatizing a stratified random sample of page-sized units, stopping
+    once the tier is determined at `confidence` (or after `max_units`).
+    """
+    units = split_units(texts, unit_words)
+    total = len(units)
+    rng = random.Random(seed)
+    strata = max(1, min(strata, total))
+    bounds = [total * h // strata for h in range(strata + 1)]
+    queues = []
+    for h in range(strata):
+        order = list(range(bounds[h], bounds[h + 1]))
+        rng.shuffle(order)
+        queues.append(order)
+    sizes = [bounds[h + 1] - bounds[h] for h in range(strata)]
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    # per stratum: (tokens, unknown tokens) of every sampled unit
+    samples: List[List[tuple[int, int]]] = [[] for _ in range(strata)]
+    unknowns: Counter[str] = Counter()
+    sampled = 0
+    limit = total if max_units is None else min(total, max_units)
+
+    def estimate() -> CoverageEstimate:
+        est_tokens = est_unknown = 0.0
+        for size, sample in zip(sizes, samples):
+            if sample:
+                est_tokens += size * sum(n for n, _ in sample) / len(sample)
+                est_unknown += size * sum(u for _, u in sample) / len(sample)
+        ratio = est_unknown / est_tokens if est_tokens else 0.0
+        var = 0.0
+        for size, sample in zip(sizes, samples):
+            if sample and sampled < total:
+                resid = [u - ratio * n for n, u in sample]
+                fpc = 1 - len(sample) / size
+                var += size * size * fpc * _variance(resid) / len(sample)
+        tokens = sum(n for sample in samples for n, _ in sample)
+        half = z * var**0.5 / est_tokens if est_tokens else 1.0
+        if tokens and sampled < total:
+            # never narrower than if the sampled tokens were independent
+            # draws; guards against a few identical units faking certainty
+            p = (ratio * tokens + 1) / (tokens + 2)
+            half = max(half, z * (p * (1 - p) / tokens) ** 0.5)
+        cov = 1.0 - ratio
+        low, high = max(0.0, cov - half), min(1.0, cov + half)
+        return CoverageEstimate(
+            coverage=cov,
+            low=low,
+            high=high,
+            confidence=confidence,
+            tier=coverage_tier(cov),
+            determined=coverage_tier(low) == coverage_tier(high),
+            exact=sampled == total,
+            sampled_units=sampled,
+            total_units=total,
+            sampled_tokens=tokens,
+            unknowns=unknowns,
+        )
+
+    rounds = 0
+    while sampled < limit:
+        for h in range(strata):
+            if not queues[h] or sampled >= limit:
+                continue
+            lemmas = lemmatize([units[queues[h].pop()]])
+            n_tokens, n_unknown, missing = count_unknown(lemmas, known)
+            unknowns.update(missing)
+            samples[h].append((n_tokens, n_unknown))
+            sampled += 1
+        rounds += 1
+        if rounds >= MIN_PER_STRATUM and estimate()["determined"]:
+            break
+    return estimate()
@@ -0,0 +1,252 @@
+"""
+Bounded-memory coverage for corpora too large to hold in RAM (`diff --stream`).
+
+Pages are extracted and lemmatized one at a time and their lemmas counted
+in a `SpillCounter`.  Whenever the counter grows past `max_entries`
+distinct lemmas, or the process's resident memory passes the memory cap,
+its contents are written to a sorted run file on disk and the in-memory
+counter starts over.  The cap is soft: it only triggers spills, and when
+a spill leaves the process over the cap (memory the counter does not
+own, such as a resident NLP model) the next spill waits for RSS to grow
+by `SPILL_BACKOFF` first.  At the end the runs are k-way merged (`heapq.merge`)
+into one sorted stream, which is merge-joined against the vault's known
+lemmas streamed in the same order, so neither the book's vocabulary nor
+the vault is ever held as a whole.  Only the `top` unknowns are kept.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import shutil
+import tempfile
+from collections import Counter
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple, TypedDict
+
+from smartdeck.utils.profiling import current_rss_bytes, peak_rss_bytes
+from smartdeck.vault.db import CoverageTier, coverage_tier
+
+MAX_ENTRIES = 500_000  # distinct lemmas held in memory between spills
+CHECK_EVERY = 10_000  # tokens between resident-memory checks
+MAX_RUNS = 64  # run files merged at once; more are compacted first
+# after a spill that leaves RSS over the cap, spill again only once RSS
+# has grown this much past what remained
+SPILL_BACKOFF = 1.25
+
+# (lowercase lemma, lemma as counted, occurrences), ascending
+Entry = Tuple[str, str, int]
+
+_UNSAFE = str.maketrans("\t\n\r", "   ")
+
+
+class StreamingCoverage(TypedDict):
+    coverage: float
+    tier: CoverageTier
+    total_tokens: int
+    unknown_tokens: int
+    distinct_lemmas: int
+    unknowns: List[Tuple[str, int]]  # the `top` unknowns, most frequent first
+    spills: int  # run files written
+    peak_rss: int | None
+    memory_cap: int | None
+
+
+def memory_cap_from_env() -> int | None:
+    mb = os.environ.get("SMARTDECK_MEMORY_CAP_MB", "")
+    return int(float(mb) * 2**20) if mb not in ("", "0") else None
+
+
+def _write_run(entries: Iterable[Entry], path: Path) -> None:
+    with open(path, "w", encoding="utf-8", newline="\n") as fh:
+        fh.writelines(f"{low}\t{raw}\t{n}\n" for low, raw, n in entries)
+
+
+def _read_run(path: Path) -> Iterator[Entry]:
+    with open(path, encoding="utf-8", newline="\n") as fh:
+        for line in fh:
+            low, raw, n = line.rstrip("\n").split("\t")
+            yield low, raw, int(n)
+
+
+def _combine(entries: Iterable[Entry]) -> Iterator[Entry]:
+    """Sum the counts of adjacent entries with the same (low, raw)."""
+    for (low, raw), group in groupby(entries, key=itemgetter(0, 1)):
+        yield low, raw, sum(n for _, _, n in group)
+
+
+class SpillCounter:
+    """
+    A lemma counter that spills to sorted run files instead of growing.
+
+    `memory_cap` is in bytes of resident memory for the whole process
+    (None reads SMARTDECK_MEMORY_CAP_MB, unset or 0 = no cap); it is
+    checked every `check_every` tokens and is soft (see `SPILL_BACKOFF`).  Use as a context manager, or call
+    `close`, to remove the run files.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path | None = None,
+        max_entries: int = MAX_ENTRIES,
+        memory_cap: int | None = None,
+        check_every: int = CHECK_EVERY,
+        measure: Callable[[], int | None] = current_rss_bytes,
+    ) -> None:
+        self.max_entries = max_entries
+        self.memory_cap = (
+            memory_cap if memory_cap is not None else memory_cap_from_env()
+        )
+        self.check_every = check_every
+        self._measure = measure
+        self._trigger = self.memory_cap  # RSS that sets off the next spill
+        self._dir = Path(tempfile.mkdtemp(prefix="smartdeck-spill-", dir=directory))
+        self._counts: Counter[str] = Counter()
+        self._runs: List[Path] = []
+        self._since_check = 0
+        self.total = 0  # tokens added
+        self.spills = 0  # run files written, compactions included
+
+    def __enter__(self) -> "SpillCounter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._counts.clear()
+        self._runs.clear()
+        shutil.rmtree(self._dir, ignore_errors=True)
+
+    def update(self, lemmas: Iterable[str]) -> None:
+        counts = self._counts
+        for lemma in lemmas:
+            counts[lemma] += 1
+            self.total += 1
+            self._since_check += 1
+            if len(counts) >= self.max_entries or self._since_check >= self.check_every:
+                self._maybe_spill()
+
+    def _over_cap(self) -> bool:
+        if self._trigger is None:
+            return False
+        rss = self._measure()
+        return rss is not None and rss > self._trigger
+
+    def _maybe_spill(self) -> None:
+        self._since_check = 0
+        if len(self._counts) >= self.max_entries:
+            self.spill()
+        elif self._counts and self._over_cap():
+            self.spill()
+            # a spill that freed too little would otherwise repeat at every
+            # check, writing a tiny run file each time
+            rss = self._measure()
+            over = rss is not None and rss > self.memory_cap
+            self._trigger = int(rss * SPILL_BACKOFF) if over else self.memory_cap
+
+    def _next_path(self) -> Path:
+        self.spills += 1
+        return self._dir / f"run-{self.spills:06d}.tsv"
+
+    def spill(self) -> None:
+        """Write the in-memory counts to a new run file and forget them."""
+        if not self._counts:
+            return
+        entries = sorted(
+            (raw.lower().translate(_UNSAFE), raw.translate(_UNSAFE), n)
+            for raw, n in self._counts.items()
+        )
+        self._counts.clear()
+        path = self._next_path()
+        _write_run(entries, path)
+        self._runs.append(path)
+        if len(self._runs) >= MAX_RUNS:
+            self._compact()
+
+    def _compact(self) -> None:
+        # merge every run into one, so the final merge never has more than
+        # MAX_RUNS files open
+        runs, self._runs = self._runs, []
+        path = self._next_path()
+        _write_run(_combine(heapq.merge(*map(_read_run, runs))), path)
+        for run in runs:
+            run.unlink()
+        self._runs.append(path)
+
+    def merged(self) -> Iterator[Entry]:
+        """Every (low, raw, count) once, ascending; spills what is in memory."""
+        self.spill()
+        return _combine(heapq.merge(*map(_read_run, self._runs)))
+
+
+def merge_join(
+    entries: Iterable[Entry], known_sorted: Iterable[str]
+) -> Iterator[Tuple[str, List[Entry], bool]]:
+    """
+    Group `entries` by lowercase lemma and tell whether each is known.
+    Both inputs must be ascending in code-point order.
+    """
+    known = iter(known_sorted)
+    current = next(known, None)
+    for low, group in groupby(entries, key=itemgetter(0)):
+        while current is not None and current < low:
+            current = next(known, None)
+        yield low, list(group), current == low
+
+
+def _unknown_counts(
+    joined: Iterable[Tuple[str, List[Entry], bool]], tally: List[int]
+) -> Iterator[Tuple[str, int]]:
+    # the same keys as `Vault.coverage`'s Counter: the lowercase lemma with
+    # every spelling's occurrences, plus each capitalised spelling on its own
+    for low, group, known in joined:
+        occurrences = sum(n for _, _, n in group)
+        tally[1] += 1
+        if known:
+            continue
+        tally[0] += occurrences
+        yield low, occurrences
+        for _, raw, n in group:
+            if raw != low:
+                yield raw, n
+
+
+def stream_coverage(
+    lemmas: Iterable[str],
+    known_sorted: Iterable[str],
+    top: int = 20,
+    memory_cap: int | None = None,
+    spill_dir: str | Path | None = None,
+    max_entries: int = MAX_ENTRIES,
+) -> StreamingCoverage:
+    """
+    Token coverage of `lemmas` against `known_sorted` (for instance
+    `Vault.iter_known_sorted(lang)`) in bounded memory.  Coverage and the
+    unknown counts equal `Vault.coverage`'s; ties in `unknowns` are broken
+    alphabetically rather than by first occurrence.
+    """
+    with SpillCounter(spill_dir, max_entries, memory_cap) as counter:
+        counter.update(lemmas)
+        tally = [0, 0]  # unknown tokens, distinct lowercase lemmas
+        unknowns = heapq.nlargest(
+            top,
+            _unknown_counts(merge_join(counter.merged(), known_sorted), tally),
+            key=itemgetter(1),
+        )
+        total, spills, cap = counter.total, counter.spills, counter.memory_cap
+
+    cov = 1.0 - tally[0] / max(1, total)
+    return StreamingCoverage(
+        coverage=cov,
+        tier=coverage_tier(cov),
+        total_tokens=total,
+        unknown_tokens=tally[0],
+        distinct_lemmas=tally[1],
+        unknowns=unknowns,
+        spills=spills,
+        peak_rss=peak_rss_bytes(),
+        memory_cap=cap,
+    )
@@ -0,0 +1,192 @@
+"""
+Resumable `build` runs.
+
+A checkpoint is a small SQLite file named after a hash of the source book
+and of the options that shape the deck.  Finished stages are stored as
+JSON, and translations are written as soon as each one arrives.  So a run
+that crashes or is interrupted in the translation loop can be picked up by
+`build --resume`, which redoes only the missing work.  The file is deleted
+once the deck has been written.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Tuple
+
+_CHECKPOINT_DIR = Path("~/.smartdeck/checkpoints").expanduser()
+_READ_CHUNK = 1 << 20
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS stages (
+    name TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS translations (
+    text   TEXT NOT NULL,
+    src    TEXT NOT NULL,
+    dest   TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (text, src, dest)
+);
+"""
+
+Translate = Callable[[str, str, str], str]  # (text, src, dest) -> translation
+
+
+def default_checkpoint_dir() -> Path:
+    return Path(os.environ.get("SMARTDECK_CHECKPOINT_DIR", str(_CHECKPOINT_DIR)))
+
+
+def run_key(source: str | Path, options: Mapping[str, Any]) -> str:
+    """Hash of the source file's bytes and of `options` (JSON-serialisable)."""
+    digest = hashlib.sha256()
+    with open(source, "rb") as fh:
+        while chunk := fh.read(_READ_CHUNK):
+            digest.update(chunk)
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class Checkpoint:
+    """
+    Stage results and translations of one run.  Safe to share between the
+    translation worker threads; every write is committed right away.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._con = sqlite3.connect(self.path, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode = WAL;")
+        self._con.execute("PRAGMA synchronous = NORMAL;")
+        self._con.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_run(
+        cls,
+        source: str | Path,
+        options: Mapping[str, Any],
+        resume: bool = False,
+        directory: str | Path | None = None,
+    ) -> "Checkpoint":
+        """
+        The checkpoint of `source` built with `options`.  Unless `resume`,
+        whatever an earlier run of the same build left behind is discarded.
+        """
+        base = Path(directory) if directory is not None else default_checkpoint_dir()
+        path = base / f"{run_key(source, options)}.db"
+        if not resume:
+            _unlink(path)
+        return cls(path)
+
+    def __enter__(self) -> "Checkpoint":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._con.close()
+
+    def delete(self) -> None:
+        """Close and remove the checkpoint (the run finished)."""
+        self.close()
+        _unlink(self.path)
+
+    @property
+    def completed(self) -> list[str]:
+        with self._lock:
+            return [name for (name,) in self._con.execute("SELECT name FROM stages")]
+
+    def load(self, name: str) -> Any | None:
+        """Result saved for stage `name`, or None if it never finished."""
+        with self._lock:
+            row = self._con.execute(
+                "SELECT data FROM stages WHERE name=?", (name,)
+            ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def save(self, name: str, data: Any) -> None:
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO stages(name, data) VALUES(?, ?)",
+                (name, json.dumps(data)),
+            )
+
+    def translation(self, text: str, src: str, dest: str) -> Optional[str]:
+        with self._lock:
+            row = self._con.execute(
+                "SELECT result FROM translations WHERE text=? AND src=? AND dest=?",
+                (text, src, dest),
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def save_translation(self, text: str, src: str, dest: str, result: str) -> None:
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO translations(text, src, dest, result) "
+                "VALUES(?, ?, ?, ?)",
+                (text, src, dest, result),
+            )
+
+    @property
+    def translation_count(self) -> int:
+        with self._lock:
+            return self._con.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+
+    def translator(self, translate: Translate) -> Translate:
+        """
+        `translate`, answering from the checkpoint and recording new results.
+        Failures ("") are not recorded, so a resumed run asks again.
+        """
+
+        def run(text: str, src: str, dest: str) -> str:
+            done = self.translation(text, src, dest)
+            if done:
+                return done
+            result = translate(text, src, dest)
+            if result:
+                self.save_translation(text, src, dest, result)
+            return result
+
+        return run
+
+    def excerpts(
+        self,
+        find: Callable[..., Iterable[Tuple[str, Tuple[str, str]]]],
+        name: str = "excerpts",
+    ) -> Callable[..., Iterator[Tuple[str, Tuple[str, str]]]]:
+        """
+        `find` (an `ExcerptFinder`), replayed from stage `name` when it
+        finished before; otherwise its items are saved once exhausted.
+        """
+
+        def run(*args: Any) -> Iterator[Tuple[str, Tuple[str, str]]]:
+            saved = self.load(name)
+            if saved is not None:
+                for lemma, (excerpt, loc) in saved:
+                    yield lemma, (excerpt, loc)
+                return
+            items = []
+            for item in find(*args):
+                items.append(item)
+                yield item
+            self.save(name, items)
+
+        return run
+
+
+def _unlink(path: Path) -> None:
+    for p in (
+        path,
+        path.with_name(path.name + "-wal"),
+        path.with_name(path.name + "-shm"),
+    ):
+        p.unlink(missing_ok=True)
@@ -1,48 +1,117 @@
 from __future__ import annotations
+
 import sys
+from contextlib import ExitStack
+from functools import partial
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, List, Optional
 
 import typer
-import requests
-import epitran
 from typer import Context
 
-from smartdeck.utils.pagespec import parse_pagespec
-from smartdeck.extract.epub import extract_epub
-from smartdeck.extract.pdf import extract_pdf
-from smartdeck.nlp.processing import tokenize_lemmas
-from smartdeck.vault.db import Vault
-from smartdeck.deck.excerpt import capture_excerpts
+from smartdeck.analysis.curve import coverage_curve, paginate_lemmas, write_curve
+from smartdeck.analysis.estimate import estimate_coverage
+from smartdeck.analysis.streaming import stream_coverage
+from smartdeck.checkpoint import Checkpoint
 from smartdeck.deck.builder import build_deck
-
+from smartdeck.deck.excerpt import iter_excerpts
+from smartdeck.deck.ranking import iter_ranked_excerpts, lemma_forms
+from smartdeck.enrich.ipa import IpaService
+from smartdeck.enrich.translate import (
+    TranslationBackend,
+    import_dictionary,
+    make_backend,
+    translate,
+)
+from smartdeck.extract.epub import extract_epub, iter_epub
+from smartdeck.extract.pdf import extract_pdf, iter_pdf
 from smartdeck.ingest.apkg import ingest_apkg
 from smartdeck.ingest.live import ingest_live
+from smartdeck.nlp.fastlemma import (
+    FastLemmatizer,
+    FormTable,
+    default_table_path,
+    pairs_from_pipeline,
+    pairs_from_tsv,
+    write_form_table,
+)
+from smartdeck.nlp.processing import (
+    WordInfo,
+    iter_pages,
+    tokenize_lemmas,
+    tokenize_pages,
+)
+from smartdeck.pipeline import enrich_entries
+from smartdeck.utils.pagespec import parse_pagespec
+from smartdeck.utils.profiling import Profiler
+from smartdeck.utils.profiling import profile_dump as dump_profile
+from smartdeck.vault.db import Vault
+from smartdeck.vault.snapshot import export_vault, import_vault
 
 app = typer.Typer(help="SmartDeck Maker CLI")
 sync_app = typer.Typer(help="Synchronize Anki decks ↔ known‑word vault")
 app.add_typer(sync_app, name="sync")
+dict_app = typer.Typer(help="Offline bilingual dictionaries")
+app.add_typer(dict_app, name="dict")
+vault_app = typer.Typer(help="Maintain the known‑word vault")
+app.add_typer(vault_app, name="vault")
+forms_app = typer.Typer(help="Form → lemma tables for fast lemmatization")
+app.add_typer(forms_app, name="forms")
 
 
-def _translate(word: str, src: str, dest: str) -> str:
+def _translate(
+    word: str, src: str, dest: str, backend: Optional[TranslationBackend] = None
+) -> str:
     """
-    Translate a single word or sentence via Google Translate HTTP endpoint.
+    Translate a single word or sentence with `backend` (default: Google
+    Translate HTTP endpoint); "" if it cannot be translated.
     """
-    url = "https://translate.googleapis.com/translate_a/single"
-    params = {
-        "client": "gtx",
-        "sl": src,
-        "tl": dest,
-        "dt": "t",
-        "q": word,
-    }
-    try:
-        resp = requests.get(url, params=params, timeout=5)
-        resp.raise_for_status()
-        data = resp.json()
-        return data[0][0][0]
-    except Exception:
-        return ""
+    return translate(word, src, dest, backend)
+
+
+@dict_app.command("import")
+def dict_import(
+    source: Path = typer.Argument(..., help="FreeDict .tei or tab-separated file"),
+    src: str = typer.Option("en", "--src", help="Headword language"),
+    dest: str = typer.Option("de", "--dest", help="Translation language"),
+    db: Optional[Path] = typer.Option(
+        None, "--db", help="Dictionary database (default: $SMARTDECK_DICT)"
+    ),
+):
+    """Load a bilingual dictionary for offline translation."""
+    if not source.exists():
+        typer.echo(f"Error: file not found: {source}", err=True)
+        raise typer.Exit(code=1)
+    added = import_dictionary(source, src, dest, db)
+    typer.echo(f"Imported {added} {src}→{dest} entries.")
+
+
+@forms_app.command("build")
+def forms_build(
+    sources: List[Path] = typer.Argument(
+        ..., help="Books (EPUB/PDF) to lemmatize, or form<TAB>lemma .tsv lists"
+    ),
+    lang: str = typer.Option("en", "--lang", "-l"),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Table file (default: ~/.smartdeck/forms-<lang>.sdfl)",
+    ),
+):
+    """Build the form table used by `diff --fast` (earlier sources win)."""
+    pairs = []
+    for source in sources:
+        if not source.exists():
+            typer.echo(f"Error: file not found: {source}", err=True)
+            raise typer.Exit(code=1)
+        if source.suffix.lower() in (".tsv", ".txt"):
+            pairs.extend(pairs_from_tsv(source))
+        else:
+            pairs.extend(pairs_from_pipeline(_extract(source, None, None), lang))
+    dest = output or default_table_path(lang)
+    count = write_form_table(pairs, dest)
+    typer.echo(f"Wrote {count} {lang} forms to {dest}")
 
 
 @sync_app.command("add")
@@ -50,7 +119,9 @@ def sync_add(
     kind: str = typer.Argument(..., help="apkg or live"),
     ident: str = typer.Argument(..., help="Path to .apkg or deck name"),
     lang: str = typer.Option("en", "--lang", "-l", help="Language code"),
-    top: Optional[int] = typer.Option(None, "--top", "-t", help="Max unknowns to ingest"),
+    top: Optional[int] = typer.Option(
+        None, "--top", "-t", help="Max unknowns to ingest"
+    ),
 ):
     vault = Vault()
     if kind == "apkg":
@@ -88,6 +159,116 @@ def sync_remove(
     typer.echo(f"Removed {kind} '{ident}' and any orphaned words.")
 
 
+@vault_app.command("migrate")
+def vault_migrate(
+    batch_size: int = typer.Option(
+        5000, "--batch-size", help="Rows per backfill transaction"
+    ),
+):
+    """Bring the vault schema up to date, including large data backfills."""
+    vault = Vault()
+    before = vault.schema_version
+    deferred = vault.deferred_backfills
+
+    def report(migration, rows: int) -> None:
+        typer.echo(
+            f"  {migration.version}: {migration.description} … {rows} rows", err=True
+        )
+
+    after = vault.migrate(batch_size=batch_size, progress=report)
+    if after != before:
+        typer.echo(f"Migrated vault from version {before} to {after}.")
+    elif deferred:
+        done = ", ".join(str(m.version) for m in deferred)
+        typer.echo(f"Ran deferred backfills ({done}); vault is at version {after}.")
+    else:
+        typer.echo(f"Vault is up to date (version {after}).")
+
+
+@vault_app.command("optimize")
+def vault_optimize(
+    budget: float = typer.Option(5.0, "--budget", help="Time budget in seconds"),
+    full: bool = typer.Option(
+        False, "--full", help="Full VACUUM (also enables incremental vacuum)"
+    ),
+    integrity: bool = typer.Option(
+        True, "--integrity/--no-integrity", help="Run integrity checks"
+    ),
+):
+    """Reclaim free pages, refresh planner statistics and check integrity."""
+    report = Vault().optimize(budget=budget, full=full, integrity=integrity)
+    before, after = report["before"], report["after"]
+    typer.echo(f"{'':12s}{'before':>12s}{'after':>12s}")
+    typer.echo(
+        f"{'size (MB)':12s}{before['size_bytes'] / 2**20:12.2f}"
+        f"{after['size_bytes'] / 2**20:12.2f}"
+    )
+    for key in ("page_count", "freelist_count"):
+        typer.echo(f"{key:12s}{before[key]:12d}{after[key]:12d}")
+    if report["full_vacuum"]:
+        typer.echo("\nVacuum: full")
+    else:
+        typer.echo(f"\nVacuum: {report['vacuumed_pages']} free pages reclaimed")
+    typer.echo(f"ANALYZE: {'done' if report['analyzed'] else 'skipped (budget)'}")
+    if integrity:
+        typer.echo(
+            f"Integrity: {len(report['checked'])} tables checked, "
+            f"{len(report['unchecked'])} left for the next run"
+        )
+    for problem in report["problems"]:
+        typer.echo(f"  {problem}", err=True)
+    typer.echo(f"Finished in {report['elapsed']:.2f}s")
+    if report["problems"]:
+        raise typer.Exit(code=1)
+
+
+@vault_app.command("export")
+def vault_export(
+    dest: Path = typer.Argument(
+        ..., help=".db/.sqlite: SQLite backup; .sdv: compact columnar dump"
+    ),
+):
+    """Write a consistent snapshot of the vault, safe while it is in use."""
+    export_vault(Vault(), dest)
+    typer.echo(f"Exported vault to {dest} ({dest.stat().st_size / 2**20:.2f} MB).")
+
+
+@vault_app.command("import")
+def vault_import(
+    source: Path = typer.Argument(..., help="Snapshot written by 'vault export'"),
+    yes: bool = typer.Option(
+        False, "--yes", "-y", help="Replace a non-empty vault without asking"
+    ),
+):
+    """Replace the vault's contents with a snapshot."""
+    if not source.exists():
+        typer.echo(f"Error: file not found: {source}", err=True)
+        raise typer.Exit(code=1)
+    vault = Vault()
+    if vault.count_words() and not yes:
+        typer.confirm(
+            f"Replace the {vault.count_words()} words in {vault.db_path}?",
+            abort=True,
+        )
+    import_vault(vault, source)
+    typer.echo(f"Imported {source}: {Vault().count_words()} known words.")
+
+
+def _extract(source: Path, pages: Optional[str], virtual_pages: Optional[int]):
+    return (
+        extract_epub(source, pages, virtual_pages)
+        if source.suffix.lower() == ".epub"
+        else extract_pdf(source, pages, virtual_pages)
+    )
+
+
+def _report_profile(prof: Profiler, show: bool, json_path: Optional[Path]) -> None:
+    if show:
+        typer.echo("\n" + prof.format_table(), err=True)
+    if json_path is not None:
+        prof.write_json(json_path)
+
+
 @app.command("diff")
 def diff_cmd(
     source: Path = typer.Argument(..., help="EPUB or PDF file to analyze"),
@@ -95,20 +276,203 @@ def diff_cmd(
     virtual_pages: Optional[int] = typer.Option(None, "--virtual-pages", "-v"),
     top: int = typer.Option(20, "--top", "-t"),
     lang: str = typer.Option("en", "--lang", "-l"),
+    in_db: bool = typer.Option(
+        False, "--in-db", help="Match lemmas inside SQLite (for huge vaults)"
+    ),
+    estimate: bool = typer.Option(
+        False,
+        "--estimate",
+        help="Lemmatize a random sample of pages until the tier is certain",
+    ),
+    confidence: float = typer.Option(
+        0.95,
+        "--confidence",
+        min=0.5,
+        max=0.999,
+        help="Confidence level for --estimate",
+    ),
+    curve: Optional[Path] = typer.Option(
+        None,
+        "--curve",
+        help="Write per-page/per-chapter coverage to a .json or .csv file",
+    ),
+    fast: bool = typer.Option(
+        False,
+        "--fast",
+        help="Lemmatize via the form table (see `forms build`), no POS tagging",
+    ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        help="Bounded memory: stream pages, spill word counts to disk",
+    ),
+    memory_cap: Optional[float] = typer.Option(
+        None,
+        "--memory-cap",
+        min=0,
+        help="With --stream: soft cap; spill word counts once RSS exceeds "
+        "this many MB (default SMARTDECK_MEMORY_CAP_MB)",
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Print per-stage timings"),
+    profile_json: Optional[Path] = typer.Option(
+        None, "--profile-json", help="Write per-stage timings as JSON"
+    ),
+    profile_dump: Optional[Path] = typer.Option(
+        None, "--profile-dump", help="cProfile dump (.html/.txt: pyinstrument)"
+    ),
 ):
-    texts = (
-        extract_epub(source, pages, virtual_pages)
-        if source.suffix.lower() == ".epub"
-        else extract_pdf(source, pages, virtual_pages)
+    if stream and (estimate or curve is not None):
+        typer.echo(
+            "Error: --stream cannot be combined with --estimate or --curve", err=True
+        )
+        raise typer.Exit(code=1)
+    if in_db and (stream or estimate):
+        # --stream reads the vault in order anyway; --estimate needs it in memory
+        typer.echo(
+            "Error: --in-db cannot be combined with --stream or --estimate", err=True
+        )
+        raise typer.Exit(code=1)
+    if memory_cap is not None and not stream:
+        typer.echo("Error: --memory-cap only applies with --stream", err=True)
+        raise typer.Exit(code=1)
+    # closes the form table (--fast) on every way out
+    with ExitStack() as stack:
+        lemmatize_pages = partial(tokenize_pages, lang=lang)
+        iter_lemmatized = partial(iter_pages, lang=lang)
+        if fast:
+            table = default_table_path(lang)
+            if not table.exists():
+                typer.echo(
+                    f"Error: no form table for '{lang}' at {table}; "
+                    "create one with `smartdeck forms build`",
+                    err=True,
+                )
+                raise typer.Exit(code=1)
+            lemmatizer = FastLemmatizer(stack.enter_context(FormTable(table)), lang)
+            lemmatize_pages, iter_lemmatized = (
+                lemmatizer.lemmatize,
+                lemmatizer.iter_pages,
+            )
+        prof = Profiler()
+        if stream:
+            cap = None if memory_cap is None else int(memory_cap * 2**20)
+            with dump_profile(profile_dump):
+                _stream(
+                    source, pages, virtual_pages, lang, top, cap, prof, iter_lemmatized
+                )
+            _report_profile(prof, profile, profile_json)
+            return
+        with dump_profile(profile_dump):
+            with prof.stage("extract") as st:
+                texts = _extract(source, pages, virtual_pages)
+                st.add(len(texts))
+            if estimate:
+                _estimate(texts, lang, confidence, top, prof, lemmatize_pages)
+                _report_profile(prof, profile, profile_json)
+                return
+            with prof.stage("lemmatize") as st:
+                page_lemmas = [
+                    [w["lemma"] for w in page] for page in lemmatize_pages(texts)
+                ]
+                lemmas = [lemma for page in page_lemmas for lemma in page]
+                st.add(len(lemmas))
+            with prof.stage("coverage") as st:
+                pct, unknowns, tier = Vault().coverage(lang, lemmas, in_db=in_db)
+                st.add(len(unknowns))
+            if curve is not None:
+                starts = None
+                if source.suffix.lower() == ".epub" and not virtual_pages:
+                    # spine documents are the chapters; cut them into pages
+                    page_lemmas, starts = paginate_lemmas(page_lemmas)
+                with prof.stage("curve") as st:
+                    write_curve(coverage_curve(page_lemmas, unknowns, starts), curve)
+                    st.add(len(page_lemmas))
+
+        typer.echo(f"Coverage: {pct:.1%}")
+        typer.echo(f"Tier: {tier}")
+        typer.echo(f"\nUnknown lemmas (top {top}):")
+        for lem, cnt in unknowns.most_common(top):
+            typer.echo(f"  {lem} ({cnt})")
+        if curve is not None:
+            typer.echo(f"\nCoverage curve written to {curve}")
+        _report_profile(prof, profile, profile_json)
+
+
+def _stream(
+    source: Path,
+    pages: Optional[str],
+    virtual_pages: Optional[int],
+    lang: str,
+    top: int,
+    memory_cap: Optional[int],
+    prof: Profiler,
+    iter_lemmatized: Callable[[Iterable[str]], Iterator[list[WordInfo]]],
+) -> None:
+    extract = iter_epub if source.suffix.lower() == ".epub" else iter_pdf
+    texts = extract(source, pages, virtual_pages)
+    # the stages interleave, so a single one covers extraction to the merge
+    with prof.stage("stream") as st:
+        lemmas = (w["lemma"] for page in iter_lemmatized(texts) for w in page)
+        res = stream_coverage(
+            lemmas, Vault().iter_known_sorted(lang), top, memory_cap=memory_cap
+        )
+        st.add(res["total_tokens"])
+
+    typer.echo(f"Coverage: {res['coverage']:.1%}")
+    typer.echo(f"Tier: {res['tier']}")
+    typer.echo(f"\nUnknown lemmas (top {top}):")
+    for lem, cnt in res["unknowns"]:
+        typer.echo(f"  {lem} ({cnt})")
+    peak = res["peak_rss"]
+    cap = res["memory_cap"]
+    typer.echo(
+        f"\nTokens: {res['total_tokens']}, distinct lemmas: {res['distinct_lemmas']}, "
+        f"spilled runs: {res['spills']}"
     )
-    tokens = tokenize_lemmas(texts, lang=lang)
-    lemmas = [w["lemma"] for w in tokens]
-    pct, unknowns, tier = Vault().coverage(lang, lemmas)
+    typer.echo(
+        "Peak RSS: "
+        + ("unavailable" if peak is None else f"{peak / 2**20:.1f} MB")
+        + ("" if cap is None else f" (cap {cap / 2**20:.0f} MB)")
+    )
+    if peak is not None and cap is not None and peak > cap:
+        typer.echo(
+            "Warning: peak RSS exceeded the memory cap (the language model and "
+            "the page being processed are not spillable)",
+            err=True,
+        )
+
+
+def _estimate(
+    texts: list[str],
+    lang: str,
+    confidence: float,
+    top: int,
+    prof: Profiler,
+    lemmatize_pages: Callable[[list[str]], list[list[WordInfo]]],
+) -> None:
+    known = Vault().known_lemmas(lang)
+    with prof.stage("lemmatize") as st:
+
+        def lemmatize(chunk: list[str]) -> list[str]:
+            lemmas = [w["lemma"] for page in lemmatize_pages(chunk) for w in page]
+            st.add(len(lemmas))
+            return lemmas
+
+        est = estimate_coverage(texts, known, lemmatize, confidence=confidence)
 
-    typer.echo(f"Coverage: {pct:.1%}")
+    exact = " (exact: every page was read)" if est["exact"] else ""
+    typer.echo(
+        f"Coverage: {est['coverage']:.1%} "
+        f"[{est['low']:.1%} – {est['high']:.1%} at {confidence:.0%}]{exact}"
+    )
+    tier = est["tier"] if est["determined"] else f"{est['tier']} (undetermined)"
     typer.echo(f"Tier: {tier}")
-    typer.echo(f"\nUnknown lemmas (top {top}):")
-    for lem, cnt in unknowns.most_common(top):
+    typer.echo(
+        f"Sampled {est['sampled_units']}/{est['total_units']} pages "
+        f"({est['sampled_tokens']} tokens)"
+    )
+    typer.echo(f"\nUnknown lemmas in sample (top {top}):")
+    for lem, cnt in est["unknowns"].most_common(top):
         typer.echo(f"  {lem} ({cnt})")
 
 
@@ -120,74 +484,160 @@ def build_cmd(
     top: int = typer.Option(100, "--top", "-t"),
     lang: str = typer.Option("en", "--lang", "-l"),
     output: Path = typer.Option(Path("deck.apkg"), "--output", "-o"),
+    dict_path: Optional[Path] = typer.Option(
+        None, "--dict", help="Dictionary database for offline translation"
+    ),
+    offline: bool = typer.Option(
+        False, "--offline", help="Never fall back to HTTP translation"
+    ),
+    rank_excerpts: bool = typer.Option(
+        False,
+        "--rank-excerpts",
+        help="Pick each word's sentence with the fewest other unknown words",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Continue an interrupted build of the same book and options",
+    ),
+    profile: bool = typer.Option(False, "--profile", help="Print per-stage timings"),
+    profile_json: Optional[Path] = typer.Option(
+        None, "--profile-json", help="Write per-stage timings as JSON"
+    ),
+    profile_dump: Optional[Path] = typer.Option(
+        None, "--profile-dump", help="cProfile dump (.html/.txt: pyinstrument)"
+    ),
 ):
     """
     Build an Anki deck from the top‑N unknown words in a book,
     fetching translations and IPA on the fly (English⇄German).
     """
-    # 1) Extract & lemmatize
-    texts = (
-        extract_epub(source, pages, virtual_pages)
-        if source.suffix.lower() == ".epub"
-        else extract_pdf(source, pages, virtual_pages)
-    )
-    tokens = tokenize_lemmas(texts, lang=lang)
-    lemmas = [w["lemma"] for w in tokens]
+    try:
+        backend = make_backend(dict_path, offline=offline)
+    except FileNotFoundError as exc:
+        typer.echo(f"Error: {exc}", err=True)
+        raise typer.Exit(code=1)
+    # everything that changes which words and sentences end up in the deck
+    options = {
+        "pages": pages,
+        "virtual_pages": virtual_pages,
+        "top": top,
+        "lang": lang,
+        "dict": dict_path,
+        "offline": offline,
+        "rank_excerpts": rank_excerpts,
+    }
+    checkpoint = Checkpoint.for_run(source, options, resume=resume)
+    if resume and checkpoint.completed:
+        typer.echo(
+            f"Resuming: {', '.join(checkpoint.completed)} done, "
+            f"{checkpoint.translation_count} translations saved",
+            err=True,
+        )
+    prof = Profiler()
+    try:
+        with dump_profile(profile_dump):
+            _build(
+                source,
+                pages,
+                virtual_pages,
+                top,
+                lang,
+                output,
+                prof,
+                backend,
+                rank=rank_excerpts,
+                checkpoint=checkpoint,
+            )
+    except BaseException:
+        checkpoint.close()
+        typer.echo(
+            "Build interrupted; rerun with --resume to continue where it stopped",
+            err=True,
+        )
+        raise
+    checkpoint.delete()
+    typer.echo(f"✅ Deck written to {output}")
+    _report_profile(prof, profile, profile_json)
 
-    # 2) Map lemma → POS
-    pos_map = {w["lemma"]: w["pos"] for w in tokens}
 
-    # 3) Coverage & select top unknowns
+def _build(
+    source: Path,
+    pages: Optional[str],
+    virtual_pages: Optional[int],
+    top: int,
+    lang: str,
+    output: Path,
+    prof: Profiler,
+    backend: Optional[TranslationBackend] = None,
+    rank: bool = False,
+    checkpoint: Optional[Checkpoint] = None,
+) -> None:
     vault = Vault()
-    _, unknowns, _ = vault.coverage(lang, lemmas)
-    top_lemmas = [l for l, _ in unknowns.most_common(top)]
+    analysis = checkpoint.load("analysis") if checkpoint is not None else None
+    if analysis is None:
+        # 1) Extract & lemmatize
+        with prof.stage("extract") as st:
+            texts = _extract(source, pages, virtual_pages)
+            st.add(len(texts))
+        with prof.stage("lemmatize") as st:
+            tokens = tokenize_lemmas(texts, lang=lang)
+            lemmas = [w["lemma"] for w in tokens]
+            st.add(len(lemmas))
 
-    # 4) Capture excerpts
-    occ = capture_excerpts(texts, top_lemmas)
+        # 2) Map lemma → POS
+        pos_map = {w["lemma"]: w["pos"] for w in tokens}
 
-    # 5) Fetch word translations
-    dest = "de" if lang.lower().startswith("en") else "en"
-    translations = {
-        lemma: _translate(lemma, src=lang, dest=dest)
-        for lemma in top_lemmas
-    }
+        # 3) Coverage & select top unknowns
+        with prof.stage("coverage") as st:
+            _, unknowns, _ = vault.coverage(lang, lemmas)
+            top_lemmas = [l for l, _ in unknowns.most_common(top)]
+            st.add(len(lemmas))
 
-    # 6) Generate IPA via Epitran
-    iso3 = {"en": "eng", "de": "deu"}.get(lang.lower(), lang.lower())
-    epi = epitran.Epitran(f"{iso3}-Latn")
-    ipas = {lemma: epi.transliterate(lemma) for lemma in top_lemmas}
-
-    # 7) Translate each full excerpt sentence
-    sent_trans = {
-        lemma: _translate(occ[lemma][0], src=lang, dest=dest)
-        for lemma in top_lemmas
-    }
+        # only what the later stages read is checkpointed, not every token
+        analysis = {
+            "texts": texts,
+            "top_lemmas": top_lemmas,
+            "pos_map": pos_map,
+            "forms": lemma_forms(tokens) if rank else {},
+        }
+        if checkpoint is not None:
+            checkpoint.save("analysis", analysis)
+    texts, top_lemmas = analysis["texts"], analysis["top_lemmas"]
+    pos_map = analysis["pos_map"]
 
-    # 8) Build entries:
-    #    (lemma, word‑translation, ipa, pos, excerpt, sent‑translation, loc)
-    entries: list[tuple[str, ...]] = []
-    for lemma in top_lemmas:
-        entries.append((
-            lemma,
-            translations.get(lemma, ""),
-            ipas.get(lemma, ""),
-            pos_map.get(lemma, ""),
-            occ[lemma][0],
-            sent_trans.get(lemma, ""),
-            occ[lemma][1],
-        ))
+    # 4–8) Excerpts, word/sentence translations and IPA, overlapped
+    find_excerpts = iter_excerpts
+    if rank:
+        known, forms = vault.known_lemmas(lang), analysis["forms"]
+        find_excerpts = partial(iter_ranked_excerpts, known=known, forms=forms)
+    translate_fn = partial(_translate, backend=backend)
+    if checkpoint is not None:
+        find_excerpts = checkpoint.excerpts(find_excerpts)
+        translate_fn = checkpoint.translator(translate_fn)
+    with IpaService(vault) as ipa:
+        entries, occ = enrich_entries(
+            texts,
+            top_lemmas,
+            pos_map,
+            lang,
+            translate=translate_fn,
+            ipa=ipa,
+            prof=prof,
+            find_excerpts=find_excerpts,
+        )
 
     # 9) Persist & write deck
-    vault.add_words(
-        lang,
-        top_lemmas,
-        kind="book",
-        ident=str(source),
-        occurrences=occ,
-    )
-    build_deck(source.name, entries, str(output))
-
-    typer.echo(f"✅ Deck written to {output}")
+    with prof.stage("package") as st:
+        vault.add_words(
+            lang,
+            top_lemmas,
+            kind="book",
+            ident=str(source),
+            occurrences=occ,
+        )
+        build_deck(source.name, entries, str(output))
+        st.add(len(entries))
 
 
 @app.callback(invoke_without_command=True)
@@ -197,6 +647,7 @@ def main(
 ):
     if version:
         import pkg_resources
+
         v = pkg_resources.get_distribution("smart-deck-maker").version
         typer.echo(v)
         raise typer.Exit()
@@ -207,4 +658,3 @@ def main(
 
 if __name__ == "__main__":
     app()
-
@@ -1,7 +1,14 @@
 # smartdeck/deck/__init__.py
 
-from .excerpt import capture_excerpts
 from .builder import build_deck
+from .excerpt import capture_excerpts, iter_excerpts
+from .ranking import iter_ranked_excerpts, lemma_forms, rank_excerpts
 
-__all__ = ["capture_excerpts", "build_deck"]
-
+__all__ = [
+    "capture_excerpts",
+    "iter_excerpts",
+    "lemma_forms",
+    "rank_excerpts",
+    "iter_ranked_excerpts",
+    "build_deck",
+]
@@ -1,19 +1,31 @@
 import re
-from typing import Iterable, Dict, Tuple
+from typing import Dict, Iterable, Iterator, Tuple
 
 # Naïve sentence splitter (keeps punctuation)
-_SENTENCE_RE = re.compile(r'([^\.!?]+[\.!?])', re.UNICODE)
+_SENTENCE_RE = re.compile(r"([^\.!?]+[\.!?])", re.UNICODE)
+
 
 def _word_pattern(lemma: str):
-    return re.compile(rf'\b{re.escape(lemma)}\b', re.IGNORECASE)
+    return re.compile(rf"\b{re.escape(lemma)}\b", re.IGNORECASE)
+
 
 def split_sentences(text: str) -> list[str]:
     """Split text into sentences, preserving the terminator."""
     return _SENTENCE_RE.findall(text)
 
+
+def _clip(text: str, start: int) -> str:
+    """Truncate `text` to ~120 chars around the match at `start`."""
+    if len(text) > 120:
+        a = max(0, start - 40)
+        text = text[a : a + 120].strip()
+        if not text.endswith(("!", ".", "?")):
+            text += "…"
+    return text
+
+
 def capture_excerpts(
-    pages: Iterable[str],
-    lemmas: Iterable[str]
+    pages: Iterable[str], lemmas: Iterable[str]
 ) -> Dict[str, Tuple[str, str]]:
     """
     For each lemma, find the first sentence in pages that contains it.
@@ -24,8 +36,18 @@ def capture_excerpts(
     with a fuzzy location "page:?".  This guarantees you’ll always get back
     something (even if it’s just a snippet) rather than "".
     """
+    return dict(iter_excerpts(pages, lemmas))
+
+
+def iter_excerpts(
+    pages: Iterable[str], lemmas: Iterable[str]
+) -> Iterator[Tuple[str, Tuple[str, str]]]:
+    """
+    Streaming form of `capture_excerpts`: yield `(lemma, (excerpt, loc))`
+    as soon as each lemma's sentence is found, in page order, followed by
+    the fallback snippets for lemmas without a sentence match.
+    """
     needed = set(lemmas)
-    seen: Dict[str, Tuple[str, str]] = {}
 
     # 1) First pass: sentence‑by‑sentence
     for p_idx, page in enumerate(pages, start=1):
@@ -33,19 +55,13 @@ def capture_excerpts(
             text = sent.strip()
             for lemma in list(needed):
                 if _word_pattern(lemma).search(text):
-                    low = text.lower()
-                    start = low.find(lemma.lower())
-                    # truncate to ~120 chars around the match
-                    if len(text) > 120:
-                        a = max(0, start - 40)
-                        text = text[a : a + 120].strip()
-                        if not text.endswith(("!", ".", "?")):
-                            text += "…"
+                    start = text.lower().find(lemma.lower())
+                    text = _clip(text, start)
                     loc = f"{p_idx}:{s_idx}"
-                    seen[lemma] = (text, loc)
+                    yield lemma, (text, loc)
                     needed.remove(lemma)
             if not needed:
-                return seen
+                return
 
     # 2) Fallback: substring search for anything left
     for lemma in needed:
@@ -57,11 +73,10 @@ def capture_excerpts(
                 # grab a window around it
                 start = max(0, idx - 40)
                 snippet = page[start : start + 120].strip()
-                if len(snippet) < len(page) and not snippet.endswith(("!", ".", "?", "…")):
+                if len(snippet) < len(page) and not snippet.endswith(
+                    ("!", ".", "?", "…")
+                ):
                     snippet += "…"
                 loc = f"{p_idx}:?"
                 break
-        seen[lemma] = (snippet, loc)
-
-    return seen
-
+        yield lemma, (snippet, loc)
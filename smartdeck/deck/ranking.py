@@ -0,0 +1,134 @@
+"""
+i+1 excerpt selection.
+
+`capture_excerpts` takes the first sentence that contains a lemma.  The
+ranker instead scores every sentence of the book once, by how many
+distinct lemmas in it the vault does not know, and gives each target the
+sentence where it is (as nearly as possible) the only unknown word.
+
+Sentences are split with the same splitter as `capture_excerpts` and
+their words are mapped back to lemmas through the surface forms the
+lemmatizer saw (`lemma_forms`); words it never saw count as their own
+lemma.  Lemmas are interned to small ints while scanning, and an
+inverted index target → sentences makes the final pick one pass over
+each target's own sentences.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import (
+    TYPE_CHECKING,
+    Collection,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+)
+
+from .excerpt import _clip, iter_excerpts, split_sentences
+
+_TOKEN_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+")
+# sentences shorter than this many words make poor card context
+MIN_WORDS = 4
+MAX_CHARS = 120
+
+if TYPE_CHECKING:  # keep the NLP stack out of deck imports
+    from smartdeck.nlp.processing import WordInfo
+
+
+def lemma_forms(tokens: Iterable["WordInfo"]) -> Dict[str, str]:
+    """Map each lowercase surface form seen by the lemmatizer to its lemma."""
+    return {w["text"].lower(): w["lemma"] for w in tokens}
+
+
+def rank_excerpts(
+    pages: Iterable[str],
+    lemmas: Iterable[str],
+    known: Collection[str],
+    forms: Mapping[str, str] | None = None,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    For each lemma pick the sentence with the fewest *other* unknown
+    lemmas (not in `known`).  Ties prefer sentences of at least
+    `MIN_WORDS` words, then ones that fit `MAX_CHARS` unclipped, then the
+    earliest.  Returns `{ lemma: (excerpt, "page:sent_index") }` like
+    `capture_excerpts`, whose fallback snippet covers lemmas that appear
+    in no sentence.
+    """
+    return dict(iter_ranked_excerpts(pages, lemmas, known, forms))
+
+
+def iter_ranked_excerpts(
+    pages: Iterable[str],
+    lemmas: Iterable[str],
+    known: Collection[str],
+    forms: Mapping[str, str] | None = None,
+) -> Iterator[Tuple[str, Tuple[str, str]]]:
+    """Streaming form of `rank_excerpts`, yielding in `lemmas` order."""
+    pages = list(pages)
+    forms = forms or {}
+    targets = list(dict.fromkeys(lemmas))
+    # lemmas are matched lowercased, as `Vault.coverage` matches them, so
+    # "Haus" (a German noun lemma) finds "haus"/"Haus" and is known if
+    # "haus" is; targets take ids 0..k-1, so "is a target" is one comparison
+    ids: Dict[str, int] = {}
+    for lemma in targets:
+        ids.setdefault(lemma.lower(), len(ids))
+    unknown = bytearray(key not in known for key in ids)
+    n_targets = len(ids)
+    postings: List[List[Tuple[int, int]]] = [[] for _ in range(n_targets)]
+
+    texts: List[str] = []
+    locs: List[str] = []
+    unknown_counts: List[int] = []
+    word_counts: List[int] = []
+    for p_idx, page in enumerate(pages, start=1):
+        for s_idx, sent in enumerate(split_sentences(page), start=1):
+            text = sent.strip()
+            n = len(texts)
+            seen = set()
+            n_unknown = n_words = 0
+            for m in _TOKEN_RE.finditer(text):
+                n_words += 1
+                low = m.group().lower()
+                lemma = forms.get(low, low).lower()
+                lid = ids.get(lemma)
+                if lid is None:
+                    lid = ids[lemma] = len(ids)
+                    unknown.append(lemma not in known)
+                if lid in seen:
+                    continue
+                seen.add(lid)
+                n_unknown += unknown[lid]
+                if lid < n_targets:
+                    postings[lid].append((n, m.start()))
+            if n_words:
+                texts.append(text)
+                locs.append(f"{p_idx}:{s_idx}")
+                unknown_counts.append(n_unknown)
+                word_counts.append(n_words)
+
+    missing: List[str] = []
+    for lemma in targets:
+        tid = ids[lemma.lower()]
+        hits = postings[tid]
+        if not hits:
+            missing.append(lemma)
+            continue
+        own = unknown[tid]
+        n, start = min(
+            hits,
+            key=lambda hit: (
+                unknown_counts[hit[0]] - own,
+                word_counts[hit[0]] < MIN_WORDS,
+                len(texts[hit[0]]) > MAX_CHARS,
+                hit[0],
+            ),
+        )
+        yield lemma, (_clip(texts[n], start), locs[n])
+
+    if missing:
+        yield from iter_excerpts(pages, missing)
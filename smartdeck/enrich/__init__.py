@@ -0,0 +1,21 @@
+"""Card enrichment: IPA transcriptions and translations."""
+
+from .ipa import IpaService
+from .translate import (
+    ChainBackend,
+    DictionaryBackend,
+    HttpBackend,
+    TranslationBackend,
+    import_dictionary,
+    make_backend,
+)
+
+__all__ = [
+    "IpaService",
+    "TranslationBackend",
+    "HttpBackend",
+    "DictionaryBackend",
+    "ChainBackend",
+    "import_dictionary",
+    "make_backend",
+]
@@ -0,0 +1,132 @@
+"""Batched, cached IPA transcription via Epitran."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+
+import epitran
+
+from smartdeck.utils.profiling import Stage
+from smartdeck.vault.db import Vault
+from smartdeck.vault.lexicon import MappedLemmaTable
+
+_ISO3 = {"en": "eng", "de": "deu"}
+
+# (lang, lemmas) -> transcriptions; must be a picklable top-level function
+Transliterator = Callable[[str, List[str]], List[str]]
+
+
+@lru_cache(maxsize=None)
+def _epitran(lang: str) -> epitran.Epitran:
+    """
+    Load & cache one Epitran instance per language for this process.
+    """
+    iso3 = _ISO3.get(lang.lower(), lang.lower())
+    return epitran.Epitran(f"{iso3}-Latn")
+
+
+def transliterate_batch(lang: str, lemmas: List[str]) -> List[str]:
+    epi = _epitran(lang)
+    return [epi.transliterate(lemma) for lemma in lemmas]
+
+
+def _transliterate_ids(
+    transliterate: Transliterator, lang: str, table: str, ids: array
+) -> List[str]:
+    """Worker side: decode `ids` through the mapped lemma table, then transcribe."""
+    with MappedLemmaTable(table) as lemmas:
+        return transliterate(lang, lemmas.decode(ids))
+
+
+class IpaService:
+    """
+    Lemma → IPA with a persistent per-language cache in the vault.
+
+    Only lemmas never transcribed before reach Epitran; batches of at least
+    `parallel_threshold` new lemmas are split across worker processes.  The
+    pool is started on first use with the "spawn" method (forking a process
+    that runs translation threads is unsafe) and kept until `close()`.
+    Workers receive `array('I')` lemma ids and decode them through the
+    vault's lemma table, exported once per batch and memory-mapped by
+    every worker, instead of pickled strings.
+    """
+
+    def __init__(
+        self,
+        vault: Vault | None = None,
+        workers: int | None = None,
+        parallel_threshold: int = 200,
+        transliterate: Transliterator = transliterate_batch,
+    ) -> None:
+        self.vault = vault or Vault()
+        self.workers = workers or os.cpu_count() or 1
+        self.parallel_threshold = parallel_threshold
+        self.transliterate = transliterate
+        self._pool: ProcessPoolExecutor | None = None
+        self._tables: tempfile.TemporaryDirectory | None = None
+
+    def __enter__(self) -> "IpaService":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        if self._tables is not None:
+            self._tables.cleanup()
+            self._tables = None
+
+    def transliterate_many(
+        self,
+        lang: str,
+        lemmas: Iterable[str],
+        stage: Stage | None = None,
+    ) -> Dict[str, str]:
+        """Return {lemma: ipa}; cache hits/misses are recorded on `stage`."""
+        distinct = list(dict.fromkeys(lemmas))
+        ipas = self.vault.cached_ipa(lang, distinct)
+        missing = [lemma for lemma in distinct if lemma not in ipas]
+        if stage is not None:
+            stage.hit(len(distinct) - len(missing))
+            stage.miss(len(missing))
+        if missing:
+            fresh = dict(zip(missing, self._compute(lang, missing)))
+            self.vault.store_ipa(lang, fresh)
+            ipas.update(fresh)
+        return {lemma: ipas[lemma] for lemma in distinct}
+
+    def _compute(self, lang: str, lemmas: List[str]) -> List[str]:
+        if self.workers < 2 or len(lemmas) < self.parallel_threshold:
+            return self.transliterate(lang, lemmas)
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            self._tables = tempfile.TemporaryDirectory(prefix="smartdeck-ipa-")
+        ids = array("I", self.vault.intern_lemmas(lang, lemmas))
+        # replaced atomically, so workers still mapping an older export keep it
+        table = str(
+            self.vault.export_lemma_table(lang, Path(self._tables.name) / f"{lang}.lex")
+        )
+        size = -(-len(ids) // self.workers)
+        chunks = [ids[i : i + size] for i in range(0, len(ids), size)]
+        n = len(chunks)
+        parts = self._pool.map(
+            _transliterate_ids,
+            [self.transliterate] * n,
+            [lang] * n,
+            [table] * n,
+            chunks,
+        )
+        return [ipa for part in parts for ipa in part]
@@ -0,0 +1,192 @@
+"""Pluggable translation backends: Google HTTP and offline dictionaries."""
+
+from __future__ import annotations
+
+import csv
+import os
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, List, Optional, Protocol, Tuple
+
+import requests
+
+_DICT_PATH = Path("~/.smartdeck/dict.db").expanduser()
+_TEI = "{http://www.tei-c.org/ns/1.0}"
+
+
+class TranslationBackend(Protocol):
+    def translate(self, text: str, src: str, dest: str) -> Optional[str]:
+        """Return the translation of `text`, or None if this backend has none."""
+        ...
+
+
+class HttpBackend:
+    """Google Translate HTTP endpoint (needs network access)."""
+
+    url = "https://translate.googleapis.com/translate_a/single"
+
+    def __init__(self, timeout: float = 5) -> None:
+        self.timeout = timeout
+
+    def translate(self, text: str, src: str, dest: str) -> Optional[str]:
+        params = {
+            "client": "gtx",
+            "sl": src,
+            "tl": dest,
+            "dt": "t",
+            "q": text,
+        }
+        try:
+            resp = requests.get(self.url, params=params, timeout=self.timeout)
+            resp.raise_for_status()
+            return resp.json()[0][0][0]
+        except Exception:
+            return None
+
+
+class DictionaryBackend:
+    """
+    Offline word lookups in an indexed SQLite table of bilingual entries
+    (see `import_dictionary`).  Only single headwords are translated;
+    anything else, e.g. whole sentences, is a miss.
+    """
+
+    def __init__(self, path: str | Path | None = None) -> None:
+        self.path = Path(path) if path is not None else default_dict_path()
+        # one read-only connection shared by the translation worker threads
+        self._con = sqlite3.connect(
+            f"file:{self.path}?mode=ro", uri=True, check_same_thread=False
+        )
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._con.close()
+
+    def translate(self, text: str, src: str, dest: str) -> Optional[str]:
+        word = text.strip().lower()
+        if not word or " " in word:
+            return None
+        with self._lock:
+            row = self._con.execute(
+                "SELECT translation FROM entries "
+                "WHERE src=? AND dest=? AND headword=?",
+                (src, dest, word),
+            ).fetchone()
+        return row[0] if row else None
+
+
+class ChainBackend:
+    """Ask each backend in turn; the first one with an answer wins."""
+
+    def __init__(self, backends: List[TranslationBackend]) -> None:
+        self.backends = backends
+
+    def translate(self, text: str, src: str, dest: str) -> Optional[str]:
+        for backend in self.backends:
+            if (result := backend.translate(text, src, dest)) is not None:
+                return result
+        return None
+
+
+def default_dict_path() -> Path:
+    return Path(os.environ.get("SMARTDECK_DICT", str(_DICT_PATH))).expanduser()
+
+
+def make_backend(
+    dict_path: str | Path | None = None,
+    offline: bool = False,
+) -> TranslationBackend:
+    """
+    Offline dictionary first (if one exists), Google HTTP only on a miss.
+    With `offline=True` the HTTP fallback is left out entirely.
+    """
+    path = Path(dict_path) if dict_path is not None else default_dict_path()
+    backends: List[TranslationBackend] = []
+    if path.exists():
+        backends.append(DictionaryBackend(path))
+    elif dict_path is not None:
+        raise FileNotFoundError(f"dictionary not found: {path}")
+    if not offline:
+        backends.append(HttpBackend())
+    return ChainBackend(backends)
+
+
+def translate(
+    text: str,
+    src: str,
+    dest: str,
+    backend: TranslationBackend | None = None,
+) -> str:
+    """Translate `text`, returning "" when no backend knows it."""
+    result = (backend or HttpBackend()).translate(text, src, dest)
+    return result or ""
+
+
+# ---------------------------------------------------------------- importing
+
+
+def _read_tsv(path: Path) -> Iterator[Tuple[str, str]]:
+    """`headword<TAB>translation[<TAB>…]` lines, e.g. Wiktionary/dict.cc dumps."""
+    with open(path, encoding="utf-8", newline="") as fh:
+        for row in csv.reader(fh, delimiter="\t", quoting=csv.QUOTE_NONE):
+            if len(row) >= 2 and row[0] and not row[0].startswith("#"):
+                yield row[0], row[1]
+
+
+def _read_tei(path: Path) -> Iterator[Tuple[str, str]]:
+    """FreeDict TEI: entry/form/orth → first sense/cit[@type=trans]/quote."""
+    for _, elem in ET.iterparse(path, events=("end",)):
+        if elem.tag != f"{_TEI}entry":
+            continue
+        orth = elem.findtext(f"{_TEI}form/{_TEI}orth")
+        quote = None
+        for cit in elem.iter(f"{_TEI}cit"):
+            if cit.get("type") == "trans":
+                quote = cit.findtext(f"{_TEI}quote")
+                if quote:
+                    break
+        if orth and quote:
+            yield orth, quote
+        elem.clear()
+
+
+def import_dictionary(
+    source: str | Path,
+    src: str,
+    dest: str,
+    db_path: str | Path | None = None,
+) -> int:
+    """
+    Load a bilingual dictionary file (`.tei` FreeDict XML, otherwise
+    tab-separated) into the lookup table at `db_path`.  Headwords are
+    lowercased; the first translation of a headword wins.  Returns the
+    number of entries added.
+    """
+    source = Path(source)
+    db = Path(db_path) if db_path is not None else default_dict_path()
+    db.parent.mkdir(parents=True, exist_ok=True)
+    reader = _read_tei if source.suffix.lower() in (".tei", ".xml") else _read_tsv
+
+    con = sqlite3.connect(db)
+    try:
+        con.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " src TEXT NOT NULL, dest TEXT NOT NULL,"
+            " headword TEXT NOT NULL, translation TEXT NOT NULL,"
+            " PRIMARY KEY (src, dest, headword)) WITHOUT ROWID"
+        )
+        before = con.total_changes
+        with con:
+            con.executemany(
+                "INSERT OR IGNORE INTO entries(src, dest, headword, translation) "
+                "VALUES(?, ?, ?, ?)",
+                (
+                    (src, dest, head.strip().lower(), trans.strip())
+                    for head, trans in reader(source)
+                ),
+            )
+        return con.total_changes - before
+    finally:
+        con.close()
@@ -1,6 +1,13 @@
 """Text extractors for EPUB and PDF."""
-from .epub import extract_epub
-from .pdf import extract_pdf
 
-__all__ = ["extract_epub", "extract_pdf"]
+from .boilerplate import strip_boilerplate
+from .epub import extract_epub, iter_epub
+from .pdf import extract_pdf, iter_pdf
 
+__all__ = [
+    "extract_epub",
+    "extract_pdf",
+    "iter_epub",
+    "iter_pdf",
+    "strip_boilerplate",
+]
@@ -0,0 +1,112 @@
+"""
+Running header/footer removal for page-based text (PDF).
+
+The first and last `EDGE_LINES` non-blank lines of every page are reduced
+to a key (lowercased, digits → "#", so "Page 12" and "Page 13" match) and
+counted over a sliding window of pages.  An edge line is boilerplate when
+its key occurs on at least `MIN_REPEATS` pages of the window and it also
+looks like one: it carries a number (page and chapter numbers), or it
+recurs on at least `MIN_SHARE` of the window's pages (running titles;
+recto/verso headers each cover about half).  A short line of prose that
+merely happens to repeat a few times is kept, and so is every line of a
+page that would otherwise come out empty.  Pages stream through with only
+`2 * WINDOW + 1` of them held at a time.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from collections import Counter, deque
+from typing import Deque, FrozenSet, Iterable, Iterator, List, Tuple
+
+EDGE_LINES = 2  # lines examined at the top and at the bottom of a page
+WINDOW = 8  # pages on each side that a page's edges are compared to
+MIN_REPEATS = 3  # pages, this one included, that must share a line
+MAX_LINE_CHARS = 80  # longer lines are prose, never headers
+MIN_SHARE = 0.4  # share of the window's pages a number-free line needs
+
+_DIGITS = re.compile(r"\d+")
+_SPACE = re.compile(r"\s+")
+
+# (lines, edge keys) of one page; keys are ("top" | "bottom", normalized line)
+_Page = Tuple[List[str], FrozenSet[Tuple[str, str]]]
+
+
+def _key(line: str) -> str:
+    return _SPACE.sub(" ", _DIGITS.sub("#", line.strip().lower()))
+
+
+def _edge_indices(lines: List[str]) -> Tuple[List[int], List[int]]:
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    top = filled[:EDGE_LINES]
+    bottom = [i for i in reversed(filled[-EDGE_LINES:]) if i not in top]
+    return top, bottom
+
+
+def _page(text: str) -> _Page:
+    lines = text.splitlines()
+    top, bottom = _edge_indices(lines)
+    keys = frozenset(
+        (where, _key(lines[i]))
+        for where, idxs in (("top", top), ("bottom", bottom))
+        for i in idxs
+        if len(lines[i].strip()) <= MAX_LINE_CHARS
+    )
+    return lines, keys
+
+
+def _is_boilerplate(
+    line: str, where: str, counts: Counter, needed: int, share: int
+) -> bool:
+    if len(line) > MAX_LINE_CHARS:
+        return False
+    key = _key(line)
+    seen = counts[(where, key)]
+    return seen >= needed and ("#" in key or seen >= share)
+
+
+def _strip(page: _Page, counts: Counter, min_repeats: int, pages_in_window: int) -> str:
+    lines, _ = page
+    top, bottom = _edge_indices(lines)
+    share = max(min_repeats, math.ceil(MIN_SHARE * pages_in_window))
+    drop = set()
+    for where, idxs in (("top", top), ("bottom", bottom)):
+        for i in idxs:  # outermost first; stop at the first real line
+            if not _is_boilerplate(lines[i].strip(), where, counts, min_repeats, share):
+                break
+            drop.add(i)
+    kept = "\n".join(l for i, l in enumerate(lines) if i not in drop).strip()
+    # a page that is nothing but a title or a number keeps it
+    return kept or "\n".join(lines).strip()
+
+
+def strip_boilerplate(
+    pages: Iterable[str],
+    window: int = WINDOW,
+    min_repeats: int = MIN_REPEATS,
+) -> Iterator[str]:
+    """Yield `pages` in order with their repeated header/footer lines removed."""
+    counts: Counter = Counter()
+    ahead: Deque[_Page] = deque()  # the page to emit and up to `window` after it
+    behind: Deque[_Page] = deque()  # up to `window` pages already emitted
+
+    def emit() -> str:
+        text = _strip(ahead[0], counts, min_repeats, len(ahead) + len(behind))
+        page = ahead.popleft()
+        behind.append(page)
+        if len(behind) > window:
+            for key in behind.popleft()[1]:
+                counts[key] -= 1
+                if not counts[key]:
+                    del counts[key]
+        return text
+
+    for text in pages:
+        page = _page(text)
+        counts.update(page[1])
+        ahead.append(page)
+        if len(ahead) > window:
+            yield emit()
+    while ahead:
+        yield emit()
@@ -1,43 +1,103 @@
 """Extract text from an EPUB spine, with optional virtual‑page splitting."""
+
 from __future__ import annotations
 
-from ebooklib import epub
-from bs4 import BeautifulSoup
+import posixpath
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List
+from typing import Iterator, List
+from urllib.parse import unquote
+from zipfile import ZipFile
+
+from ..utils.cancel import CancelToken
+from ..utils.pagespec import iter_virtual_pages, parse_pagespec
+from .htmltext import HtmlBackend, html_to_text
+
+_CONTAINER = "META-INF/container.xml"
+_NS = {
+    "c": "urn:oasis:names:tc:opendocument:xmlns:container",
+    "opf": "http://www.idpf.org/2007/opf",
+}
+
+
+def _spine_paths(z: ZipFile) -> List[str]:
+    """
+    Resolve the spine to archive member names by reading only
+    container.xml and the OPF package document.
+    """
+    container = ET.fromstring(z.read(_CONTAINER))
+    rootfile = container.find(".//c:rootfile", _NS)
+    if rootfile is None:
+        raise ValueError("EPUB container.xml has no rootfile")
+    opf_path = rootfile.attrib["full-path"]
+    opf_dir = posixpath.dirname(opf_path)
+
+    package = ET.fromstring(z.read(opf_path))
+    manifest = {
+        item.attrib["id"]: item.attrib["href"]
+        for item in package.iterfind("opf:manifest/opf:item", _NS)
+    }
+    paths = []
+    for itemref in package.iterfind("opf:spine/opf:itemref", _NS):
+        href = manifest.get(itemref.attrib.get("idref", ""))
+        if href is None:
+            continue
+        href = unquote(href.split("#", 1)[0])
+        paths.append(posixpath.normpath(posixpath.join(opf_dir, href)))
+    return paths
+
+
+def _iter_spine_texts(
+    z: ZipFile,
+    paths: List[str],
+    backend: HtmlBackend,
+    cancel: CancelToken | None = None,
+) -> Iterator[str]:
+    # members are decompressed one at a time, only when requested;
+    # <head> is skipped since titles repeat on every spine document
+    for name in paths:
+        if cancel is not None:
+            cancel.check()
+        yield html_to_text(z.read(name), backend, skip_head=True)
+
 
-from ..utils.pagespec import parse_pagespec, virtual_split
+def iter_epub(
+    path: str | Path,
+    pages: str | None = None,
+    virtual_pages: int | None = None,
+    html_backend: HtmlBackend = "fast",
+    cancel: CancelToken | None = None,
+) -> Iterator[str]:
+    """`extract_epub`, one page at a time; the archive stays open meanwhile."""
+    with ZipFile(path) as z:
+        spine = _spine_paths(z)
+
+        if virtual_pages:
+            texts = _iter_spine_texts(z, spine, html_backend, cancel)
+            yield from iter_virtual_pages(texts, virtual_pages, pages)
+            return
+
+        idxs = parse_pagespec(pages, total_pages=len(spine))
+        yield from _iter_spine_texts(z, [spine[i] for i in idxs], html_backend, cancel)
 
 
 def extract_epub(
     path: str | Path,
     pages: str | None = None,
     virtual_pages: int | None = None,
+    html_backend: HtmlBackend = "fast",
+    cancel: CancelToken | None = None,
 ) -> List[str]:
     """
     Read `path` EPUB and return a list of strings, one per “page”:
       - If `pages="1-3,5"`, only those spine indices (1‑based) are included.
-      - If `virtual_pages=n`, all text is concatenated and then split every n words.
+      - If `virtual_pages=n`, the spine is streamed into pseudo-pages of n
+        words; `pages` then selects virtual pages, and spine documents past
+        the last requested one are never parsed.
       - Otherwise, returns one entry per spine document.
-    """
-    book = epub.read_epub(str(path))
-    # correct unpacking: each spine entry is (idref, attrs)
-    spine_ids = [idref for idref, _ in book.spine]
-
-    total = len(spine_ids)
-
-    idxs = parse_pagespec(pages, total_pages=total)
-    texts: list[str] = []
-    for i in idxs:
-        item = book.get_item_with_id(spine_ids[i])
-        html = item.get_content()
-        # strip HTML to plain text
-        soup = BeautifulSoup(html, "html.parser")
-        texts.append(soup.get_text(" ", strip=True))
-
-    if virtual_pages:
-        joined = " ".join(texts)
-        return virtual_split(joined, virtual_pages)
-
-    return texts
 
+    Spine documents are read straight from the zip on demand; unselected
+    ones are never decompressed.  `html_backend` picks the HTML-to-text
+    converter (see `html_to_text`); `cancel` is checked before each one.
+    """
+    return list(iter_epub(path, pages, virtual_pages, html_backend, cancel))
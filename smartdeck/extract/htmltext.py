@@ -0,0 +1,154 @@
+"""Convert (X)HTML documents to plain text."""
+
+from __future__ import annotations
+
+import codecs
+import re
+from html.parser import HTMLParser
+from typing import List, Literal
+
+from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+HtmlBackend = Literal["fast", "bs4"]
+
+_DECLARED_ENCODING = re.compile(
+    rb"""^\s*<\?xml[^>]*encoding=["']([\w.-]+)["']|<meta[^>]*charset=["']?([\w.-]+)""",
+    re.IGNORECASE,
+)
+_NUMERIC_REF = {
+    10: re.compile(r"^([0-9]+)(.*)"),
+    16: re.compile(r"^([0-9a-f]+)(.*)"),
+}
+_BOMS = [
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+]
+
+# BeautifulSoup keeps the text of these elements in special string classes
+# that get_text() skips.
+_SKIPPED = frozenset({"script", "style", "template"})
+
+
+def _decode(html: bytes) -> str:
+    """Decode document bytes: BOM, then declared encoding, then utf-8."""
+    for bom, encoding in _BOMS:
+        if html.startswith(bom):
+            return html[len(bom) :].decode(encoding, errors="replace")
+    candidates = []
+    if m := _DECLARED_ENCODING.search(html[:1024]):
+        candidates.append((m.group(1) or m.group(2)).decode("ascii"))
+    candidates += ["utf-8", "windows-1252"]
+    for encoding in candidates:
+        try:
+            return html.decode(encoding)
+        except (LookupError, UnicodeDecodeError):
+            continue
+    return html.decode("latin-1")
+
+
+class _TextStripper(HTMLParser):
+    """
+    Streaming tag stripper.  Text between two markup events forms one
+    string, exactly like BeautifulSoup's NavigableStrings, so stripping and
+    joining the pieces reproduces `soup.get_text(" ", strip=True)`.
+    """
+
+    def __init__(self, skipped: frozenset[str] = _SKIPPED) -> None:
+        # references are resolved by hand, the way BeautifulSoup does it
+        super().__init__(convert_charrefs=False)
+        self.parts: List[str] = []
+        self._buf: List[str] = []
+        self._skipped = skipped
+        self._skip = 0
+
+    def _flush(self) -> None:
+        if self._buf:
+            text = "".join(self._buf).strip()
+            self._buf.clear()
+            if text and not self._skip:
+                self.parts.append(text)
+
+    def handle_data(self, data: str) -> None:
+        self._buf.append(data)
+
+    def handle_entityref(self, name: str) -> None:
+        char = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self._buf.append(char if char is not None else f"&{name}")
+
+    def handle_charref(self, name: str) -> None:
+        base = 16 if name[:1] in ("x", "X") else 10
+        digits = name[1:] if base == 16 else name
+        extra = ""
+        try:
+            number: int | None = int(digits, base)
+        except ValueError:
+            # unterminated reference followed by ordinary text
+            number = None
+            if m := _NUMERIC_REF[base].search(digits):
+                number, extra = int(m.group(1), base), m.group(2)
+            else:
+                extra = digits
+        if number is not None:
+            self._buf.append(UnicodeDammit.numeric_character_reference(number)[0])
+        if extra:
+            self._buf.append(extra)
+
+    def handle_starttag(self, tag, attrs) -> None:
+        self._flush()
+        if tag in self._skipped:
+            self._skip += 1
+
+    def handle_startendtag(self, tag, attrs) -> None:
+        self._flush()
+
+    def handle_endtag(self, tag) -> None:
+        self._flush()
+        if tag in self._skipped and self._skip:
+            self._skip -= 1
+
+    def handle_comment(self, data) -> None:
+        self._flush()
+
+    def handle_decl(self, decl) -> None:
+        self._flush()
+
+    def handle_pi(self, data) -> None:
+        self._flush()
+
+    def unknown_decl(self, data) -> None:
+        self._flush()
+        # CDATA sections are text as far as get_text() is concerned
+        if data.upper().startswith("CDATA[") and not self._skip:
+            if text := data[len("CDATA[") :].strip():
+                self.parts.append(text)
+
+
+def html_to_text(
+    html: bytes | str,
+    backend: HtmlBackend = "fast",
+    skip_head: bool = False,
+) -> str:
+    """
+    Return the visible text of `html`, pieces joined by single spaces.
+
+    `backend="bs4"` runs BeautifulSoup's `html.parser` tree builder;
+    `backend="fast"` (default) streams the document through a tag stripper
+    without building a tree and yields the same string.  With `skip_head`,
+    the contents of `<head>` (e.g. a repeated `<title>`) are left out.
+    """
+    if backend == "bs4":
+        soup = BeautifulSoup(html, "html.parser")
+        if skip_head and soup.head is not None:
+            soup.head.decompose()
+        return soup.get_text(" ", strip=True)
+    if backend != "fast":
+        raise ValueError(f"Unknown HTML backend: {backend!r}")
+    if isinstance(html, bytes):
+        html = _decode(html)
+    parser = _TextStripper(_SKIPPED | {"head"} if skip_head else _SKIPPED)
+    parser.feed(html)
+    parser.close()
+    parser._flush()
+    return " ".join(parser.parts)
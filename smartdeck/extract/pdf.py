@@ -1,37 +1,80 @@
 """Extract per‑page text from PDF using pdfminer.six."""
+
 from __future__ import annotations
 
+from io import StringIO
 from pathlib import Path
-from typing import List
+from typing import Container, Iterator, List
 
-from pdfminer.high_level import extract_text
+from pdfminer.converter import TextConverter
 from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
 
-from ..utils.pagespec import parse_pagespec, virtual_split
+from ..utils.cancel import CancelToken
+from ..utils.pagespec import iter_virtual_pages, parse_pagespec
+from .boilerplate import strip_boilerplate
 
 
-def extract_pdf(
+def _iter_pdf_pages(
     path: str | Path,
-    pages: str | None = None,
-    virtual_pages: int | None = None,
-) -> List[str]:
+    page_numbers: Container[int] | None = None,
+    cancel: CancelToken | None = None,
+) -> Iterator[str]:
     """
-    Read `path` PDF and return list of strings per page:
-      - Splits the raw text on form‑feeds (\f) to get pages.
-      - Applies the same `pages` spec and optional virtual splitting.
+    Lazily yield the stripped text of each PDF page (zero‑based
+    `page_numbers` filter), interpreting a page only when it is requested.
+    Empty pages are skipped, as with the old whole-document extraction.
     """
     laparams = LAParams()
-    # this pulls the entire doc, with '\f' between pages
-    raw = extract_text(str(path), laparams=laparams)
-    # if extract_text fails or returns '', raw_pages may be ['']
-    raw_pages = raw.split("\f")
+    with open(path, "rb") as fp, StringIO() as out:
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, out, laparams=laparams)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        for page in PDFPage.get_pages(fp, page_numbers, caching=True):
+            if cancel is not None:
+                cancel.check()
+            interpreter.process_page(page)
+            # the converter terminates every page with '\f'
+            text = out.getvalue().strip()
+            out.seek(0)
+            out.truncate()
+            if text:
+                yield text
 
-    idxs = parse_pagespec(pages, total_pages=len(raw_pages))
-    pages_text = [raw_pages[i].strip() for i in idxs if raw_pages[i].strip()]
 
+def iter_pdf(
+    path: str | Path,
+    pages: str | None = None,
+    virtual_pages: int | None = None,
+    cancel: CancelToken | None = None,
+    keep_boilerplate: bool = False,
+) -> Iterator[str]:
+    """`extract_pdf`, one page at a time."""
+    idxs = None if pages is None or virtual_pages else parse_pagespec(pages)
+    texts = _iter_pdf_pages(path, idxs, cancel)
+    if not keep_boilerplate:
+        texts = strip_boilerplate(texts)
     if virtual_pages:
-        joined = " ".join(pages_text)
-        return virtual_split(joined, virtual_pages)
+        texts = iter_virtual_pages(texts, virtual_pages, pages)
+    yield from texts
 
-    return pages_text
 
+def extract_pdf(
+    path: str | Path,
+    pages: str | None = None,
+    virtual_pages: int | None = None,
+    cancel: CancelToken | None = None,
+    keep_boilerplate: bool = False,
+) -> List[str]:
+    """
+    Read `path` PDF and return list of strings per page:
+      - Pages are interpreted one at a time instead of extracting the whole
+        document up front.
+      - Running headers, footers and page numbers are stripped (see
+        `boilerplate.strip_boilerplate`) unless `keep_boilerplate`.
+      - Applies the same `pages` spec and optional virtual splitting as
+        `extract_epub` (with `virtual_pages`, `pages` selects virtual pages).
+      - `cancel` is checked before every page.
+    """
+    return list(iter_pdf(path, pages, virtual_pages, cancel, keep_boilerplate))
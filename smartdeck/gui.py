@@ -1,43 +1,114 @@
 # smartdeck/gui.py
 
 from __future__ import annotations
+
 import sys
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Literal
-
+from typing import Iterator, List, Literal
+
+from PyQt6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QObject,
+    QPointF,
+    QRectF,
+    QRunnable,
+    Qt,
+    QThreadPool,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygonF
 from PyQt6.QtWidgets import (
-    QApplication, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QTextBrowser, QFileDialog, QLabel,
-    QSpinBox, QComboBox, QProgressBar, QMessageBox
+    QApplication,
+    QComboBox,
+    QFileDialog,
+    QHBoxLayout,
+    QHeaderView,
+    QLabel,
+    QLineEdit,
+    QMessageBox,
+    QProgressBar,
+    QPushButton,
+    QSpinBox,
+    QTableView,
+    QTabWidget,
+    QTextBrowser,
+    QVBoxLayout,
+    QWidget,
 )
-from PyQt6.QtCore import QThread, pyqtSignal
-
-import requests
-import epitran
 
+from smartdeck.analysis.curve import CoverageCurve, coverage_curve, paginate_lemmas
+from smartdeck.deck.builder import build_deck
+from smartdeck.enrich.ipa import IpaService
+from smartdeck.enrich.translate import TranslationBackend, make_backend, translate
 from smartdeck.extract.epub import extract_epub
 from smartdeck.extract.pdf import extract_pdf
-from smartdeck.nlp.processing import tokenize_lemmas
-from smartdeck.vault.db import Vault
-from smartdeck.deck.excerpt import capture_excerpts
-from smartdeck.deck.builder import build_deck
+from smartdeck.nlp.processing import tokenize_pages
+from smartdeck.nlp.registry import LANGUAGES, is_installed, models
+from smartdeck.pipeline import enrich_entries
+from smartdeck.utils.cancel import Cancelled, CancelToken
+from smartdeck.utils.profiling import Profiler, StageEvent
+from smartdeck.vault.db import TIER_THRESHOLDS, Vault
 
 
 def _translate(word: str, src: str, dest: str) -> str:
-    url = "https://translate.googleapis.com/translate_a/single"
-    params = {"client": "gtx", "sl": src, "tl": dest, "dt": "t", "q": word}
-    try:
-        r = requests.get(url, params=params, timeout=5)
-        r.raise_for_status()
-        return r.json()[0][0][0]
-    except Exception:
-        return ""
-
-
-class Worker(QThread):
+    return translate(word, src, dest, _backend())
+
+
+@lru_cache(maxsize=1)
+def _backend() -> TranslationBackend:
+    # offline dictionary ($SMARTDECK_DICT) when present, HTTP on a miss
+    return make_backend()
+
+
+def _lang_combo() -> QComboBox:
+    """Every registry language; those without an installed model are greyed out."""
+    combo = QComboBox()
+    combo.addItems(list(LANGUAGES))
+    first = None
+    for i, spec in enumerate(LANGUAGES.values()):
+        if is_installed(spec):
+            first = i if first is None else first
+            continue
+        item = combo.model().item(i)
+        item.setEnabled(False)
+        item.setToolTip(f"{spec.backend} model {spec.name!r} is not installed")
+    if first is not None:
+        combo.setCurrentIndex(first)
+    # warm the chosen language's model before the job needs it
+    combo.currentTextChanged.connect(models.preload)
+    return combo
+
+
+# stage names reported through JobSignals.stage, in pipeline order
+DIFF_STAGES = ["extract", "lemmatize", "coverage"]
+BUILD_STAGES = DIFF_STAGES + [
+    "excerpts",
+    "translate",
+    "ipa",
+    "translate_sentences",
+    "package",
+]
+
+
+class JobSignals(QObject):
     progress = pyqtSignal(int)
+    stage = pyqtSignal(dict)  # StageEvent, same as the CLI --profile data
     finished = pyqtSignal(str)
+    curve = pyqtSignal(dict)  # CoverageCurve of a diff run
     error = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class Job(QRunnable):
+    """
+    One diff or build run on the shared thread pool.
+
+    `progress` is reported per stage and, while lemmatizing, per page;
+    `cancel()` stops the job at the next page or request it reaches.
+    """
 
     def __init__(
         self,
@@ -50,6 +121,7 @@ class Worker(QThread):
         mode: Literal["diff", "build"],
     ):
         super().__init__()
+        self.setAutoDelete(False)  # JobQueue keeps it alive until done
         self.source = source
         self.pages = pages
         self.virtual_pages = virtual_pages
@@ -57,75 +129,344 @@ class Worker(QThread):
         self.lang = lang
         self.output = output
         self.mode = mode
+        self.signals = JobSignals()
+        self.token = CancelToken()
+        self.profiler = Profiler(listeners=[self._on_stage])
+        self._stages = DIFF_STAGES if mode == "diff" else BUILD_STAGES
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def _report(self, stage: str, fraction: float) -> None:
+        done = self._stages.index(stage) + fraction
+        self.signals.progress.emit(int(100 * done / len(self._stages)))
+
+    def _on_stage(self, event: StageEvent) -> None:
+        self.signals.stage.emit(dict(event))
+        if event["event"] == "end" and event["stage"] in self._stages:
+            self._report(event["stage"], 1.0)
+
+    def _tracked(self, texts: List[str]) -> Iterator[str]:
+        # per-page progress while the NLP pipeline consumes the texts
+        for n, text in enumerate(texts):
+            self._report("lemmatize", n / max(len(texts), 1))
+            yield text
+
+    def _translate(self, text: str, src: str, dest: str) -> str:
+        self.token.check()
+        return _translate(text, src, dest)
 
     def run(self):
         try:
-            # 1) Extract text
+            message = self._run()
+        except Cancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(str(e))
+        else:
+            self.signals.finished.emit(message)
+
+    def _run(self) -> str:
+        prof, token = self.profiler, self.token
+
+        # 1) Extract text
+        with prof.stage("extract") as st:
             if self.source.suffix.lower() == ".epub":
-                texts = extract_epub(self.source, self.pages, self.virtual_pages)
+                texts = extract_epub(
+                    self.source, self.pages, self.virtual_pages, cancel=token
+                )
             else:
-                texts = extract_pdf(self.source, self.pages, self.virtual_pages)
-
-            # 2) Lemmatize
-            tokens = tokenize_lemmas(texts, lang=self.lang)
+                texts = extract_pdf(
+                    self.source, self.pages, self.virtual_pages, cancel=token
+                )
+            st.add(len(texts))
+
+        # 2) Lemmatize
+        with prof.stage("lemmatize") as st:
+            pages = tokenize_pages(self._tracked(texts), lang=self.lang, cancel=token)
+            tokens = [w for page in pages for w in page]
             lemmas = [w["lemma"] for w in tokens]
+            st.add(len(lemmas))
 
-            # 3) Coverage
-            vault = Vault()
+        # 3) Coverage
+        vault = Vault()
+        with prof.stage("coverage") as st:
             pct, unknowns, tier = vault.coverage(self.lang, lemmas)
+            st.add(len(lemmas))
+
+        if self.mode == "diff":
+            page_lemmas = [[w["lemma"] for w in page] for page in pages]
+            starts = None
+            if self.source.suffix.lower() == ".epub" and not self.virtual_pages:
+                # chapters → pages, for the coverage curve
+                page_lemmas, starts = paginate_lemmas(page_lemmas)
+            self.signals.curve.emit(dict(coverage_curve(page_lemmas, unknowns, starts)))
+            lines = [f"Coverage: {pct:.1%}", f"Tier: {tier}", "", "Top unknowns:"]
+            for lem, cnt in unknowns.most_common(self.top):
+                lines.append(f"  {lem} ({cnt})")
+            return "\n".join(lines)
+
+        # === BUILD ===
+
+        # 4) select top
+        top_lemmas = [l for l, _ in unknowns.most_common(self.top)]
+
+        # 5–9) excerpts, translations and IPA, overlapped
+        pos_map = {w["lemma"]: w["pos"] for w in tokens}
+        with IpaService(vault) as ipa:
+            entries, occ = enrich_entries(
+                texts,
+                top_lemmas,
+                pos_map,
+                self.lang,
+                translate=self._translate,
+                ipa=ipa,
+                prof=prof,
+            )
+        token.check()
 
-            if self.mode == "diff":
-                lines = [f"Coverage: {pct:.1%}", f"Tier: {tier}", "", "Top unknowns:"]
-                for lem, cnt in unknowns.most_common(self.top):
-                    lines.append(f"  {lem} ({cnt})")
-                self.finished.emit("\n".join(lines))
-                return
-
-            # === BUILD ===
-
-            # 4) select top
-            top_lemmas = [l for l, _ in unknowns.most_common(self.top)]
-
-            # 5) excerpts
-            occ = capture_excerpts(texts, top_lemmas)
-
-            # 6) translations
-            dest = "de" if self.lang.lower().startswith("en") else "en"
-            translations = {w: _translate(w, src=self.lang, dest=dest) for w in top_lemmas}
-
-            # 7) IPA
-            iso3 = {"en": "eng", "de": "deu"}.get(self.lang.lower(), self.lang.lower())
-            epi = epitran.Epitran(f"{iso3}-Latn")
-            ipas = {w: epi.transliterate(w) for w in top_lemmas}
-
-            # 8) sentence translations
-            sent_trans = {w: _translate(occ[w][0], src=self.lang, dest=dest) for w in top_lemmas}
-
-            # 9) build note entries
-            pos_map = {w["lemma"]: w["pos"] for w in tokens}
-            entries: list[tuple[str, ...]] = []
-            for w in top_lemmas:
-                entries.append((
-                    w,
-                    translations.get(w, ""),
-                    ipas.get(w, ""),
-                    pos_map.get(w, ""),
-                    occ[w][0],
-                    sent_trans.get(w, ""),
-                    occ[w][1],
-                ))
-
-            # 10) persist & write
+        # 10) persist & write
+        with prof.stage("package") as st:
             vault.add_words(
-                self.lang, top_lemmas,
-                kind="book", ident=str(self.source),
+                self.lang,
+                top_lemmas,
+                kind="book",
+                ident=str(self.source),
                 occurrences=occ,
             )
             build_deck(self.source.name, entries, str(self.output))
-            self.finished.emit(f"Deck written to {self.output}")
+            st.add(len(entries))
+        return f"Deck written to {self.output}"
 
-        except Exception as e:
-            self.error.emit(str(e))
+
+class JobQueue(QObject):
+    """Run jobs concurrently on a thread pool and track the live ones."""
+
+    def __init__(self, max_workers: int | None = None, parent: QObject | None = None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_workers:
+            self.pool.setMaxThreadCount(max_workers)
+        self.jobs: List[Job] = []
+
+    def submit(self, job: Job) -> Job:
+        self.jobs.append(job)
+        for signal in (job.signals.finished, job.signals.error):
+            signal.connect(lambda _msg, job=job: self._done(job))
+        job.signals.cancelled.connect(lambda job=job: self._done(job))
+        self.pool.start(job)
+        return job
+
+    def _done(self, job: Job) -> None:
+        if job in self.jobs:
+            self.jobs.remove(job)
+
+    def cancel_all(self, mode: str | None = None) -> None:
+        for job in list(self.jobs):
+            if mode is None or job.mode == mode:
+                job.cancel()
+
+    def wait(self, msecs: int = -1) -> bool:
+        return self.pool.waitForDone(msecs)
+
+
+class WordTableModel(QAbstractTableModel):
+    """
+    Known words of the vault, fetched page by page as the view scrolls.
+
+    Filtering and sorting happen in SQLite (`Vault.browse_words`); only the
+    pages the user has scrolled through are ever held in memory.  The exact
+    total is counted on a worker thread and announced through `counted`;
+    `total` is None until then.  Only the lemma column sorts.
+    """
+
+    counted = pyqtSignal(int)
+    _count_done = pyqtSignal(int, int)  # (generation, total)
+
+    COLUMNS = ["Lemma", "Lang", "Excerpt", "Location"]
+    _FIELDS = [2, 1, 3, 4]  # column → index in a browse_words row
+
+    def __init__(
+        self, vault: Vault, page_size: int = 200, parent: QObject | None = None
+    ):
+        super().__init__(parent)
+        self.vault = vault
+        self.page_size = page_size
+        self.lang: str | None = None
+        self.prefix = ""
+        self.source: tuple[str, str] | None = None
+        self.descending = False
+        self._rows: list = []
+        self._exhausted = False
+        self.total: int | None = None
+        self._generation = 0
+        self._counter = QThreadPool(self)
+        self._counter.setMaxThreadCount(1)
+        self._count_done.connect(self._on_counted)
+
+    def set_filter(
+        self,
+        lang: str | None = None,
+        prefix: str = "",
+        source: tuple[str, str] | None = None,
+    ) -> None:
+        self.lang, self.prefix, self.source = lang or None, prefix, source
+        self.refresh()
+
+    def refresh(self) -> None:
+        self.beginResetModel()
+        self._rows = []
+        self._exhausted = False
+        self.total = None
+        self.endResetModel()
+        if self.canFetchMore():
+            self.fetchMore()
+        self._count()
+
+    def _count(self) -> None:
+        # COUNT(*) visits every matching row, so keep it off the UI thread;
+        # a count overtaken by a newer filter is skipped or dropped
+        self._generation += 1
+        generation, query = self._generation, (self.lang, self.prefix, self.source)
+
+        def run() -> None:
+            if generation == self._generation:
+                self._count_done.emit(generation, self.vault.count_words(*query))
+
+        self._counter.start(run)
+
+    def _on_counted(self, generation: int, total: int) -> None:
+        if generation == self._generation:
+            self.total = total
+            self.counted.emit(total)
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole or not index.isValid():
+            return None
+        value = self._rows[index.row()][self._FIELDS[index.column()]]
+        return "" if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            role == Qt.ItemDataRole.DisplayRole
+            and orientation == Qt.Orientation.Horizontal
+        ):
+            return self.COLUMNS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()) -> None:
+        page = self.vault.browse_words(
+            self.lang,
+            self.prefix,
+            self.source,
+            sort="lemma",
+            descending=self.descending,
+            after=self._rows[-1] if self._rows else None,
+            limit=self.page_size,
+        )
+        if len(page) < self.page_size:
+            self._exhausted = True
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self.endInsertRows()
+
+    def sort(self, column: int, order=Qt.SortOrder.AscendingOrder) -> None:
+        if column != 0:
+            return
+        self.descending = order == Qt.SortOrder.DescendingOrder
+        self.refresh()
+
+
+class CoverageCurveWidget(QWidget):
+    """
+    Plot of a `CoverageCurve`: per-page coverage (grey), cumulative coverage
+    (blue) against the tier thresholds, and the cumulative count of new
+    unknown lemmas (orange, scaled to its own maximum).  Chapter starts are
+    marked along the bottom.
+    """
+
+    def __init__(self, parent: QWidget | None = None):
+        super().__init__(parent)
+        self.curve: CoverageCurve | None = None
+        self.setMinimumHeight(140)
+
+    def set_curve(self, curve: CoverageCurve) -> None:
+        self.curve = curve
+        self.setToolTip(
+            f"{len(curve['pages'])} pages, {len(curve['chapters'])} chapters; "
+            "grey: page coverage, blue: cumulative, orange: new words"
+        )
+        self.update()
+
+    def clear(self) -> None:
+        self.curve = None
+        self.setToolTip("")
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        area = QRectF(self.rect()).adjusted(8, 8, -8, -8)
+        painter.fillRect(self.rect(), QColor("white"))
+        points = self.curve["pages"] if self.curve else []
+        if not points:
+            painter.drawText(
+                area, Qt.AlignmentFlag.AlignCenter, "No coverage curve yet"
+            )
+            painter.end()
+            return
+
+        # coverage axis spans [floor, 1], floor a little below the worst page
+        floor = max(0.0, min(0.85, min(p["coverage"] for p in points) - 0.02))
+        step = area.width() / max(len(points) - 1, 1)
+
+        def y(cov: float) -> float:
+            return area.bottom() - (cov - floor) / (1 - floor) * area.height()
+
+        painter.setPen(QPen(QColor("#bbbbbb"), 1, Qt.PenStyle.DashLine))
+        for threshold, tier in TIER_THRESHOLDS:
+            if threshold > floor:
+                painter.drawLine(
+                    QPointF(area.left(), y(threshold)),
+                    QPointF(area.right(), y(threshold)),
+                )
+                painter.drawText(QPointF(area.left() + 2, y(threshold) - 2), tier)
+
+        def line(values, color: str, width: float) -> None:
+            painter.setPen(QPen(QColor(color), width))
+            painter.drawPolyline(
+                QPolygonF(
+                    [QPointF(area.left() + i * step, v) for i, v in enumerate(values)]
+                )
+            )
+
+        line([y(p["coverage"]) for p in points], "#999999", 1)
+        line([y(p["cumulative_coverage"]) for p in points], "#1f77b4", 2)
+        most_new = max(points[-1]["cumulative_new"], 1)
+        line(
+            [
+                area.bottom() - p["cumulative_new"] / most_new * area.height()
+                for p in points
+            ],
+            "#ff7f0e",
+            1.5,
+        )
+        painter.setPen(QPen(QColor("#333333"), 1))
+        for chapter in self.curve["chapters"]:
+            x = area.left() + (chapter["first_page"] - 1) * step
+            painter.drawLine(QPointF(x, area.bottom()), QPointF(x, area.bottom() - 6))
+        painter.end()
 
 
 class MainWindow(QWidget):
@@ -133,6 +474,7 @@ class MainWindow(QWidget):
         super().__init__()
         self.setWindowTitle("SmartDeck Maker")
         self.resize(600, 400)
+        self.queue = JobQueue(parent=self)
 
         self.tabs = QTabWidget()
         self.diff_tab = self._make_diff_tab()
@@ -147,76 +489,195 @@ class MainWindow(QWidget):
         self.setLayout(layout)
 
     def _make_diff_tab(self) -> QWidget:
-        w = QWidget(); layout = QVBoxLayout()
+        w = QWidget()
+        layout = QVBoxLayout()
         hfile = QHBoxLayout()
-        hfile.addWidget(QLabel("Book:")); self.diff_file = QLineEdit(); hfile.addWidget(self.diff_file)
-        btn = QPushButton("Browse…"); btn.clicked.connect(lambda: self._choose_file(self.diff_file))
-        hfile.addWidget(btn); layout.addLayout(hfile)
+        hfile.addWidget(QLabel("Books:"))
+        self.diff_file = QLineEdit()
+        hfile.addWidget(self.diff_file)
+        self.diff_file.setPlaceholderText("One or more files, separated by ';'")
+        btn = QPushButton("Browse…")
+        btn.clicked.connect(lambda: self._choose_file(self.diff_file, multiple=True))
+        hfile.addWidget(btn)
+        layout.addLayout(hfile)
 
         opts = QHBoxLayout()
-        self.diff_pages = QLineEdit(); self.diff_pages.setPlaceholderText("Pagespec")
-        self.diff_top   = QSpinBox(); self.diff_top.setRange(1,1000); self.diff_top.setValue(20)
-        self.diff_lang  = QComboBox(); self.diff_lang.addItems(["en","de"])
-        opts.addWidget(QLabel("Pages:")); opts.addWidget(self.diff_pages)
-        opts.addWidget(QLabel("Top N:")); opts.addWidget(self.diff_top)
-        opts.addWidget(QLabel("Lang:")); opts.addWidget(self.diff_lang)
+        self.diff_pages = QLineEdit()
+        self.diff_pages.setPlaceholderText("Pagespec")
+        self.diff_top = QSpinBox()
+        self.diff_top.setRange(1, 1000)
+        self.diff_top.setValue(20)
+        self.diff_lang = _lang_combo()
+        opts.addWidget(QLabel("Pages:"))
+        opts.addWidget(self.diff_pages)
+        opts.addWidget(QLabel("Top N:"))
+        opts.addWidget(self.diff_top)
+        opts.addWidget(QLabel("Lang:"))
+        opts.addWidget(self.diff_lang)
         layout.addLayout(opts)
 
-        run = QPushButton("Compute Difficulty"); run.clicked.connect(self.on_diff)
-        layout.addWidget(run)
-        self.diff_out = QTextBrowser(); layout.addWidget(self.diff_out)
+        hrun = QHBoxLayout()
+        run = QPushButton("Compute Difficulty")
+        run.clicked.connect(self.on_diff)
+        cancel = QPushButton("Cancel")
+        cancel.clicked.connect(lambda: self.queue.cancel_all("diff"))
+        hrun.addWidget(run)
+        hrun.addWidget(cancel)
+        layout.addLayout(hrun)
+        self.diff_progress = QProgressBar()
+        layout.addWidget(self.diff_progress)
+        self.diff_out = QTextBrowser()
+        layout.addWidget(self.diff_out)
+        self.diff_curve = CoverageCurveWidget()
+        layout.addWidget(self.diff_curve)
         w.setLayout(layout)
         return w
 
     def _make_build_tab(self) -> QWidget:
-        w = QWidget(); layout = QVBoxLayout()
+        w = QWidget()
+        layout = QVBoxLayout()
         hfile = QHBoxLayout()
-        hfile.addWidget(QLabel("Book:")); self.build_file = QLineEdit(); hfile.addWidget(self.build_file)
-        btn = QPushButton("Browse…"); btn.clicked.connect(lambda: self._choose_file(self.build_file))
-        hfile.addWidget(btn); layout.addLayout(hfile)
+        hfile.addWidget(QLabel("Book:"))
+        self.build_file = QLineEdit()
+        hfile.addWidget(self.build_file)
+        btn = QPushButton("Browse…")
+        btn.clicked.connect(lambda: self._choose_file(self.build_file))
+        hfile.addWidget(btn)
+        layout.addLayout(hfile)
 
         opts = QHBoxLayout()
-        self.build_pages   = QLineEdit(); self.build_pages.setPlaceholderText("Pagespec")
-        self.build_virtual = QSpinBox(); self.build_virtual.setRange(0,5000)
-        self.build_top     = QSpinBox(); self.build_top.setRange(1,1000); self.build_top.setValue(100)
-        self.build_lang    = QComboBox(); self.build_lang.addItems(["en","de"])
-        opts.addWidget(QLabel("Pages:")); opts.addWidget(self.build_pages)
-        opts.addWidget(QLabel("Virtual words:")); opts.addWidget(self.build_virtual)
-        opts.addWidget(QLabel("Top N:")); opts.addWidget(self.build_top)
-        opts.addWidget(QLabel("Lang:")); opts.addWidget(self.build_lang)
+        self.build_pages = QLineEdit()
+        self.build_pages.setPlaceholderText("Pagespec")
+        self.build_virtual = QSpinBox()
+        self.build_virtual.setRange(0, 5000)
+        self.build_top = QSpinBox()
+        self.build_top.setRange(1, 1000)
+        self.build_top.setValue(100)
+        self.build_lang = _lang_combo()
+        opts.addWidget(QLabel("Pages:"))
+        opts.addWidget(self.build_pages)
+        opts.addWidget(QLabel("Virtual words:"))
+        opts.addWidget(self.build_virtual)
+        opts.addWidget(QLabel("Top N:"))
+        opts.addWidget(self.build_top)
+        opts.addWidget(QLabel("Lang:"))
+        opts.addWidget(self.build_lang)
         layout.addLayout(opts)
 
         hout = QHBoxLayout()
-        hout.addWidget(QLabel("Output .apkg:")); self.build_out = QLineEdit("deck.apkg"); hout.addWidget(self.build_out)
-        btn2 = QPushButton("Browse…"); btn2.clicked.connect(lambda: self._choose_file(self.build_out, save=True, filter="*.apkg"))
+        hout.addWidget(QLabel("Output .apkg:"))
+        self.build_out = QLineEdit("deck.apkg")
+        hout.addWidget(self.build_out)
+        btn2 = QPushButton("Browse…")
+        btn2.clicked.connect(
+            lambda: self._choose_file(self.build_out, save=True, filter="*.apkg")
+        )
         hout.addWidget(btn2)
         layout.addLayout(hout)
 
-        self.build_progress = QProgressBar(); layout.addWidget(self.build_progress)
-        run = QPushButton("Build Deck"); run.clicked.connect(self.on_build)
-        layout.addWidget(run)
+        self.build_progress = QProgressBar()
+        layout.addWidget(self.build_progress)
+        hrun = QHBoxLayout()
+        run = QPushButton("Build Deck")
+        run.clicked.connect(self.on_build)
+        cancel = QPushButton("Cancel")
+        cancel.clicked.connect(lambda: self.queue.cancel_all("build"))
+        hrun.addWidget(run)
+        hrun.addWidget(cancel)
+        layout.addLayout(hrun)
 
         w.setLayout(layout)
         return w
 
     def _make_sync_tab(self) -> QWidget:
-        w = QWidget(); layout = QVBoxLayout()
+        w = QWidget()
+        layout = QVBoxLayout()
         hl = QHBoxLayout()
         hl.addWidget(QLabel("Registered sources:"))
-        self.sync_combo = QComboBox(); hl.addWidget(self.sync_combo)
-        btn = QPushButton("Remove Selected Source"); btn.clicked.connect(self.on_remove_source)
+        self.sync_combo = QComboBox()
+        hl.addWidget(self.sync_combo)
+        btn = QPushButton("Remove Selected Source")
+        btn.clicked.connect(self.on_remove_source)
         hl.addWidget(btn)
         layout.addLayout(hl)
+
+        hf = QHBoxLayout()
+        self.words_filter = QLineEdit()
+        self.words_filter.setPlaceholderText("Lemma prefix")
+        self.words_lang = QComboBox()
+        self.words_lang.addItems(["", "en", "de"])
+        self.words_by_source = QComboBox()
+        self.words_by_source.addItem("All sources", None)
+        self.words_count = QLabel()
+        hf.addWidget(QLabel("Filter:"))
+        hf.addWidget(self.words_filter)
+        hf.addWidget(QLabel("Lang:"))
+        hf.addWidget(self.words_lang)
+        hf.addWidget(self.words_by_source)
+        hf.addWidget(self.words_count)
+        layout.addLayout(hf)
+
+        self.words_model = WordTableModel(Vault(), parent=w)
+        self.words_view = QTableView()
+        self.words_view.setModel(self.words_model)
+        header = self.words_view.horizontalHeader()
+        header.setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+        header.setSortIndicatorShown(True)
+        header.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+        header.sectionClicked.connect(self._sort_words)
+        layout.addWidget(self.words_view)
+        self.words_model.counted.connect(
+            lambda n: self.words_count.setText(f"{n:,} words")
+        )
+        # refilter once typing pauses, not on every keystroke
+        self.words_timer = QTimer(w)
+        self.words_timer.setSingleShot(True)
+        self.words_timer.setInterval(250)
+        self.words_timer.timeout.connect(self._filter_words)
+        self.words_filter.textChanged.connect(self.words_timer.start)
+        self.words_lang.currentTextChanged.connect(self._filter_words)
+        self.words_by_source.currentIndexChanged.connect(self._filter_words)
+
         w.setLayout(layout)
         self._refresh_sources()
         return w
 
+    def _filter_words(self, *_):
+        self.words_model.set_filter(
+            self.words_lang.currentText(),
+            self.words_filter.text().strip(),
+            self.words_by_source.currentData(),
+        )
+        self.words_count.setText("counting…")
+
+    def _sort_words(self, column: int) -> None:
+        # only lemmas have an order; a click elsewhere puts the indicator back
+        header = self.words_view.horizontalHeader()
+        if column == 0:
+            self.words_model.sort(0, header.sortIndicatorOrder())
+        else:
+            descending = self.words_model.descending
+            header.setSortIndicator(
+                0,
+                (
+                    Qt.SortOrder.DescendingOrder
+                    if descending
+                    else Qt.SortOrder.AscendingOrder
+                ),
+            )
+
     def _refresh_sources(self):
+        sources = Vault().list_sources()
         self.sync_combo.clear()
-        with Vault()._conn() as con:
-            for row in con.execute("SELECT kind,ident FROM sources"):
-                display = f"{row['kind']}: {row['ident']}"
-                self.sync_combo.addItem(display, (row['kind'], row['ident']))
+        for kind, ident in sources:
+            self.sync_combo.addItem(f"{kind}: {ident}", (kind, ident))
+        self.words_by_source.blockSignals(True)
+        self.words_by_source.clear()
+        self.words_by_source.addItem("All sources", None)
+        for kind, ident in sources:
+            self.words_by_source.addItem(f"{kind}: {ident}", (kind, ident))
+        self.words_by_source.blockSignals(False)
+        self._filter_words()
 
     def on_remove_source(self):
         data = self.sync_combo.currentData()
@@ -228,32 +689,66 @@ class MainWindow(QWidget):
         QMessageBox.information(self, "Remove Source", f"Removed {kind!r} '{ident}'")
         self._refresh_sources()
 
-    def _choose_file(self, line: QLineEdit, save: bool=False, filter: str="*.*"):
+    def _choose_file(
+        self,
+        line: QLineEdit,
+        save: bool = False,
+        filter: str = "*.*",
+        multiple: bool = False,
+    ):
         dlg = QFileDialog(self, directory=".", filter=filter)
         if save:
             path, _ = dlg.getSaveFileName(self, filter=filter)
+        elif multiple:
+            paths, _ = dlg.getOpenFileNames(self, filter=filter)
+            path = ";".join(paths)
         else:
             path, _ = dlg.getOpenFileName(self, filter=filter)
         if path:
             line.setText(path)
 
     def on_diff(self):
+        """Start one concurrent diff job per book; results appear as they finish."""
         self.diff_out.clear()
-        self.worker = Worker(
-            Path(self.diff_file.text()),
-            self.diff_pages.text() or None,
-            None,
-            self.diff_top.value(),
-            self.diff_lang.currentText(),
-            Path(),
-            "diff",
-        )
-        self.worker.finished.connect(self.diff_out.setPlainText)
-        self.worker.error.connect(lambda m: QMessageBox.critical(self, "Error", m))
-        self.worker.start()
+        books = [Path(p.strip()) for p in self.diff_file.text().split(";") if p.strip()]
+        jobs = [
+            Job(
+                book,
+                self.diff_pages.text() or None,
+                None,
+                self.diff_top.value(),
+                self.diff_lang.currentText(),
+                Path(),
+                "diff",
+            )
+            for book in books
+        ]
+        progress = {job: 0 for job in jobs}
+
+        def report(job: Job, value: int) -> None:
+            progress[job] = value
+            self.diff_progress.setValue(sum(progress.values()) // max(len(jobs), 1))
+
+        # one plot: the curve of the last book listed, not whichever ends last
+        self.diff_curve.clear()
+        if jobs:
+            jobs[-1].signals.curve.connect(self.diff_curve.set_curve)
+        for job in jobs:
+            name = job.source.name
+            job.signals.progress.connect(lambda v, job=job: report(job, v))
+            job.signals.finished.connect(
+                lambda m, name=name: self.diff_out.append(f"== {name} ==\n{m}\n")
+            )
+            job.signals.cancelled.connect(
+                lambda name=name: self.diff_out.append(f"== {name} ==\ncancelled\n")
+            )
+            job.signals.error.connect(
+                lambda m, name=name: QMessageBox.critical(self, "Error", f"{name}: {m}")
+            )
+            self.queue.submit(job)
 
     def on_build(self):
-        self.worker = Worker(
+        job = Job(
             Path(self.build_file.text()),
             self.build_pages.text() or None,
             self.build_virtual.value() or None,
@@ -262,10 +757,24 @@ class MainWindow(QWidget):
             Path(self.build_out.text()),
             "build",
         )
-        self.worker.progress.connect(self.build_progress.setValue)
-        self.worker.finished.connect(lambda m: QMessageBox.information(self, "Done", m) or self._refresh_sources())
-        self.worker.error.connect(lambda m: QMessageBox.critical(self, "Error", m))
-        self.worker.start()
+        job.signals.progress.connect(self.build_progress.setValue)
+        job.signals.stage.connect(
+            lambda ev: self.build_progress.setFormat(f"{ev['stage']} – %p%")
+        )
+        job.signals.finished.connect(
+            lambda m: QMessageBox.information(self, "Done", m)
+            or self._refresh_sources()
+        )
+        job.signals.cancelled.connect(
+            lambda: self.build_progress.setFormat("cancelled")
+        )
+        job.signals.error.connect(lambda m: QMessageBox.critical(self, "Error", m))
+        self.queue.submit(job)
+
+    def closeEvent(self, event):
+        self.queue.cancel_all()
+        self.queue.wait()
+        super().closeEvent(event)
 
 
 def main():
@@ -277,4 +786,3 @@ def main():
 
 if __name__ == "__main__":
     main()
-
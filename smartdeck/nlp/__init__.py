@@ -1,3 +1,22 @@
-from .processing import tokenize_lemmas, WordInfo
+from .processing import WordInfo, iter_pages, tokenize_lemmas, tokenize_pages
+from .registry import (
+    LANGUAGES,
+    ModelRegistry,
+    ModelSpec,
+    installed_languages,
+    is_installed,
+    models,
+)
 
-__all__ = ["tokenize_lemmas", "WordInfo"]
+__all__ = [
+    "iter_pages",
+    "tokenize_lemmas",
+    "tokenize_pages",
+    "WordInfo",
+    "LANGUAGES",
+    "ModelRegistry",
+    "ModelSpec",
+    "installed_languages",
+    "is_installed",
+    "models",
+]
@@ -0,0 +1,199 @@
+"""
+Lookup-table lemmatizer for high-throughput analysis (`diff --fast`).
+
+A form table maps lowercase surface forms to lemmas.  It is built once,
+from the full pipeline's output on some text or from a "form<TAB>lemma"
+lexicon, and stored as one memory-mapped file:
+
+    header    b"SDFL", version u32, lemmas_at u64, map_at u64
+    forms     a lemma-table section (`vault.lexicon` format) of the forms
+    lemmas    a lemma-table section of the lemmas
+    map       forms × u32, lemma id of each form id (little endian)
+
+Tokens come from a regex instead of the pipeline's tokenizer and carry no
+POS tag.  Forms missing from the table are sent to the full pipeline in
+one batch per group of pages, and remembered for the rest of the run.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from smartdeck.utils.cancel import CancelToken
+from smartdeck.vault.lexicon import LemmaTable, MappedLemmaTable
+
+from .processing import _WORD_RE, WordInfo, _checked, tokenize_pages
+
+_MAGIC = b"SDFL"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQQ")
+# pages whose unknown forms share one call into the full pipeline
+BATCH_PAGES = 64
+
+# (texts, lang) -> one token list per text, e.g. `tokenize_pages`
+FullPipeline = Callable[[List[str], str], List[List[WordInfo]]]
+
+
+def default_table_path(lang: str) -> Path:
+    return Path(f"~/.smartdeck/forms-{lang.lower()}.sdfl").expanduser()
+
+
+def write_form_table(pairs: Iterable[Tuple[str, str]], path: str | Path) -> int:
+    """
+    Write a form table from `(form, lemma)` pairs; forms are lowercased and
+    the first lemma given for a form wins.  Returns the number of forms.
+    """
+    path = Path(path)
+    forms, lemmas = LemmaTable(), LemmaTable()
+    mapping = array("I")
+    for form, lemma in pairs:
+        form = form.lower()
+        if form not in forms:
+            forms.intern(form)
+            mapping.append(lemmas.intern(lemma.lower()))
+    if sys.byteorder != "little":
+        mapping.byteswap()
+    forms_raw, lemmas_raw = forms.to_bytes(), lemmas.to_bytes()
+    lemmas_at = _HEADER.size + len(forms_raw)
+    map_at = lemmas_at + len(lemmas_raw)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, lemmas_at, map_at))
+        fh.write(forms_raw)
+        fh.write(lemmas_raw)
+        fh.write(mapping.tobytes())
+    tmp.replace(path)
+    return len(forms)
+
+
+def pairs_from_pipeline(
+    texts: Iterable[str], lang: str, full: FullPipeline = tokenize_pages
+) -> List[Tuple[str, str]]:
+    """Each form's most frequent lemma in the full pipeline's output on `texts`."""
+    seen: Dict[str, Counter[str]] = defaultdict(Counter)
+    for page in full(list(texts), lang):
+        for w in page:
+            seen[w["text"].lower()][w["lemma"]] += 1
+    return [(form, counts.most_common(1)[0][0]) for form, counts in seen.items()]
+
+
+def pairs_from_tsv(path: str | Path) -> Iterator[Tuple[str, str]]:
+    """Read "form<TAB>lemma" lines (lemmatization-lists style)."""
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            parts = line.rstrip("\n").split("\t")
+            if len(parts) >= 2 and parts[0] and parts[1]:
+                yield parts[0].strip(), parts[1].strip()
+
+
+class FormTable:
+    """Read-only, memory-mapped view of a file written by `write_form_table`."""
+
+    def __init__(self, path: str | Path) -> None:
+        if sys.byteorder != "little":
+            raise OSError("form tables require a little-endian host")
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, lemmas_at, map_at = _HEADER.unpack_from(self._mm)
+        if magic != _MAGIC or version != _VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a form table")
+        self.forms = MappedLemmaTable(self.path, _HEADER.size)
+        self.lemmas = MappedLemmaTable(self.path, lemmas_at)
+        self._map = memoryview(self._mm)[map_at : map_at + 4 * len(self.forms)].cast(
+            "I"
+        )
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+    def __enter__(self) -> "FormTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.forms.close()
+        self.lemmas.close()
+        self._map.release()
+        self._mm.close()
+
+    def get(self, form: str) -> str | None:
+        """Lemma of a lowercase `form`, or None if the table lacks it."""
+        idx = self.forms.get(form)
+        return None if idx is None else self.lemmas.lemma(self._map[idx])
+
+
+class FastLemmatizer:
+    """
+    Regex tokenizer + form table, with the full pipeline as fallback.
+
+    Lookups are cached per instance, so each distinct form costs one
+    binary search of the mapped table (or one share of a fallback batch).
+    """
+
+    def __init__(
+        self,
+        table: FormTable,
+        lang: str,
+        full: FullPipeline = tokenize_pages,
+        batch_pages: int = BATCH_PAGES,
+    ) -> None:
+        self.table = table
+        self.lang = lang
+        self.full = full
+        self.batch_pages = batch_pages
+        self._cache: Dict[str, str] = {}
+        self.fallback_forms = 0  # distinct forms sent to `full`
+
+    def _lookup_missing(self, forms: List[str]) -> None:
+        self.fallback_forms += len(forms)
+        for form, page in zip(forms, self.full(forms, self.lang)):
+            # a form the pipeline splits or drops keeps itself as lemma
+            self._cache[form] = page[0]["lemma"] if len(page) == 1 else form
+
+    def _batch(self, texts: List[str]) -> List[List[WordInfo]]:
+        pages = [[m.group() for m in _WORD_RE.finditer(text)] for text in texts]
+        cache, table = self._cache, self.table
+        missing: Dict[str, None] = {}
+        for words in pages:
+            for word in words:
+                form = word.lower()
+                if form not in cache:
+                    lemma = table.get(form)
+                    if lemma is None:
+                        missing[form] = None
+                    else:
+                        cache[form] = lemma
+        if missing:
+            self._lookup_missing(list(missing))
+        return [
+            [WordInfo(lemma=cache[w.lower()], pos="", text=w) for w in words]
+            for words in pages
+        ]
+
+    def lemmatize(
+        self, texts: Iterable[str], cancel: CancelToken | None = None
+    ) -> List[List[WordInfo]]:
+        """Same shape as `tokenize_pages`: one token list per text."""
+        return list(self.iter_pages(texts, cancel))
+
+    def iter_pages(
+        self, texts: Iterable[str], cancel: CancelToken | None = None
+    ) -> Iterator[List[WordInfo]]:
+        batch: List[str] = []
+        for text in _checked(texts, cancel):
+            batch.append(text)
+            if len(batch) >= self.batch_pages:
+                yield from self._batch(batch)
+                batch = []
+        if batch:
+            yield from self._batch(batch)
@@ -1,83 +1,184 @@
 # smartdeck/nlp/processing.py
 
 from __future__ import annotations
+
 import re
-from functools import lru_cache
-from typing import Iterable, List, TypedDict
+from collections import deque
+from itertools import islice
+from typing import Iterable, Iterator, List, TypedDict
 
-import spacy
-from spacy.language import Language
 import stanza
+from spacy.language import Language
+
+from smartdeck.utils.cancel import CancelToken
+
+from .registry import models, spec_for
 
 
 class WordInfo(TypedDict):
     lemma: str  # normalized lowercase lemma
-    pos: str    # UPOS tag for German, spaCy POS for others
+    pos: str  # UPOS tag for German, spaCy POS for others
+    text: str  # surface form as it appears in the text
 
 
 # simple regex to keep only alphabetic tokens
 _WORD_RE = re.compile(r"[A-Za-zÀ-ÖØ-öø-ÿ]+")
+# sentence terminator (plus closing quotes/brackets) and the space after it
+_SENTENCE_END = re.compile(r"[.!?…][\"'»”’)\]]*\s+")
+# longer texts are split before NLP: Stanza's memory grows with the input
+# and spaCy refuses texts over `max_length` (1,000,000 chars by default)
+CHUNK_CHARS = 50_000
+# chunks handed to spaCy per `pipe` call, i.e. per hold of the model lock
+BATCH_CHUNKS = 20
+
+
+def _stanza_pipeline(lang: str) -> stanza.Pipeline:
+    """The registry's Stanza pipeline for `lang` (tokenize, mwt, pos, lemma)."""
+    return models.get(lang)
 
 
-@lru_cache(maxsize=None)
 def _stanza_de_pipeline() -> stanza.Pipeline:
-    """
-    Load and cache the Stanza German pipeline (tokenize, mwt, pos, lemma).
-    """
-    return stanza.Pipeline(
-        lang="de",
-        processors="tokenize,mwt,pos,lemma",
-        use_gpu=False,
-        verbose=False,
-    )
+    return _stanza_pipeline("de")
 
 
-@lru_cache(maxsize=None)
 def _spacy_model(lang: str) -> Language:
+    """The registry's spaCy model for `lang` (English for unlisted languages)."""
+    return models.get(lang)
+
+
+def _checked(texts: Iterable[str], cancel: CancelToken | None) -> Iterator[str]:
+    for text in texts:
+        if cancel is not None:
+            cancel.check()
+        yield text
+
+
+def chunk_text(text: str, limit: int | None = None) -> List[str]:
     """
-    Load & cache spaCy models for non‑German languages.
+    Split `text` into pieces of at most `limit` characters (default
+    `CHUNK_CHARS`), cutting after the last sentence end that fits, else at
+    a line break or space, so no word or (usually) sentence is torn apart.
     """
-    name_map = {
-        "en": "en_core_web_sm",
-        # add others here if needed
-    }
-    model = name_map.get(lang.lower(), "en_core_web_sm")
-    return spacy.load(model, disable=["ner", "parser", "textcat"])
+    limit = limit or CHUNK_CHARS
+    if len(text) <= limit:
+        return [text]
+    chunks: List[str] = []
+    start = 0
+    while len(text) - start > limit:
+        window = text[start : start + limit]
+        cut = 0
+        for m in _SENTENCE_END.finditer(window):
+            cut = m.end()
+        cut = cut or window.rfind("\n") + 1 or window.rfind(" ") + 1 or limit
+        chunks.append(text[start : start + cut])
+        start += cut
+    chunks.append(text[start:])
+    return chunks
 
 
-def tokenize_lemmas(
-    texts: Iterable[str],
-    lang: str = "en",
-) -> List[WordInfo]:
+def _batches(chunks: Iterable[str], size: int) -> Iterator[List[str]]:
+    it = iter(chunks)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+def _iter_docs(chunks: Iterable[str], lang: str) -> Iterator[List[WordInfo]]:
     """
-    Lemmatise text chunks:
-      - German ('de'): use Stanza UD pipeline for perfect accuracy.
-      - Others: use spaCy.
+    Yield the alphabetic tokens of each chunk, one list per chunk.  The
+    model runs under the registry's lock for `lang`, so concurrent jobs
+    share it one batch at a time; the lock is never held across a yield.
     """
-    lang = lang.lower()
-    results: List[WordInfo] = []
-
-    if lang == "de":
-        nlp_de = _stanza_de_pipeline()
-        for text in texts:
-            doc = nlp_de(text)
+    lock = models.lock(lang)
+    if spec_for(lang).backend == "stanza":
+        nlp = _stanza_pipeline(lang)
+        for text in chunks:
+            with lock:
+                doc = nlp(text)
+            page: List[WordInfo] = []
             for sentence in doc.sentences:
                 for word in sentence.words:
                     # skip tokens that aren’t pure letters
                     if not _WORD_RE.fullmatch(word.text):
                         continue
-                    results.append(
-                        WordInfo(lemma=word.lemma.lower(), pos=word.upos)
+                    page.append(
+                        WordInfo(
+                            lemma=word.lemma.lower(), pos=word.upos, text=word.text
+                        )
                     )
+            yield page
     else:
         nlp = _spacy_model(lang)
-        for doc in nlp.pipe(texts, batch_size=20):
-            for token in doc:
-                if not token.is_alpha or not _WORD_RE.fullmatch(token.text):
-                    continue
-                results.append(
-                    WordInfo(lemma=token.lemma_.lower(), pos=token.pos_)
-                )
+        for batch in _batches(chunks, BATCH_CHUNKS):
+            with lock:
+                docs = list(nlp.pipe(batch, batch_size=BATCH_CHUNKS))
+            for doc in docs:
+                yield [
+                    WordInfo(
+                        lemma=token.lemma_.lower(), pos=token.pos_, text=token.text
+                    )
+                    for token in doc
+                    if token.is_alpha and _WORD_RE.fullmatch(token.text)
+                ]
 
+
+def _iter_pages(texts: Iterable[str], lang: str) -> Iterator[List[WordInfo]]:
+    """
+    Yield one token list per text.  Oversized texts go to the pipeline as
+    `chunk_text` pieces, so its memory is bounded by `CHUNK_CHARS` rather
+    than by the page, and their tokens are stitched back onto the page.
+    """
+    owners: deque[int] = deque()  # page index of each chunk in flight
+
+    def chunks() -> Iterator[str]:
+        for idx, text in enumerate(texts):
+            for chunk in chunk_text(text):
+                owners.append(idx)
+                yield chunk
+
+    page: List[WordInfo] = []
+    current = None
+    for tokens in _iter_docs(chunks(), lang):
+        idx = owners.popleft()
+        if idx != current:
+            if current is not None:
+                yield page
+            page, current = [], idx
+        page.extend(tokens)
+    if current is not None:
+        yield page
+
+
+def tokenize_lemmas(
+    texts: Iterable[str],
+    lang: str = "en",
+    cancel: CancelToken | None = None,
+) -> List[WordInfo]:
+    """
+    Lemmatise text chunks with the language's model from the registry
+    (`nlp.registry.LANGUAGES`):
+      - German ('de'): use Stanza UD pipeline for perfect accuracy.
+      - Others: use spaCy.
+    `cancel` is checked before each chunk is handed to the pipeline.
+    """
+    results: List[WordInfo] = []
+    for page in _iter_pages(_checked(texts, cancel), lang.lower()):
+        results.extend(page)
     return results
 
+
+def tokenize_pages(
+    texts: Iterable[str],
+    lang: str = "en",
+    cancel: CancelToken | None = None,
+) -> List[List[WordInfo]]:
+    """Like `tokenize_lemmas`, but keep one token list per text chunk."""
+    return list(_iter_pages(_checked(texts, cancel), lang.lower()))
+
+
+def iter_pages(
+    texts: Iterable[str],
+    lang: str = "en",
+    cancel: CancelToken | None = None,
+) -> Iterator[List[WordInfo]]:
+    """`tokenize_pages` as a generator, for callers that stream the book."""
+    return _iter_pages(_checked(texts, cancel), lang.lower())
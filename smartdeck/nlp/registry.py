@@ -0,0 +1,220 @@
+"""
+Language model registry.
+
+Which pipeline serves a language is declared once in `LANGUAGES`; models
+are loaded on first use and kept in least-recently-used order.  Each load
+is charged the growth in resident memory it caused, and once the total
+exceeds the budget (SMARTDECK_MODEL_BUDGET_MB, unset or 0 = unlimited) the
+least recently used models are dropped.  `preload` loads a language on a
+background thread so the next job finds it warm.  Pipelines are not safe
+to run from several threads at once, so callers hold `lock(lang)` while a
+model works.  `is_installed` tells
+the languages whose model is present from those that need a download.
+"""
+
+from __future__ import annotations
+
+import gc
+import importlib.util
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Literal, Mapping, Tuple
+
+from smartdeck.utils.profiling import current_rss_bytes
+
+Backend = Literal["spacy", "stanza"]
+
+
+@dataclass(frozen=True)
+class ModelSpec:
+    lang: str
+    backend: Backend
+    name: str  # spaCy package, or Stanza language code
+    options: Mapping[str, Any] = field(default_factory=dict)
+    approx_mb: int = 0  # charged when RSS cannot be measured
+
+
+_SPACY_DISABLE = {"disable": ["ner", "parser", "textcat"]}
+
+LANGUAGES: Dict[str, ModelSpec] = {
+    spec.lang: spec
+    for spec in (
+        ModelSpec("en", "spacy", "en_core_web_sm", _SPACY_DISABLE, approx_mb=60),
+        ModelSpec(
+            "de",
+            "stanza",
+            "de",
+            {
+                "processors": "tokenize,mwt,pos,lemma",
+                "use_gpu": False,
+                "verbose": False,
+            },
+            approx_mb=600,
+        ),
+        ModelSpec("fr", "spacy", "fr_core_news_sm", _SPACY_DISABLE, approx_mb=60),
+        ModelSpec("es", "spacy", "es_core_news_sm", _SPACY_DISABLE, approx_mb=60),
+        ModelSpec("it", "spacy", "it_core_news_sm", _SPACY_DISABLE, approx_mb=60),
+        ModelSpec("nl", "spacy", "nl_core_news_sm", _SPACY_DISABLE, approx_mb=60),
+        ModelSpec("pt", "spacy", "pt_core_news_sm", _SPACY_DISABLE, approx_mb=60),
+    )
+}
+# languages without an entry use this one's model, as before the registry
+FALLBACK_LANG = "en"
+
+
+def spec_for(lang: str) -> ModelSpec:
+    return LANGUAGES.get(lang.lower(), LANGUAGES[FALLBACK_LANG])
+
+
+def is_installed(spec: ModelSpec) -> bool:
+    """Whether `spec`'s model is on disk, so loading it needs no download."""
+    if spec.backend == "spacy":
+        from spacy.util import is_package
+
+        return is_package(spec.name)
+    if importlib.util.find_spec("stanza") is None:
+        return False
+    resources = os.environ.get("STANZA_RESOURCES_DIR", "~/stanza_resources")
+    return (Path(resources).expanduser() / spec.name).is_dir()
+
+
+def installed_languages() -> List[str]:
+    """The `LANGUAGES` whose model is installed, in declaration order."""
+    return [lang for lang, spec in LANGUAGES.items() if is_installed(spec)]
+
+
+def _load_spacy(spec: ModelSpec) -> Any:
+    import spacy
+
+    return spacy.load(spec.name, **spec.options)
+
+
+def _load_stanza(spec: ModelSpec) -> Any:
+    import stanza
+
+    return stanza.Pipeline(lang=spec.name, **spec.options)
+
+
+LOADERS: Dict[str, Callable[[ModelSpec], Any]] = {
+    "spacy": _load_spacy,
+    "stanza": _load_stanza,
+}
+
+
+def budget_from_env() -> int | None:
+    mb = os.environ.get("SMARTDECK_MODEL_BUDGET_MB", "")
+    return int(float(mb) * 2**20) if mb not in ("", "0") else None
+
+
+class ModelRegistry:
+    """
+    Lazily loaded models under a memory budget, evicted LRU first.
+
+    `budget` is in bytes; None reads SMARTDECK_MODEL_BUDGET_MB on every
+    check.  The model just requested is never evicted, so a single model
+    larger than the budget still loads.  An evicted model stays alive for
+    callers still holding it and is freed when they finish.
+    """
+
+    def __init__(
+        self,
+        budget: int | None = None,
+        loader: Callable[[ModelSpec], Any] | None = None,
+        measure: Callable[[], int | None] = current_rss_bytes,
+    ) -> None:
+        self._budget = budget
+        self._loader = loader
+        self._measure = measure
+        self._models: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading: Dict[str, threading.Lock] = {}
+        self._running: Dict[str, threading.Lock] = {}
+
+    @property
+    def budget(self) -> int | None:
+        return self._budget if self._budget is not None else budget_from_env()
+
+    def get(self, lang: str) -> Any:
+        spec = spec_for(lang)
+        with self._lock:
+            if spec.lang in self._models:
+                self._models.move_to_end(spec.lang)
+                return self._models[spec.lang][0]
+            loading = self._loading.setdefault(spec.lang, threading.Lock())
+        # one loader per language; other languages stay available meanwhile
+        with loading:
+            with self._lock:
+                if spec.lang in self._models:
+                    self._models.move_to_end(spec.lang)
+                    return self._models[spec.lang][0]
+            before = self._measure()
+            model = (self._loader or LOADERS[spec.backend])(spec)
+            after = self._measure()
+            if before is None or after is None:
+                size = spec.approx_mb * 2**20
+            else:
+                size = max(after - before, 0)
+            with self._lock:
+                self._models[spec.lang] = (model, size)
+                self._evict_over_budget(keep=spec.lang)
+            return model
+
+    def lock(self, lang: str) -> threading.Lock:
+        """The lock serialising every use of `lang`'s model across threads."""
+        with self._lock:
+            return self._running.setdefault(spec_for(lang).lang, threading.Lock())
+
+    def _evict_over_budget(self, keep: str) -> None:
+        budget = self.budget
+        if budget is None:
+            return
+        dropped = False
+        for lang in list(self._models):
+            if self.resident_bytes <= budget:
+                break
+            if lang != keep:
+                del self._models[lang]
+                dropped = True
+        if dropped:
+            gc.collect()
+
+    def preload(self, lang: str) -> threading.Thread:
+        """Load `lang` on a daemon thread; errors surface on the next `get`."""
+
+        def run() -> None:
+            try:
+                self.get(lang)
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=run, name=f"preload-{lang}", daemon=True)
+        thread.start()
+        return thread
+
+    def evict(self, lang: str) -> bool:
+        with self._lock:
+            found = self._models.pop(spec_for(lang).lang, None) is not None
+        if found:
+            gc.collect()
+        return found
+
+    def clear(self) -> None:
+        with self._lock:
+            self._models.clear()
+        gc.collect()
+
+    def loaded(self) -> List[Tuple[str, int]]:
+        """(lang, charged bytes) of the resident models, LRU first."""
+        with self._lock:
+            return [(lang, size) for lang, (_, size) in self._models.items()]
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(size for _, size in self._models.values())
+
+
+# the process-wide registry used by `tokenize_lemmas`
+models = ModelRegistry()
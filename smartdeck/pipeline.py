@@ -0,0 +1,184 @@
+"""Overlapped execution of the `build` enrichment stages."""
+
+from __future__ import annotations
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from smartdeck.deck.excerpt import iter_excerpts
+from smartdeck.enrich.ipa import IpaService
+from smartdeck.utils.profiling import Profiler
+
+_DONE = object()
+
+Translate = Callable[[str, str, str], str]  # (text, src, dest) -> translation
+# (pages, lemmas) -> (lemma, (excerpt, loc)) pairs, e.g. `iter_excerpts`
+ExcerptFinder = Callable[
+    [Sequence[str], List[str]], Iterable[Tuple[str, Tuple[str, str]]]
+]
+
+
+class StagedExecutor:
+    """
+    Push items from a source through a chain of stages.
+
+    Every stage runs on its own worker thread(s) and hands results to the
+    next stage through a bounded queue, so a slow stage (network) overlaps
+    with the others instead of waiting for them.  Results are returned in
+    completion order; the first exception raised by any stage is re-raised
+    from `run` once everything has shut down.
+    """
+
+    def __init__(self, maxsize: int = 32) -> None:
+        self.maxsize = maxsize
+        self._stages: List[Tuple[str, Callable[[Any], Any], int]] = []
+
+    def add_stage(
+        self, name: str, fn: Callable[[Any], Any], workers: int = 1
+    ) -> "StagedExecutor":
+        self._stages.append((name, fn, max(1, workers)))
+        return self
+
+    def run(self, source: Iterable[Any]) -> List[Any]:
+        queues = [queue.Queue(self.maxsize) for _ in range(len(self._stages) + 1)]
+        errors: List[BaseException] = []
+        failed = threading.Event()
+        threads: List[threading.Thread] = []
+
+        def feed() -> None:
+            try:
+                for item in source:
+                    if failed.is_set():
+                        break
+                    queues[0].put(item)
+            except BaseException as exc:
+                errors.append(exc)
+                failed.set()
+            finally:
+                for _ in range(self._stages[0][2] if self._stages else 1):
+                    queues[0].put(_DONE)
+
+        for idx, (name, fn, workers) in enumerate(self._stages):
+            inbox, outbox = queues[idx], queues[idx + 1]
+            downstream = self._stages[idx + 1][2] if idx + 1 < len(self._stages) else 1
+            remaining = [workers]
+            lock = threading.Lock()
+
+            def work(
+                fn=fn,
+                inbox=inbox,
+                outbox=outbox,
+                downstream=downstream,
+                remaining=remaining,
+                lock=lock,
+            ) -> None:
+                while (item := inbox.get()) is not _DONE:
+                    if failed.is_set():
+                        continue  # drain so upstream never blocks
+                    try:
+                        outbox.put(fn(item))
+                    except BaseException as exc:
+                        errors.append(exc)
+                        failed.set()
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    for _ in range(downstream):
+                        outbox.put(_DONE)
+
+            for n in range(workers):
+                threads.append(
+                    threading.Thread(target=work, name=f"stage-{name}-{n}", daemon=True)
+                )
+
+        threads.append(threading.Thread(target=feed, name="stage-source", daemon=True))
+        for t in threads:
+            t.start()
+
+        results: List[Any] = []
+        sink = queues[-1]
+        while (item := sink.get()) is not _DONE:
+            results.append(item)
+        for t in threads:
+            t.join()
+        if errors:
+            raise errors[0]
+        return results
+
+
+def enrich_entries(
+    texts: Sequence[str],
+    top_lemmas: List[str],
+    pos_map: Dict[str, str],
+    lang: str,
+    translate: Translate,
+    ipa: IpaService,
+    prof: Profiler,
+    workers: int = 4,
+    queue_size: int = 32,
+    find_excerpts: ExcerptFinder = iter_excerpts,
+) -> Tuple[List[Tuple[str, ...]], Dict[str, Tuple[str, str]]]:
+    """
+    Capture excerpts, translate words and sentences and transcribe IPA for
+    `top_lemmas`, overlapping the stages:
+
+      excerpts ──▶ translate (word + sentence, `workers` threads)
+      ipa (separate worker, runs while translation is in flight)
+
+    Returns `(entries, occurrences)` where entries are the 7‑tuples
+    `build_deck` expects, in `top_lemmas` order, identical to running the
+    stages one after another.  `find_excerpts` picks the sentences
+    (first match by default; see `deck.ranking` for i+1 selection).
+    """
+    dest = "de" if lang.lower().startswith("en") else "en"
+
+    def excerpts() -> Iterator[Tuple[str, Tuple[str, str]]]:
+        with prof.stage("excerpts") as st:
+            for item in find_excerpts(texts, top_lemmas):
+                st.add()
+                yield item
+
+    def translate_both(item):
+        lemma, (excerpt, loc) = item
+        with prof.stage("translate") as st:
+            word = translate(lemma, lang, dest)
+            st.add()
+        with prof.stage("translate_sentences") as st:
+            sentence = translate(excerpt, lang, dest)
+            st.add()
+        return lemma, (excerpt, loc), word, sentence
+
+    def transcribe() -> Dict[str, str]:
+        with prof.stage("ipa") as st:
+            ipas = ipa.transliterate_many(lang, top_lemmas, stage=st)
+            st.add(len(ipas))
+            return ipas
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="stage-ipa") as side:
+        ipa_future = side.submit(transcribe)
+        pipe = StagedExecutor(maxsize=queue_size)
+        pipe.add_stage("translate", translate_both, workers=workers)
+        done = {row[0]: row for row in pipe.run(excerpts())}
+        ipas = ipa_future.result()
+
+    occ: Dict[str, Tuple[str, str]] = {}
+    entries: List[Tuple[str, ...]] = []
+    for lemma in top_lemmas:
+        _, (excerpt, loc), word, sentence = done[lemma]
+        occ[lemma] = (excerpt, loc)
+        # (lemma, word‑translation, ipa, pos, excerpt, sent‑translation, loc)
+        entries.append(
+            (
+                lemma,
+                word,
+                ipas.get(lemma, ""),
+                pos_map.get(lemma, ""),
+                excerpt,
+                sentence,
+                loc,
+            )
+        )
+    return entries, occ
@@ -0,0 +1,32 @@
+"""Cooperative cancellation for long-running pipeline loops."""
+
+from __future__ import annotations
+
+import threading
+
+
+class Cancelled(Exception):
+    """Raised from `CancelToken.check` once the job has been cancelled."""
+
+
+class CancelToken:
+    """
+    Thread-safe flag set by the UI and polled by worker loops.
+
+    Loops call `check()` once per page/document; it raises `Cancelled`
+    after `cancel()`, unwinding the job at the next safe point.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self) -> None:
+        if self._event.is_set():
+            raise Cancelled()
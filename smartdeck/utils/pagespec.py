@@ -1,10 +1,13 @@
 """Parse page specs like '1-3,7' into zero‑based indices."""
+
 from __future__ import annotations
+
 import re
-from typing import List
+from typing import Iterable, Iterator, List
 
 _RANGE = re.compile(r"(\d+)(?:-(\d+))?")
 
+
 def parse_pagespec(spec: str | None, total_pages: int | None = None) -> List[int]:
     if spec is None:
         return list(range(total_pages or 0))
@@ -20,19 +23,65 @@ def parse_pagespec(spec: str | None, total_pages: int | None = None) -> List[int
         end = int(m.group(2) or start)
         if end < start:
             raise ValueError(f"Descending range: {token!r}")
-        pages.update(range(start - 1, end))      # zero‑based
+        pages.update(range(start - 1, end))  # zero‑based
     if total_pages is not None:
         pages = {p for p in pages if p < total_pages}
     return sorted(pages)
 
+
 def virtual_split(text: str, every: int) -> List[str]:
     """
     Split `text` into pseudo-pages of `every` words each.
     E.g., virtual_split("a b c d e", 2) → ["a b", "c d", "e"].
     """
-    words = text.split()
-    return [
-        " ".join(words[i : i + every])
-        for i in range(0, len(words), every)
-        if words[i : i + every]
-    ]
+    return list(iter_virtual_pages([text], every))
+
+
+def _word_chunks(pages: Iterable[str], every: int) -> Iterator[List[str]]:
+    """Yield lists of `every` words, carrying partial chunks across pages."""
+    carry: List[str] = []
+    for text in pages:
+        words = text.split()
+        if carry:
+            need = every - len(carry)
+            carry.extend(words[:need])
+            words = words[need:]
+            if len(carry) < every:
+                continue
+            yield carry
+            carry = []
+        full = len(words) - len(words) % every
+        for i in range(0, full, every):
+            yield words[i : i + every]
+        carry = words[full:]
+    if carry:
+        yield carry
+
+
+def iter_virtual_pages(
+    pages: Iterable[str],
+    every: int,
+    spec: str | None = None,
+) -> Iterator[str]:
+    """
+    Stream pseudo-pages of `every` words from an iterable of page texts,
+    without joining the whole book into one string first.
+
+    If `spec` is given it selects *virtual* pages (1‑based, like
+    `parse_pagespec`); chunks outside the range are counted but never
+    joined, and `pages` is not consumed past the last requested chunk.
+    """
+    if spec is None:
+        for words in _word_chunks(pages, every):
+            yield " ".join(words)
+        return
+
+    wanted = set(parse_pagespec(spec))
+    if not wanted:
+        return
+    last = max(wanted)
+    for idx, words in enumerate(_word_chunks(pages, every)):
+        if idx in wanted:
+            yield " ".join(words)
+        if idx >= last:
+            return
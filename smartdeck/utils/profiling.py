@@ -0,0 +1,281 @@
+"""Per-stage timing, counters and memory instrumentation for the pipeline."""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Literal, TypedDict
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+class StageEvent(TypedDict):
+    event: Literal["start", "end"]
+    stage: str
+    wall: float  # seconds during which the stage was running
+    busy: float  # seconds summed over every thread running it
+    cpu: float  # process CPU seconds while the stage was running
+    items: int
+    peak_rss: int | None
+
+
+Listener = Callable[[StageEvent], None]
+
+
+def peak_rss_bytes() -> int | None:
+    """Peak resident set size of this process, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> int | None:
+    """Current resident set size (Linux /proc), falling back to the peak."""
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_bytes()
+    return pages * resource.getpagesize() if resource else None
+
+
+class Stage:
+    """
+    Accumulated measurements of one named pipeline stage.
+
+    `wall` and `cpu` cover the time during which at least one call of the
+    stage was running, so overlapping calls from several threads are not
+    counted twice; `busy` is the sum of every call's own duration (worker
+    seconds).  `busy / wall` is then the stage's average concurrency.
+    """
+
+    __slots__ = (
+        "name",
+        "wall",
+        "busy",
+        "cpu",
+        "calls",
+        "items",
+        "hits",
+        "misses",
+        "peak_rss",
+        "_lock",
+        "_active",
+        "_wall0",
+        "_cpu0",
+    )
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.wall = 0.0
+        self.busy = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+        self.items = 0
+        self.hits = 0
+        self.misses = 0
+        self.peak_rss: int | None = None
+        self._lock = threading.Lock()
+        self._active = 0
+        self._wall0 = 0.0
+        self._cpu0 = 0.0
+
+    def add(self, items: int = 1) -> None:
+        with self._lock:
+            self.items += items
+
+    def hit(self, n: int = 1) -> None:
+        with self._lock:
+            self.hits += n
+
+    def miss(self, n: int = 1) -> None:
+        with self._lock:
+            self.misses += n
+
+    def _enter(self) -> float:
+        now = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+            if not self._active:
+                self._wall0, self._cpu0 = now, time.process_time()
+            self._active += 1
+        return now
+
+    def _exit(self, started: float) -> None:
+        now = time.perf_counter()
+        with self._lock:
+            self.busy += now - started
+            self._active -= 1
+            if not self._active:
+                self.wall += now - self._wall0
+                self.cpu += time.process_time() - self._cpu0
+            self.peak_rss = peak_rss_bytes()
+
+    @property
+    def hit_rate(self) -> float | None:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else None
+
+    def to_dict(self) -> dict:
+        return {
+            "stage": self.name,
+            "wall": self.wall,
+            "busy": self.busy,
+            "cpu": self.cpu,
+            "calls": self.calls,
+            "items": self.items,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "peak_rss": self.peak_rss,
+        }
+
+
+class Profiler:
+    """
+    Collect wall/busy/CPU time, item counts, cache hits and peak RSS per stage.
+
+    Wrap each pipeline step in `with prof.stage("name") as st:` and record
+    work through `st.add()`, `st.hit()`, `st.miss()`.  Listeners receive a
+    `StageEvent` when a stage starts and ends (the GUI turns them into
+    progress updates).  Stages may run concurrently from several threads.
+    """
+
+    def __init__(self, listeners: List[Listener] | None = None) -> None:
+        self.stages: dict[str, Stage] = {}
+        self.listeners: List[Listener] = list(listeners or [])
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def _emit(self, event: Literal["start", "end"], st: Stage) -> None:
+        payload = StageEvent(
+            event=event,
+            stage=st.name,
+            wall=st.wall,
+            busy=st.busy,
+            cpu=st.cpu,
+            items=st.items,
+            peak_rss=st.peak_rss,
+        )
+        for listener in self.listeners:
+            listener(payload)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[Stage]:
+        with self._lock:
+            st = self.stages.get(name)
+            if st is None:
+                st = self.stages[name] = Stage(name)
+        started = st._enter()
+        self._emit("start", st)
+        try:
+            yield st
+        finally:
+            st._exit(started)
+            self._emit("end", st)
+
+    @property
+    def total_wall(self) -> float:
+        return time.perf_counter() - self._started
+
+    def to_dict(self) -> dict:
+        return {
+            "total_wall": self.total_wall,
+            "peak_rss": peak_rss_bytes(),
+            "stages": [st.to_dict() for st in self.stages.values()],
+        }
+
+    def write_json(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.to_dict(), indent=2))
+
+    def format_table(self) -> str:
+        """Human-readable summary, one row per stage in execution order."""
+        rows = [("stage", "wall s", "busy s", "cpu s", "items", "hit rate", "peak RSS")]
+        for st in self.stages.values():
+            rate = st.hit_rate
+            rows.append(
+                (
+                    st.name,
+                    f"{st.wall:.3f}",
+                    f"{st.busy:.3f}",
+                    f"{st.cpu:.3f}",
+                    str(st.items),
+                    "-" if rate is None else f"{rate:.0%}",
+                    _fmt_bytes(st.peak_rss),
+                )
+            )
+        rows.append(
+            (
+                "total",
+                f"{self.total_wall:.3f}",
+                "",
+                "",
+                "",
+                "",
+                _fmt_bytes(peak_rss_bytes()),
+            )
+        )
+        widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+        lines = []
+        for n, row in enumerate(rows):
+            cells = [row[0].ljust(widths[0])]
+            cells += [c.rjust(w) for c, w in zip(row[1:], widths[1:])]
+            lines.append("  ".join(cells))
+            if n == 0:
+                lines.append("-" * len(lines[0]))
+        return "\n".join(lines)
+
+
+def _fmt_bytes(n: int | None) -> str:
+    return "-" if n is None else f"{n / 2**20:.1f} MB"
+
+
+@contextmanager
+def profile_dump(path: str | Path | None) -> Iterator[None]:
+    """
+    Profile the enclosed block and write the result to `path`.
+
+    `.html` / `.txt` targets use pyinstrument (if installed); anything else
+    gets cProfile stats loadable with `pstats` or snakeviz.
+    """
+    if path is None:
+        yield
+        return
+    path = Path(path)
+    if path.suffix in (".html", ".txt"):
+        try:
+            from pyinstrument import Profiler as SamplingProfiler
+        except ImportError:
+            raise RuntimeError(
+                f"pyinstrument is required for {path.suffix} profiles"
+            ) from None
+        sampler = SamplingProfiler()
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            text = (
+                sampler.output_html()
+                if path.suffix == ".html"
+                else sampler.output_text(unicode=True)
+            )
+            path.write_text(text)
+        return
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        prof.dump_stats(str(path))
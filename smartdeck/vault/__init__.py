@@ -1,3 +1,4 @@
-from .db import Vault, CoverageTier
+from .db import CoverageTier, Vault, coverage_tier
+from .lexicon import LemmaTable, MappedLemmaTable
 
-__all__ = ["Vault", "CoverageTier"]
+__all__ = ["Vault", "CoverageTier", "coverage_tier", "LemmaTable", "MappedLemmaTable"]
@@ -1,38 +1,141 @@
 from __future__ import annotations
+
 import os
 import sqlite3
 from collections import Counter
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Literal, Tuple
+from typing import Collection, Iterable, Iterator, List, Literal, Tuple
+
+from . import maintenance, migrations
+from .lexicon import LemmaTable
 
 # Default database location
 _VAULT_PATH = Path("~/.smartdeck/known.db").expanduser()
 _VAULT_PATH.parent.mkdir(parents=True, exist_ok=True)
 
+# seconds a connection waits for another writer's lock
+_BUSY_TIMEOUT = 30.0
+
 CoverageTier = Literal["EASY", "ADEQUATE", "CHALLENGING", "FRUSTRATING"]
 
+# lower bound of token coverage for each tier, easiest first
+TIER_THRESHOLDS: tuple[tuple[float, CoverageTier], ...] = (
+    (0.98, "EASY"),
+    (0.95, "ADEQUATE"),
+    (0.90, "CHALLENGING"),
+    (0.0, "FRUSTRATING"),
+)
+
+
+def coverage_tier(cov: float) -> CoverageTier:
+    """Map a token coverage fraction to its tier label."""
+    for threshold, tier in TIER_THRESHOLDS:
+        if cov >= threshold:
+            return tier
+    return "FRUSTRATING"
+
+
+def count_unknown(
+    lemmas: Iterable[str], known: Collection[str]
+) -> tuple[int, int, Counter[str]]:
+    """
+    The vault's membership rule: a token is unknown when its lowercased
+    lemma is not in `known`.  Returns (tokens, unknown tokens, Counter)
+    where the Counter has each unknown occurrence under its raw lemma and,
+    if that differs, under the lowercase lemma too.
+    """
+    total = unknown = 0
+    unknown_counter: Counter[str] = Counter()
+    for raw in lemmas:
+        total += 1
+        low = raw.lower()
+        if low not in known:
+            unknown += 1
+            unknown_counter[raw] += 1
+            if raw != low:
+                unknown_counter[low] += 1
+    return total, unknown, unknown_counter
+
 
 class _Row(tuple):
-    def __new__(cls, values: Tuple, mapping: dict[str, object]):
-        obj = super().__new__(cls, values)
-        obj._mapping = mapping
-        return obj
+    """
+    Result row: a plain tuple that can also be indexed by column name.
+
+    Each distinct column list gets its own subclass (see `_row_class`)
+    holding the shared name → index map, so a row costs no more than the
+    tuple itself.
+    """
+
+    __slots__ = ()
+    _index: dict[str, int] = {}
 
     def __getitem__(self, key):
-        if isinstance(key, str):
-            return self._mapping[key]
-        return super().__getitem__(key)
+        if key.__class__ is str:
+            return tuple.__getitem__(self, self._index[key])
+        return tuple.__getitem__(self, key)
+
+    def keys(self) -> List[str]:
+        return list(self._index)
 
-    def __eq__(self, other):
-        if isinstance(other, tuple):
-            return tuple(self).__eq__(other)
-        return super().__eq__(other)
+
+_ROW_CLASSES: dict[Tuple[str, ...], type] = {}
+# (cursor.description, row class) of the most recent statement; sqlite3
+# builds `description` once per statement, so an identity check suffices
+_LAST_ROW_CLASS: tuple = (None, _Row)
+
+
+def _row_class(description: Tuple) -> type:
+    names = tuple(desc[0] for desc in description)
+    cls = _ROW_CLASSES.get(names)
+    if cls is None:
+        index = {name: idx for idx, name in enumerate(names)}
+        cls = _ROW_CLASSES[names] = type(
+            "_Row", (_Row,), {"__slots__": (), "_index": index}
+        )
+    return cls
 
 
 def _row_factory(cursor: sqlite3.Cursor, row: Tuple) -> _Row:
-    mapping = {desc[0]: row[idx] for idx, desc in enumerate(cursor.description)}
-    return _Row(row, mapping)
+    global _LAST_ROW_CLASS
+    description = cursor.description
+    last, cls = _LAST_ROW_CLASS
+    if description is not last:
+        cls = _row_class(description)
+        _LAST_ROW_CLASS = (description, cls)
+    return tuple.__new__(cls, row)
+
+
+def _plain_cursor(con: sqlite3.Connection) -> sqlite3.Cursor:
+    """Cursor yielding bare tuples, for bulk reads that index by position."""
+    cur = con.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def _intern(con: sqlite3.Connection, lang: str, distinct: List[str]) -> dict[str, int]:
+    """Ids of the `distinct` lemmas, interning the new ones; call inside a write."""
+    ids: dict[str, int] = {}
+    for i in range(0, len(distinct), 500):
+        chunk = distinct[i : i + 500]
+        marks = ",".join("?" * len(chunk))
+        ids.update(
+            _plain_cursor(con).execute(
+                f"SELECT lemma, id FROM lemma_ids WHERE lang=? AND lemma IN ({marks})",
+                (lang, *chunk),
+            )
+        )
+    new = [lemma for lemma in distinct if lemma not in ids]
+    if new:
+        start = con.execute(
+            "SELECT COALESCE(MAX(id) + 1, 0) FROM lemma_ids WHERE lang=?", (lang,)
+        ).fetchone()[0]
+        ids.update((lemma, start + n) for n, lemma in enumerate(new))
+        con.executemany(
+            "INSERT INTO lemma_ids(lang, id, lemma) VALUES(?, ?, ?)",
+            ((lang, ids[lemma], lemma) for lemma in new),
+        )
+    return ids
 
 
 class Vault:
@@ -47,7 +150,10 @@ class Vault:
 
     @contextmanager
     def _conn(self):
-        con = sqlite3.connect(self.db_path)
+        # every call gets its own connection, so a Vault may be shared
+        # between threads; the WAL journal (see _ensure_schema) lets readers
+        # run next to a writer and the timeout waits out competing writers
+        con = sqlite3.connect(self.db_path, timeout=_BUSY_TIMEOUT)
         con.row_factory = _row_factory
         con.execute("PRAGMA foreign_keys = ON;")
         try:
@@ -57,39 +163,50 @@ class Vault:
             con.close()
 
     def _ensure_schema(self) -> None:
+        # the common case is a single PRAGMA read; large backfills are left
+        # to `smartdeck vault migrate`
         with self._conn() as con:
-            con.executescript(
-                """
-                PRAGMA foreign_keys = ON;
-
-                CREATE TABLE IF NOT EXISTS sources (
-                    id     INTEGER PRIMARY KEY,
-                    kind   TEXT NOT NULL,
-                    ident  TEXT NOT NULL,
-                    UNIQUE(kind, ident)
-                );
-
-                CREATE TABLE IF NOT EXISTS known_words (
-                    id     INTEGER PRIMARY KEY,
-                    lang   TEXT NOT NULL,
-                    lemma  TEXT NOT NULL,
-                    UNIQUE(lang, lemma)
-                );
-
-                CREATE TABLE IF NOT EXISTS word_sources (
-                    word_id INTEGER REFERENCES known_words(id) ON DELETE CASCADE,
-                    src_id  INTEGER REFERENCES sources(id)     ON DELETE CASCADE,
-                    PRIMARY KEY (word_id, src_id)
-                );
-
-                CREATE TABLE IF NOT EXISTS occurrences (
-                    word_id  INTEGER PRIMARY KEY
-                             REFERENCES known_words(id) ON DELETE CASCADE,
-                    excerpt  TEXT,
-                    location TEXT
-                );
-                """
-            )
+            if migrations.schema_version(con) >= migrations.LATEST_VERSION:
+                return
+            if migrations.schema_version(con) == 0:
+                # takes effect only while the file has no tables yet
+                con.execute("PRAGMA auto_vacuum = INCREMENTAL;")
+            con.execute("PRAGMA journal_mode = WAL;")
+            migrations.migrate(con, max_backfill_rows=migrations.STARTUP_BACKFILL_ROWS)
+
+    @property
+    def schema_version(self) -> int:
+        with self._conn() as con:
+            return migrations.schema_version(con)
+
+    @property
+    def deferred_backfills(self) -> List[migrations.Migration]:
+        """Backfills left for `migrate` because the vault was too large."""
+        with self._conn() as con:
+            return migrations.deferred(con)
+
+    def migrate(
+        self, batch_size: int = 5_000, progress: migrations.Progress | None = None
+    ) -> int:
+        """Run every pending migration, including deferred backfills."""
+        with self._conn() as con:
+            con.execute("PRAGMA journal_mode = WAL;")
+            return migrations.migrate(con, batch_size, progress=progress)
+
+    def optimize(
+        self, budget: float = 5.0, full: bool = False, integrity: bool = True
+    ) -> maintenance.MaintenanceReport:
+        """Vacuum, ANALYZE and integrity-check the vault; see maintenance.optimize."""
+        with self._conn() as con:
+            return maintenance.optimize(con, self.db_path, budget, full, integrity)
+
+    def list_sources(self) -> List[Tuple[str, str]]:
+        """All registered `(kind, ident)` sources, in registration order."""
+        with self._conn() as con:
+            return [
+                (row[0], row[1])
+                for row in con.execute("SELECT kind, ident FROM sources ORDER BY id")
+            ]
 
     def _get_or_add_source(self, kind: str, ident: str) -> int:
         with self._conn() as con:
@@ -111,20 +228,36 @@ class Vault:
             if not (row := cur.fetchone()):
                 return
             src_id = int(row[0])
-            # 1) unlink this source
+            # 1) remember this source's words, then unlink them
+            con.execute(
+                "CREATE TEMP TABLE unlinked AS "
+                "SELECT word_id FROM word_sources WHERE src_id=?",
+                (src_id,),
+            )
             con.execute("DELETE FROM word_sources WHERE src_id=?", (src_id,))
-            # 2) remove any known_words no longer linked
+            # 2) remove those of its words no other source still links;
+            #    only the unlinked ids are looked at, not the whole vault
             con.execute(
                 "DELETE FROM known_words "
-                "WHERE id NOT IN (SELECT word_id FROM word_sources)"
+                "WHERE id IN (SELECT word_id FROM temp.unlinked) "
+                "AND NOT EXISTS ("
+                "  SELECT 1 FROM word_sources AS ws WHERE ws.word_id = known_words.id"
+                ")"
             )
-            # 3) explicitly purge orphaned occurrences
+            # 3) explicitly purge their orphaned occurrences
             con.execute(
                 "DELETE FROM occurrences "
-                "WHERE word_id NOT IN (SELECT id FROM known_words)"
+                "WHERE word_id IN (SELECT word_id FROM temp.unlinked) "
+                "AND NOT EXISTS ("
+                "  SELECT 1 FROM known_words AS k WHERE k.id = occurrences.word_id"
+                ")"
             )
+            con.execute("DROP TABLE temp.unlinked")
             # 4) drop the source record
             con.execute("DELETE FROM sources WHERE id=?", (src_id,))
+        if maintenance.auto_enabled():
+            with self._conn() as con:
+                maintenance.maybe_optimize(con, self.db_path)
 
     def add_words(
         self,
@@ -134,6 +267,7 @@ class Vault:
         ident: str,
         occurrences: dict[str, Tuple[str, str]] | None = None,
     ) -> None:
+        lemmas = list(lemmas)
         src_id = self._get_or_add_source(kind, ident)
         with self._conn() as con:
             for lemma in lemmas:
@@ -157,9 +291,165 @@ class Vault:
                         "VALUES(?, ?, ?)",
                         (word_id, excerpt, loc),
                     )
+            # every known word has an interned id (see migration 3)
+            _intern(con, lang, list(dict.fromkeys(lemmas)))
+
+    def intern_lemmas(self, lang: str, lemmas: Iterable[str]) -> List[int]:
+        """
+        Return the stable per-language ids of `lemmas`, assigning the next
+        dense ids to lemmas seen for the first time.  Interned lemmas are
+        never removed, so ids stay valid across source removals and the
+        `.sdv` snapshot keeps them.
+        """
+        lemmas = list(lemmas)
+        with self._conn() as con:
+            # serialize id assignment against concurrent writers
+            con.execute("BEGIN IMMEDIATE")
+            ids = _intern(con, lang, list(dict.fromkeys(lemmas)))
+        return [ids[lemma] for lemma in lemmas]
+
+    def lemma_table(self, lang: str) -> LemmaTable:
+        """Load every interned lemma of `lang` into a `LemmaTable`."""
+        with self._conn() as con:
+            rows = (
+                _plain_cursor(con)
+                .execute(
+                    "SELECT lemma FROM lemma_ids WHERE lang=? ORDER BY id", (lang,)
+                )
+                .fetchall()
+            )
+        return LemmaTable(lemma for (lemma,) in rows)
+
+    def export_lemma_table(self, lang: str, path: str | Path) -> Path:
+        """
+        Write the interned lemmas of `lang` to `path` for sharing with worker
+        processes through `MappedLemmaTable`.
+        """
+        return self.lemma_table(lang).write(path)
+
+    def cached_ipa(self, lang: str, lemmas: Iterable[str]) -> dict[str, str]:
+        """Return the cached IPA of whichever `lemmas` have been transcribed."""
+        lemmas = list(dict.fromkeys(lemmas))
+        found: dict[str, str] = {}
+        with self._conn() as con:
+            for i in range(0, len(lemmas), 500):
+                chunk = lemmas[i : i + 500]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    _plain_cursor(con).execute(
+                        f"SELECT lemma, ipa FROM ipa_cache "
+                        f"WHERE lang=? AND lemma IN ({marks})",
+                        (lang, *chunk),
+                    )
+                )
+        return found
+
+    def store_ipa(self, lang: str, ipas: dict[str, str]) -> None:
+        with self._conn() as con:
+            con.executemany(
+                "INSERT OR REPLACE INTO ipa_cache(lang, lemma, ipa) VALUES(?, ?, ?)",
+                ((lang, lemma, ipa) for lemma, ipa in ipas.items()),
+            )
+
+    @staticmethod
+    def _word_filter(
+        lang: str | None, prefix: str, source: Tuple[str, str] | None
+    ) -> Tuple[List[str], List[object]]:
+        clauses: List[str] = []
+        params: List[object] = []
+        if lang:
+            clauses.append("k.lang = ?")
+            params.append(lang)
+        if prefix:
+            # half-open range instead of LIKE, so the lemma index is used
+            clauses.append("k.lemma >= ? AND k.lemma < ?")
+            params += [prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)]
+        if source:
+            clauses.append(
+                "k.id IN (SELECT ws.word_id FROM word_sources AS ws"
+                " JOIN sources AS s ON s.id = ws.src_id"
+                " WHERE s.kind = ? AND s.ident = ?)"
+            )
+            params += list(source)
+        return clauses, params
+
+    def count_words(
+        self,
+        lang: str | None = None,
+        prefix: str = "",
+        source: Tuple[str, str] | None = None,
+    ) -> int:
+        """Number of known words matching the `browse_words` filters."""
+        clauses, params = self._word_filter(lang, prefix, source)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._conn() as con:
+            return con.execute(
+                f"SELECT COUNT(*) FROM known_words AS k {where}", params
+            ).fetchone()[0]
+
+    def browse_words(
+        self,
+        lang: str | None = None,
+        prefix: str = "",
+        source: Tuple[str, str] | None = None,
+        sort: Literal["lemma", "added"] = "lemma",
+        descending: bool = False,
+        after: Tuple | None = None,
+        limit: int = 200,
+    ) -> List[_Row]:
+        """
+        One page of known words as `(id, lang, lemma, excerpt, location)` rows.
+
+        Pages are keyset-paginated: pass the last row of the previous page as
+        `after` to get the next one.  Each page is an index range scan, so
+        its cost does not grow with how far into the vault it is.
+        """
+        clauses, params = self._word_filter(lang, prefix, source)
+        op = "<" if descending else ">"
+        direction = "DESC" if descending else "ASC"
+        if sort == "lemma":
+            order = f"k.lemma {direction}, k.id {direction}"
+            if after is not None:
+                clauses.append(f"(k.lemma, k.id) {op} (?, ?)")
+                params += [after[2], after[0]]
+        else:
+            order = f"k.id {direction}"
+            if after is not None:
+                clauses.append(f"k.id {op} ?")
+                params.append(after[0])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._conn() as con:
+            return con.execute(
+                "SELECT k.id, k.lang, k.lemma, o.excerpt, o.location "
+                "FROM known_words AS k "
+                "LEFT JOIN occurrences AS o ON o.word_id = k.id "
+                f"{where} ORDER BY {order} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+
+    def known_lemmas(self, lang: str) -> set[str]:
+        """Every known lemma of `lang` (bare tuples, no _Row)."""
+        with self._conn() as con:
+            return {
+                lemma
+                for (lemma,) in _plain_cursor(con).execute(
+                    "SELECT lemma FROM known_words WHERE lang=?", (lang,)
+                )
+            }
+
+    def iter_known_sorted(self, lang: str) -> Iterator[str]:
+        """
+        Known lemmas of `lang` in ascending code-point order (the order of
+        Python's `str` comparison), streamed off the (lang, lemma) index.
+        """
+        with self._conn() as con:
+            for (lemma,) in _plain_cursor(con).execute(
+                "SELECT lemma FROM known_words WHERE lang=? ORDER BY lemma", (lang,)
+            ):
+                yield lemma
 
     def coverage(
-        self, lang: str, lemmas: Iterable[str]
+        self, lang: str, lemmas: Iterable[str], in_db: bool = False
     ) -> tuple[float, Counter[str], CoverageTier]:
         """
         Return:
@@ -168,52 +458,55 @@ class Vault:
           - tier: EASY/ADEQUATE/CHALLENGING/FRUSTRATING.
 
         Coverage is 1 - (# unknown tokens / total tokens).
+
+        With `in_db=True` the known set is never loaded into Python: the
+        book's distinct lemmas go into a temp table and are matched against
+        the `known_words(lang, lemma)` index inside SQLite, so memory follows
+        the book's vocabulary instead of the vault size.  Results are the same.
         """
-        # Turn inputs into a list so we can index multiple times.
-        words_raw = list(lemmas)
-        total_tokens = len(words_raw)
+        if in_db:
+            cov, unknown_counter = self._coverage_in_db(lang, lemmas)
+            return cov, unknown_counter, coverage_tier(cov)
 
-        # Lowercase versions for DB membership checks.
-        tokens_lower = [w.lower() for w in words_raw]
+        total_tokens, unknown_tokens, unknown_counter = count_unknown(
+            lemmas, self.known_lemmas(lang)
+        )
+        cov = 1.0 - unknown_tokens / max(1, total_tokens)
+        return cov, unknown_counter, coverage_tier(cov)
 
-        # Load all known lemmas for this language.
-        with self._conn() as con:
-            known = {
-                row["lemma"]
-                for row in con.execute(
-                    "SELECT lemma FROM known_words WHERE lang=?", (lang,)
-                )
-            }
+    def _coverage_in_db(
+        self, lang: str, lemmas: Iterable[str]
+    ) -> tuple[float, Counter[str]]:
+        # distinct lemmas in first-seen order, which keeps the Counter's
+        # insertion order (and so most_common ties) identical to coverage()
+        counts = Counter(lemmas)
+        total_tokens = sum(counts.values())
 
-        # 1) Build a simple list of raw unknown tokens (one entry per occurrence).
-        unknown_tokens = [
-            raw
-            for raw, low in zip(words_raw, tokens_lower)
-            if low not in known
-        ]
-
-        # 2) Compute coverage over all tokens.
-        cov = 1.0 - len(unknown_tokens) / max(1, total_tokens)
-
-        # 3) Build the Counter: for each unknown occurrence, include raw,
-        #    and also lowercase if raw was not already lowercase.
-        unknown_list: list[str] = []
-        for raw, low in zip(words_raw, tokens_lower):
-            if low not in known:
-                unknown_list.append(raw)
+        unknown_counter: Counter[str] = Counter()
+        unknown_tokens = 0
+        with self._conn() as con:
+            con.execute(
+                "CREATE TEMP TABLE book_lemmas ("
+                " seq INTEGER PRIMARY KEY, raw TEXT NOT NULL,"
+                " low TEXT NOT NULL, n INTEGER NOT NULL)"
+            )
+            con.executemany(
+                "INSERT INTO book_lemmas(raw, low, n) VALUES(?, ?, ?)",
+                ((raw, raw.lower(), n) for raw, n in counts.items()),
+            )
+            for raw, low, n in _plain_cursor(con).execute(
+                "SELECT b.raw, b.low, b.n FROM book_lemmas AS b "
+                "WHERE NOT EXISTS ("
+                "  SELECT 1 FROM known_words AS k"
+                "  WHERE k.lang = ? AND k.lemma = b.low"
+                ") ORDER BY b.seq",
+                (lang,),
+            ):
+                unknown_tokens += n
+                unknown_counter[raw] += n
                 if raw != low:
-                    unknown_list.append(low)
-
-        unknown_counter = Counter(unknown_list)
-
-        # 4) Assign a tier label.
-        if cov >= 0.98:
-            tier: CoverageTier = "EASY"
-        elif cov >= 0.95:
-            tier = "ADEQUATE"
-        elif cov >= 0.90:
-            tier = "CHALLENGING"
-        else:
-            tier = "FRUSTRATING"
+                    unknown_counter[low] += n
+            con.execute("DROP TABLE book_lemmas")
 
-        return cov, unknown_counter, tier
+        cov = 1.0 - unknown_tokens / max(1, total_tokens)
+        return cov, unknown_counter
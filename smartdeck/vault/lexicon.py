@@ -0,0 +1,173 @@
+"""
+Interned lemma dictionaries: lemma ↔ dense int id, per language.
+
+`LemmaTable` builds one in memory and writes it in a compact read-only
+format that `MappedLemmaTable` maps without copying.  The vault exports
+its `lemma_ids` this way (`Vault.export_lemma_table`) for worker
+processes such as the IPA pool, and the `--fast` form tables
+(`nlp.fastlemma`) store their forms and lemmas in the same format.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+import sys
+from array import array
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+# File layout (little endian):
+#   header   b"SDLX", version u32, count u32, reserved u32
+#   offsets  (count + 1) × u64   byte offsets of lemma `id` in the blob
+#   order    count × u32         ids sorted by their UTF‑8 bytes
+#   blob     UTF‑8 lemmas, back to back
+_MAGIC = b"SDLX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIII")
+
+
+class LemmaTable:
+    """In-memory lemma ↔ id mapping; ids are dense and start at 0."""
+
+    def __init__(self, lemmas: Iterable[str] = ()) -> None:
+        self.lemmas: List[str] = []
+        self.ids: dict[str, int] = {}
+        for lemma in lemmas:
+            self.intern(lemma)
+
+    def __len__(self) -> int:
+        return len(self.lemmas)
+
+    def __contains__(self, lemma: object) -> bool:
+        return lemma in self.ids
+
+    def intern(self, lemma: str) -> int:
+        """Return the id of `lemma`, assigning the next free one if new."""
+        if (idx := self.ids.get(lemma)) is None:
+            idx = self.ids[lemma] = len(self.lemmas)
+            self.lemmas.append(lemma)
+        return idx
+
+    def get(self, lemma: str, default: int | None = None) -> int | None:
+        return self.ids.get(lemma, default)
+
+    def lemma(self, idx: int) -> str:
+        return self.lemmas[idx]
+
+    def encode(self, lemmas: Iterable[str]) -> array:
+        """Intern `lemmas` and return their ids as a compact `array('I')`."""
+        return array("I", map(self.intern, lemmas))
+
+    def decode(self, ids: Iterable[int]) -> List[str]:
+        return [self.lemmas[i] for i in ids]
+
+    def to_bytes(self) -> bytes:
+        """The table in the read-only format `MappedLemmaTable` maps."""
+        encoded = [lemma.encode("utf-8") for lemma in self.lemmas]
+        offsets = array("Q", [0])
+        for raw in encoded:
+            offsets.append(offsets[-1] + len(raw))
+        order = array("I", sorted(range(len(encoded)), key=encoded.__getitem__))
+        if sys.byteorder != "little":
+            offsets.byteswap()
+            order.byteswap()
+        return b"".join(
+            (
+                _HEADER.pack(_MAGIC, _VERSION, len(encoded), 0),
+                offsets.tobytes(),
+                order.tobytes(),
+                *encoded,
+            )
+        )
+
+    def write(self, path: str | Path) -> Path:
+        """Export the table in the read-only format `MappedLemmaTable` maps."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(self.to_bytes())
+        # atomic replace, so readers never map a half-written file
+        tmp.replace(path)
+        return path
+
+
+class MappedLemmaTable:
+    """
+    Read-only, memory-mapped view of a file written by `LemmaTable.write`.
+
+    Nothing is copied at open time: every process that maps the same file
+    shares its pages through the OS page cache, so workers can exchange
+    `array('I')` id streams instead of pickled strings.
+    """
+
+    def __init__(self, path: str | Path, offset: int = 0) -> None:
+        """Map the table stored at byte `offset` of `path` (see `to_bytes`)."""
+        if sys.byteorder != "little":
+            raise OSError("mapped lemma tables require a little-endian host")
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mm)[offset:]
+        magic, version, count, _ = _HEADER.unpack_from(view)
+        if magic != _MAGIC or version != _VERSION:
+            view.release()
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a lemma table")
+        start = _HEADER.size
+        end = start + 8 * (count + 1)
+        self._offsets = view[start:end].cast("Q")
+        self._order = view[end : end + 4 * count].cast("I")
+        self._blob = view[end + 4 * count :]
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, lemma: object) -> bool:
+        return isinstance(lemma, str) and self.get(lemma) is not None
+
+    def __enter__(self) -> "MappedLemmaTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for view in (self._offsets, self._order, self._blob):
+            view.release()
+        self._mm.close()
+
+    def _raw(self, idx: int) -> bytes:
+        return bytes(self._blob[self._offsets[idx] : self._offsets[idx + 1]])
+
+    def lemma(self, idx: int) -> str:
+        if not 0 <= idx < self._count:
+            raise IndexError(idx)
+        return self._raw(idx).decode("utf-8")
+
+    def get(self, lemma: str, default: int | None = None) -> int | None:
+        """Binary-search the sorted id order for `lemma`."""
+        key = lemma.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            raw = self._raw(self._order[mid])
+            if raw < key:
+                lo = mid + 1
+            elif raw > key:
+                hi = mid
+            else:
+                return self._order[mid]
+        return default
+
+    def encode(self, lemmas: Iterable[str]) -> array:
+        """Map lemmas to ids; raises KeyError for lemmas not in the table."""
+        out = array("I")
+        for lemma in lemmas:
+            if (idx := self.get(lemma)) is None:
+                raise KeyError(lemma)
+            out.append(idx)
+        return out
+
+    def decode(self, ids: Sequence[int]) -> List[str]:
+        return [self.lemma(i) for i in ids]
@@ -0,0 +1,167 @@
+"""
+Vault upkeep: reclaim free pages, refresh planner statistics and check
+integrity, each in bounded slices of work so it can run next to a build.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, TypedDict
+
+# free pages reclaimed per incremental_vacuum call
+VACUUM_SLICE_PAGES = 256
+# rows sampled per index by ANALYZE (PRAGMA analysis_limit)
+ANALYSIS_LIMIT = 1000
+# auto maintenance runs once this fraction of the file is free pages
+AUTO_FREE_RATIO = 0.25
+AUTO_BUDGET_SECONDS = 0.5
+
+
+class DbStats(TypedDict):
+    size_bytes: int
+    page_size: int
+    page_count: int
+    freelist_count: int
+
+
+class MaintenanceReport(TypedDict):
+    before: DbStats
+    after: DbStats
+    vacuumed_pages: int
+    full_vacuum: bool
+    analyzed: bool
+    checked: List[str]  # tables integrity-checked in this run
+    unchecked: List[str]  # left for the next run (time budget)
+    problems: List[str]  # integrity_check output other than "ok"
+    elapsed: float
+
+
+def db_stats(con: sqlite3.Connection, path: str | Path) -> DbStats:
+    def pragma(name: str) -> int:
+        return con.execute(f"PRAGMA {name}").fetchone()[0]
+
+    size = Path(path).stat().st_size
+    wal = Path(f"{path}-wal")
+    if wal.exists():
+        size += wal.stat().st_size
+    return DbStats(
+        size_bytes=size,
+        page_size=pragma("page_size"),
+        page_count=pragma("page_count"),
+        freelist_count=pragma("freelist_count"),
+    )
+
+
+def _state(con: sqlite3.Connection, key: str, default: str = "") -> str:
+    row = con.execute("SELECT value FROM maintenance WHERE key=?", (key,)).fetchone()
+    return row[0] if row else default
+
+
+def _set_state(con: sqlite3.Connection, key: str, value: str) -> None:
+    con.execute(
+        "INSERT OR REPLACE INTO maintenance(key, value) VALUES(?, ?)", (key, value)
+    )
+    con.commit()
+
+
+def optimize(
+    con: sqlite3.Connection,
+    path: str | Path,
+    budget: float = 5.0,
+    full: bool = False,
+    integrity: bool = True,
+) -> MaintenanceReport:
+    """
+    Compact and tune the vault at `path` within roughly `budget` seconds.
+
+      1. incremental vacuum, `VACUUM_SLICE_PAGES` free pages at a time
+         (`full=True` instead runs one full VACUUM, which also switches an
+         older vault to incremental auto-vacuum)
+      2. ANALYZE with a bounded sample (`ANALYSIS_LIMIT`) + PRAGMA optimize
+      3. integrity_check one table at a time, resuming next run with the
+         first table the budget did not reach
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + budget
+    con.commit()
+    before = db_stats(con, path)
+
+    vacuumed = 0
+    if full:
+        con.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        con.execute("VACUUM")
+    elif con.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:
+        while time.perf_counter() < deadline:
+            free = con.execute("PRAGMA freelist_count").fetchone()[0]
+            if not free:
+                break
+            step = min(free, VACUUM_SLICE_PAGES)
+            # executescript steps the pragma to completion; a plain
+            # execute() would free a single page
+            con.executescript(f"PRAGMA incremental_vacuum({step});")
+            vacuumed += step
+
+    analyzed = time.perf_counter() < deadline
+    if analyzed:
+        con.execute(f"PRAGMA analysis_limit = {ANALYSIS_LIMIT}")
+        con.execute("ANALYZE")
+        con.execute("PRAGMA optimize")
+        con.commit()
+
+    checked: List[str] = []
+    problems: List[str] = []
+    tables = [
+        row[0]
+        for row in con.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' "
+            "AND name NOT LIKE 'sqlite_%' ORDER BY name"
+        )
+    ]
+    start = _state(con, "integrity_next")
+    todo = [t for t in tables if t >= start] + [t for t in tables if t < start]
+    if integrity:
+        while todo and time.perf_counter() < deadline:
+            table = todo.pop(0)
+            for (msg,) in con.execute(f"PRAGMA integrity_check({table})"):
+                if msg != "ok":
+                    problems.append(msg)
+            checked.append(table)
+        _set_state(con, "integrity_next", todo[0] if todo else "")
+    _set_state(con, "last_optimize", str(time.time()))
+    # fold the WAL back in so the reported file size reflects the work
+    con.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+
+    return MaintenanceReport(
+        before=before,
+        after=db_stats(con, path),
+        vacuumed_pages=vacuumed,
+        full_vacuum=full,
+        analyzed=analyzed,
+        checked=checked,
+        unchecked=todo if integrity else tables,
+        problems=problems,
+        elapsed=time.perf_counter() - t0,
+    )
+
+
+def auto_enabled() -> bool:
+    return os.environ.get("SMARTDECK_AUTO_OPTIMIZE", "") not in ("", "0")
+
+
+def maybe_optimize(
+    con: sqlite3.Connection, path: str | Path
+) -> MaintenanceReport | None:
+    """
+    Run a short `optimize` when automatic maintenance is enabled
+    (SMARTDECK_AUTO_OPTIMIZE=1) and free pages exceed `AUTO_FREE_RATIO`.
+    """
+    if not auto_enabled():
+        return None
+    pages = con.execute("PRAGMA page_count").fetchone()[0]
+    free = con.execute("PRAGMA freelist_count").fetchone()[0]
+    if not pages or free / pages < AUTO_FREE_RATIO:
+        return None
+    return optimize(con, path, budget=AUTO_BUDGET_SECONDS, integrity=False)
@@ -0,0 +1,223 @@
+"""
+Versioned vault schema.
+
+A vault's `PRAGMA user_version` is the number of `MIGRATIONS` it has run.
+Each migration may change the schema (one transaction) and backfill data
+in batches, each batch its own short transaction, so a large vault stays
+usable by other connections while it migrates.  A backfill too large to
+run when the vault is opened is recorded in `deferred_backfills` and the
+version moves on regardless, so later schema changes still apply and
+startup stays a single `user_version` read; `smartdeck vault migrate`
+runs the recorded backfills.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Callable, List, Tuple
+
+# (con, after_id, batch_size) -> (last id processed, rows in this batch);
+# a batch shorter than batch_size is the last one
+Backfill = Callable[[sqlite3.Connection, int, int], Tuple[int, int]]
+Progress = Callable[["Migration", int], None]
+
+# a pending backfill over more rows than this waits for `smartdeck vault
+# migrate` instead of running when a Vault is opened
+STARTUP_BACKFILL_ROWS = 50_000
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    description: str
+    schema: str = ""
+    backfill: Backfill | None = None
+    backlog: str | None = None  # SQL counting the rows to backfill
+
+
+_BASE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    id     INTEGER PRIMARY KEY,
+    kind   TEXT NOT NULL,
+    ident  TEXT NOT NULL,
+    UNIQUE(kind, ident)
+);
+
+CREATE TABLE IF NOT EXISTS known_words (
+    id     INTEGER PRIMARY KEY,
+    lang   TEXT NOT NULL,
+    lemma  TEXT NOT NULL,
+    UNIQUE(lang, lemma)
+);
+
+CREATE TABLE IF NOT EXISTS word_sources (
+    word_id INTEGER REFERENCES known_words(id) ON DELETE CASCADE,
+    src_id  INTEGER REFERENCES sources(id)     ON DELETE CASCADE,
+    PRIMARY KEY (word_id, src_id)
+);
+
+CREATE TABLE IF NOT EXISTS occurrences (
+    word_id  INTEGER PRIMARY KEY
+             REFERENCES known_words(id) ON DELETE CASCADE,
+    excerpt  TEXT,
+    location TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ipa_cache (
+    lang   TEXT NOT NULL,
+    lemma  TEXT NOT NULL,
+    ipa    TEXT NOT NULL,
+    PRIMARY KEY (lang, lemma)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS lemma_ids (
+    lang   TEXT    NOT NULL,
+    id     INTEGER NOT NULL,
+    lemma  TEXT    NOT NULL,
+    PRIMARY KEY (lang, id),
+    UNIQUE(lang, lemma)
+);
+"""
+
+
+def _backfill_lemma_ids(
+    con: sqlite3.Connection, after: int, batch: int
+) -> Tuple[int, int]:
+    """Intern the known words that predate `lemma_ids`, in id order."""
+    rows = con.execute(
+        "SELECT k.id, k.lang, k.lemma FROM known_words AS k "
+        "WHERE k.id > ? AND NOT EXISTS ("
+        "  SELECT 1 FROM lemma_ids AS l WHERE l.lang = k.lang AND l.lemma = k.lemma"
+        ") ORDER BY k.id LIMIT ?",
+        (after, batch),
+    ).fetchall()
+    by_lang: dict[str, List[str]] = {}
+    for _, lang, lemma in rows:
+        by_lang.setdefault(lang, []).append(lemma)
+    for lang, lemmas in by_lang.items():
+        start = con.execute(
+            "SELECT COALESCE(MAX(id) + 1, 0) FROM lemma_ids WHERE lang=?", (lang,)
+        ).fetchone()[0]
+        con.executemany(
+            "INSERT INTO lemma_ids(lang, id, lemma) VALUES(?, ?, ?)",
+            ((lang, start + n, lemma) for n, lemma in enumerate(lemmas)),
+        )
+    return (rows[-1][0] if rows else after), len(rows)
+
+
+MIGRATIONS: tuple[Migration, ...] = (
+    Migration(
+        1,
+        "base tables; alphabetical index on known_words",
+        _BASE_SCHEMA
+        + "CREATE INDEX IF NOT EXISTS idx_known_words_lemma ON known_words(lemma);",
+    ),
+    Migration(
+        2,
+        "index word_sources by source",
+        "CREATE INDEX IF NOT EXISTS idx_word_sources_src ON word_sources(src_id);",
+    ),
+    Migration(
+        3,
+        "intern existing known words into lemma_ids",
+        backfill=_backfill_lemma_ids,
+        backlog=(
+            "SELECT COUNT(*) FROM known_words AS k WHERE NOT EXISTS ("
+            "  SELECT 1 FROM lemma_ids AS l WHERE l.lang = k.lang AND l.lemma = k.lemma"
+            ")"
+        ),
+    ),
+    Migration(
+        4,
+        "maintenance bookkeeping (see maintenance.optimize)",
+        "CREATE TABLE IF NOT EXISTS maintenance ("
+        " key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID;",
+    ),
+)
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def schema_version(con: sqlite3.Connection) -> int:
+    return con.execute("PRAGMA user_version").fetchone()[0]
+
+
+def pending(con: sqlite3.Connection) -> List[Migration]:
+    version = schema_version(con)
+    return [m for m in MIGRATIONS if m.version > version]
+
+
+def deferred(con: sqlite3.Connection) -> List[Migration]:
+    """Migrations whose backfill was put off when the vault was opened."""
+    if not con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='deferred_backfills'"
+    ).fetchone():
+        return []
+    versions = {v for (v,) in con.execute("SELECT version FROM deferred_backfills")}
+    return [m for m in MIGRATIONS if m.version in versions]
+
+
+def _backfill(
+    con: sqlite3.Connection,
+    m: Migration,
+    batch_size: int,
+    progress: Progress | None,
+) -> None:
+    after, rows, done = 0, batch_size, 0
+    while rows == batch_size:
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            after, rows = m.backfill(con, after, batch_size)
+            con.commit()
+        except BaseException:
+            con.rollback()
+            raise
+        done += rows
+        if progress is not None:
+            progress(m, done)
+
+
+def migrate(
+    con: sqlite3.Connection,
+    batch_size: int = 5_000,
+    max_backfill_rows: int | None = None,
+    progress: Progress | None = None,
+) -> int:
+    """
+    Run the pending migrations in order and return the resulting version.
+
+    With `max_backfill_rows`, a backfill that would touch more rows than
+    that is recorded as deferred instead of run; without it, deferred
+    backfills run first.  `progress(migration, rows)` is called after
+    every backfill batch.
+    """
+    con.commit()
+    if max_backfill_rows is None:
+        for m in deferred(con):
+            _backfill(con, m, batch_size, progress)
+            con.execute("DELETE FROM deferred_backfills WHERE version=?", (m.version,))
+            con.commit()
+    for m in pending(con):
+        if m.schema:
+            con.executescript(f"BEGIN; {m.schema} COMMIT;")
+        if m.backfill is not None:
+            if (
+                max_backfill_rows is not None
+                and m.backlog
+                and con.execute(m.backlog).fetchone()[0] > max_backfill_rows
+            ):
+                con.execute(
+                    "CREATE TABLE IF NOT EXISTS deferred_backfills ("
+                    " version INTEGER PRIMARY KEY)"
+                )
+                con.execute(
+                    "INSERT OR IGNORE INTO deferred_backfills(version) VALUES(?)",
+                    (m.version,),
+                )
+            else:
+                _backfill(con, m, batch_size, progress)
+        # user_version cannot be bound as a parameter
+        con.execute(f"PRAGMA user_version = {m.version}")
+        con.commit()
+    return schema_version(con)
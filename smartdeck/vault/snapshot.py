@@ -0,0 +1,282 @@
+"""
+Vault snapshots for moving a vault between machines.
+
+Two formats, chosen by file suffix:
+
+  .db / .sqlite   a consistent copy of the whole database made with the
+                  SQLite online backup API (safe while others write to it)
+  .sdv            a compact columnar dump of the known words: interned
+                  lemma ids per language, one membership bitmap per source
+                  and the occurrences, zlib-compressed.  Loading it is a
+                  single bulk transaction.  Caches (IPA) are left out.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from typing import Iterator, List
+
+from .db import Vault
+
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+# File layout: header b"SDVS", version u32, then one zlib stream of sections,
+# each a u64 length + payload (arrays little endian):
+#   meta         JSON {"langs", "lemmas", "sources", "words"}; "lemmas"
+#                counts each language's lemmas
+#   lemmas       per language, "\0".join(lemmas in lemma-id order); the
+#                count tells [] from [""], which join to the same bytes
+#   word_lang    words × u8   index into langs
+#   word_lemma   words × u32  lemma id within that language
+#   bitmaps      per source, ceil(words / 8) bytes, bit i = word i linked
+#   occurrences  JSON [[word, excerpt, location], ...]
+_MAGIC = b"SDVS"
+_VERSION = 1
+_HEADER = struct.Struct("<4sI")
+_LEN = struct.Struct("<Q")
+_LOAD_CACHE_KIB = -65536  # 64 MiB page cache while bulk loading
+
+
+def _pack(out: List[bytes], payload: bytes) -> None:
+    out.append(_LEN.pack(len(payload)))
+    out.append(payload)
+
+
+def _le(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, raw: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(raw)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def _set_bits(bitmap: bytes) -> Iterator[int]:
+    for i, byte in enumerate(bitmap):
+        while byte:
+            low = byte & -byte
+            yield i * 8 + low.bit_length() - 1
+            byte ^= low
+
+
+def backup(vault: Vault, dest: str | Path) -> Path:
+    """Copy the vault to `dest` as one consistent SQLite snapshot."""
+    dest = Path(dest)
+    tmp = dest.with_name(dest.name + ".tmp")
+    tmp.unlink(missing_ok=True)
+    src = sqlite3.connect(vault.db_path)
+    dst = sqlite3.connect(tmp)
+    try:
+        # pages=-1 copies everything in one step under a single read
+        # transaction, so concurrent writers cannot tear the copy
+        src.backup(dst, pages=-1)
+        dst.execute("PRAGMA journal_mode = DELETE")
+    finally:
+        dst.close()
+        src.close()
+    tmp.replace(dest)
+    return dest
+
+
+def restore(vault: Vault, source: str | Path) -> None:
+    """Replace the vault's contents with a snapshot written by `backup`."""
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+    try:
+        tables = {r[0] for r in src.execute("SELECT name FROM sqlite_master")}
+        if "known_words" not in tables:
+            raise ValueError(f"{source} is not a vault snapshot")
+        dst = sqlite3.connect(vault.db_path, timeout=30)
+        try:
+            src.backup(dst, pages=-1)
+        finally:
+            dst.close()
+    finally:
+        src.close()
+    # bring an older snapshot up to this version's schema
+    Vault(vault.db_path)
+
+
+def export_columnar(vault: Vault, dest: str | Path) -> Path:
+    """Write the vault's words, sources and occurrences as a `.sdv` dump."""
+    dest = Path(dest)
+    with vault._conn() as con:
+        con.execute("BEGIN")  # one read snapshot for every query
+        cur = con.cursor()
+        cur.row_factory = None
+        sources = cur.execute(
+            "SELECT id, kind, ident FROM sources ORDER BY id"
+        ).fetchall()
+        langs = [
+            r[0]
+            for r in cur.execute("SELECT DISTINCT lang FROM known_words ORDER BY lang")
+        ]
+        tables = {}
+        for lang in langs:
+            # keep the vault's interned ids; words never interned come after
+            lemmas = [
+                r[0]
+                for r in cur.execute(
+                    "SELECT lemma FROM lemma_ids WHERE lang=? ORDER BY id", (lang,)
+                )
+            ]
+            ids = {lemma: n for n, lemma in enumerate(lemmas)}
+            tables[lang] = (lemmas, ids)
+
+        word_lang, word_lemma = array("B"), array("I")
+        row_of: dict[int, int] = {}
+        for word_id, lang, lemma in cur.execute(
+            "SELECT id, lang, lemma FROM known_words ORDER BY id"
+        ):
+            lemmas, ids = tables[lang]
+            if (lemma_id := ids.get(lemma)) is None:
+                lemma_id = ids[lemma] = len(lemmas)
+                lemmas.append(lemma)
+            row_of[word_id] = len(word_lemma)
+            word_lang.append(langs.index(lang))
+            word_lemma.append(lemma_id)
+
+        n_words = len(word_lemma)
+        bitmaps = {src_id: bytearray((n_words + 7) // 8) for src_id, _, _ in sources}
+        for word_id, src_id in cur.execute("SELECT word_id, src_id FROM word_sources"):
+            row = row_of[word_id]
+            bitmaps[src_id][row >> 3] |= 1 << (row & 7)
+        occurrences = [
+            [row_of[word_id], excerpt, location]
+            for word_id, excerpt, location in cur.execute(
+                "SELECT word_id, excerpt, location FROM occurrences ORDER BY word_id"
+            )
+        ]
+
+    parts: List[bytes] = []
+    meta = {
+        "langs": langs,
+        "lemmas": [len(tables[lang][0]) for lang in langs],
+        "sources": [[kind, ident] for _, kind, ident in sources],
+        "words": n_words,
+    }
+    _pack(parts, json.dumps(meta).encode())
+    for lang in langs:
+        _pack(parts, "\0".join(tables[lang][0]).encode())
+    _pack(parts, _le(word_lang))
+    _pack(parts, _le(word_lemma))
+    for src_id, _, _ in sources:
+        _pack(parts, bytes(bitmaps[src_id]))
+    _pack(parts, json.dumps(occurrences, ensure_ascii=False).encode())
+
+    tmp = dest.with_name(dest.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION))
+        fh.write(zlib.compress(b"".join(parts), 6))
+    tmp.replace(dest)
+    return dest
+
+
+def import_columnar(vault: Vault, source: str | Path) -> int:
+    """
+    Replace the vault's words, sources and occurrences with a `.sdv` dump
+    in one transaction.  Returns the number of words loaded.
+    """
+    raw = Path(source).read_bytes()
+    magic, version = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError(f"{source} is not a vault snapshot")
+    data = memoryview(zlib.decompress(raw[_HEADER.size :]))
+    pos = 0
+
+    def section() -> bytes:
+        nonlocal pos
+        (size,) = _LEN.unpack_from(data, pos)
+        pos += _LEN.size + size
+        return bytes(data[pos - size : pos])
+
+    meta = json.loads(section())
+    langs: List[str] = meta["langs"]
+    lemma_lists = [
+        section().decode().split("\0") if count else [] for count in meta["lemmas"]
+    ]
+    word_lang = _from_le("B", section())
+    word_lemma = _from_le("I", section())
+    bitmaps = [section() for _ in meta["sources"]]
+    occurrences = section().decode()
+
+    # Every table is filled by one INSERT … SELECT over json_each(), so the
+    # row loop runs inside SQLite instead of binding parameters per row.
+    con = sqlite3.connect(vault.db_path, timeout=30)
+    # rows are consistent by construction; skip the per-row FK lookups
+    con.execute("PRAGMA foreign_keys = OFF")
+    con.execute(f"PRAGMA cache_size = {_LOAD_CACHE_KIB}")
+    try:
+        con.execute("BEGIN IMMEDIATE")
+        for table in ("occurrences", "word_sources", "known_words", "sources"):
+            con.execute(f"DELETE FROM {table}")
+        con.execute(
+            f"DELETE FROM lemma_ids WHERE lang IN ({','.join('?' * len(langs))})",
+            langs,
+        )
+        con.executemany(
+            "INSERT INTO sources(id, kind, ident) VALUES(?, ?, ?)",
+            ((n, kind, ident) for n, (kind, ident) in enumerate(meta["sources"], 1)),
+        )
+        for li, (lang, lemmas) in enumerate(zip(langs, lemma_lists)):
+            con.execute(
+                "INSERT INTO lemma_ids(lang, id, lemma) "
+                "SELECT ?, key, value FROM json_each(?)",
+                (lang, json.dumps(lemmas, ensure_ascii=False)),
+            )
+            rows = [
+                [row + 1, lemmas[lemma_id]]
+                for row, (l, lemma_id) in enumerate(zip(word_lang, word_lemma))
+                if l == li
+            ]
+            con.execute(
+                "INSERT INTO known_words(id, lang, lemma) "
+                "SELECT json_extract(value, '$[0]'), ?, json_extract(value, '$[1]') "
+                "FROM json_each(?)",
+                (lang, json.dumps(rows, ensure_ascii=False)),
+            )
+        for src_id, bitmap in enumerate(bitmaps, 1):
+            con.execute(
+                "INSERT INTO word_sources(word_id, src_id) "
+                "SELECT value + 1, ? FROM json_each(?)",
+                (src_id, json.dumps(list(_set_bits(bitmap)))),
+            )
+        con.execute(
+            "INSERT INTO occurrences(word_id, excerpt, location) "
+            "SELECT json_extract(value, '$[0]') + 1, json_extract(value, '$[1]'),"
+            " json_extract(value, '$[2]') FROM json_each(?)",
+            (occurrences,),
+        )
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+    finally:
+        con.close()
+    return len(word_lemma)
+
+
+def export_vault(vault: Vault, dest: str | Path) -> Path:
+    """Snapshot the vault to `dest`; the suffix picks the format."""
+    if Path(dest).suffix.lower() in SQLITE_SUFFIXES:
+        return backup(vault, dest)
+    return export_columnar(vault, dest)
+
+
+def import_vault(vault: Vault, source: str | Path) -> None:
+    """Replace the vault's contents with the snapshot at `source`."""
+    if Path(source).suffix.lower() in SQLITE_SUFFIXES:
+        restore(vault, source)
+    else:
+        import_columnar(vault, source)
@@ -0,0 +1,45 @@
+# Smoke tests so the benchmark suite doesn't rot; timings are not checked.
+
+import json
+
+from benchmarks import run, synthetic
+from smartdeck.extract import extract_epub, extract_pdf
+
+
+def test_synthetic_books_extract(tmp_path):
+    epub = synthetic.make_epub(tmp_path / "b.epub", chapters=3, paragraphs=2)
+    pdf = synthetic.make_pdf(tmp_path / "b.pdf", pages=2, lines_per_page=5)
+    assert len(extract_epub(epub)) == 3
+    pages = extract_pdf(pdf)
+    assert len(pages) == 2 and pages[1].startswith("Synthetic Book - Page 2")
+
+
+def test_runner_saves_and_compares_baseline(tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = [
+        "--scale",
+        "small",
+        "--repeat",
+        "1",
+        "--only",
+        "vault_coverage",
+        "ingest_apkg",
+    ]
+    assert run.main(args + ["--save-baseline", str(baseline)]) == 0
+    assert set(json.loads(baseline.read_text())) == {
+        "vault_coverage[small]",
+        "ingest_apkg[small]",
+    }
+    # an impossibly fast baseline must be flagged as a regression
+    fast = {k: {"best": 1e-9, "mean": 1e-9} for k in json.loads(baseline.read_text())}
+    baseline.write_text(json.dumps(fast))
+    assert run.main(args + ["--compare", str(baseline)]) == 1
+    assert "REGRESSION" in capsys.readouterr().out
+
+
+def test_fastlemma_benchmark_reports_accuracy(capsys):
+    from benchmarks import fastlemma
+
+    fastlemma.main(["--chapters", "2"])
+    out = capsys.readouterr().out
+    assert "tokens/s" in out and "lemma accuracy" in out
@@ -0,0 +1,70 @@
+from benchmarks import synthetic
+from smartdeck.extract import extract_pdf, strip_boilerplate
+
+_WORDS = "harbour rope gull tide mast anchor deck sail wind keel storm".split()
+
+
+def _pages(n):
+    out = []
+    for p in range(1, n + 1):
+        header = "THE LONG WAY HOME" if p % 2 else f"Chapter {1 + p // 10}: Departure"
+        words = " ".join(_WORDS[(p * k) % len(_WORDS)] for k in range(1, 6))
+        out.append(f"{header}\n\nShips {words}.\nThen {words[::-1]}.\n\n{p}")
+    return out
+
+
+def test_running_headers_and_page_numbers_are_removed():
+    pages = list(strip_boilerplate(_pages(20)))
+    assert len(pages) == 20
+    for text in pages:
+        assert text.startswith("Ships ") and text.endswith(".")
+        assert "THE LONG WAY HOME" not in text and "Departure" not in text
+
+
+def test_unique_edges_and_short_documents_are_kept():
+    pages = ["Intro\nfirst page text", "Intro\nsecond page text"]
+    assert list(strip_boilerplate(pages)) == pages
+    varied = [
+        f"Heading {chr(65 + i)}{'x' * i}\ntext {i}\nPage {i + 1}" for i in range(10)
+    ]
+    stripped = list(strip_boilerplate(varied))
+    # digits are normalised, letters are not: distinct headings survive
+    assert all(s.startswith("Heading") for s in stripped)
+    assert all("Page" not in s for s in stripped)
+
+
+def test_short_prose_that_repeats_a_few_times_is_kept():
+    # "End." closes every sixth page: 3 of the 17 around it, so prose
+    pages = [
+        f"Ships {w} sailed on.\nThe harbour {w} was calm."
+        + ("\nEnd." if i % 6 == 0 else "")
+        for i, w in enumerate(_WORDS * 2)
+    ]
+    assert list(strip_boilerplate(pages)) == pages
+
+
+def test_pages_that_are_only_boilerplate_are_not_emptied():
+    pages = [f"THE LONG WAY HOME\nbody {w}\n{i}" for i, w in enumerate(_WORDS)]
+    pages[4] = "THE LONG WAY HOME"
+    stripped = list(strip_boilerplate(pages))
+    assert stripped[4] == "THE LONG WAY HOME"
+    assert stripped[3] == f"body {_WORDS[3]}"
+
+
+def test_long_repeated_lines_are_prose_not_headers():
+    line = (
+        "This sentence repeats on purpose and is far too long "
+        "to be a running header line."
+    )
+    pages = [f"{line}\nunique {i}" for i in range(10)]
+    assert list(strip_boilerplate(pages)) == pages
+
+
+def test_extract_pdf_strips_running_headers(tmp_path):
+    pdf = synthetic.make_pdf(tmp_path / "b.pdf", pages=12, lines_per_page=6)
+    clean = extract_pdf(pdf)
+    raw = extract_pdf(pdf, keep_boilerplate=True)
+    assert all(text.startswith("Synthetic Book - Page") for text in raw)
+    assert not any("Synthetic Book" in text for text in clean)
+    # a page selection is judged on the selected pages alone
+    assert extract_pdf(pdf, pages="3-9") == clean[2:9]
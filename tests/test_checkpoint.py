@@ -0,0 +1,173 @@
+import re
+import threading
+
+import pytest
+
+from benchmarks.synthetic import make_epub
+from smartdeck import cli
+from smartdeck.checkpoint import Checkpoint, run_key
+from smartdeck.enrich.ipa import IpaService
+from smartdeck.utils.profiling import Profiler
+
+
+def test_run_key_follows_content_and_options(tmp_path):
+    a, b = tmp_path / "a.epub", tmp_path / "b.epub"
+    a.write_bytes(b"one book")
+    b.write_bytes(b"another book")
+    opts = {"top": 10, "lang": "en"}
+    assert run_key(a, opts) == run_key(a, dict(reversed(opts.items())))
+    assert run_key(a, opts) != run_key(b, opts)
+    assert run_key(a, opts) != run_key(a, {**opts, "top": 11})
+
+
+def test_stages_and_translations_survive_a_reopen(tmp_path):
+    book = tmp_path / "b.epub"
+    book.write_bytes(b"book")
+    calls = []
+
+    def translate(text, src, dest):
+        calls.append(text)
+        return text.upper()
+
+    with Checkpoint.for_run(book, {}, directory=tmp_path) as cp:
+        cp.save("analysis", {"top_lemmas": ["a", "b"]})
+        assert cp.translator(translate)("hund", "de", "en") == "HUND"
+        items = list(
+            cp.excerpts(lambda pages, lemmas: iter([("a", ("A b.", "1:0"))]))([], [])
+        )
+
+    with Checkpoint.for_run(book, {}, resume=True, directory=tmp_path) as cp:
+        assert cp.completed == ["analysis", "excerpts"]
+        assert cp.load("analysis") == {"top_lemmas": ["a", "b"]}
+        assert cp.translator(translate)("hund", "de", "en") == "HUND"
+        assert (
+            list(cp.excerpts(pytest.fail)([], [])) == items == [("a", ("A b.", "1:0"))]
+        )
+    assert calls == ["hund"]
+
+    cp = Checkpoint.for_run(book, {}, resume=False, directory=tmp_path)
+    assert cp.completed == [] and cp.translation_count == 0
+    cp.delete()
+    assert not cp.path.exists()
+
+
+def test_interrupted_build_resumes_with_only_the_missing_work(tmp_path, monkeypatch):
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    monkeypatch.setenv("SMARTDECK_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    lemmatized = []
+
+    def tokenize(texts, lang="en"):
+        lemmatized.append(len(texts))
+        return [
+            {"lemma": w.lower(), "pos": "X", "text": w}
+            for t in texts
+            for w in re.findall(r"[A-Za-z]+", t)
+        ]
+
+    monkeypatch.setattr(cli, "tokenize_lemmas", tokenize)
+    monkeypatch.setattr(
+        cli,
+        "IpaService",
+        lambda vault: IpaService(vault, transliterate=lambda l, xs: xs),
+    )
+    book = make_epub(tmp_path / "b.epub", chapters=3)
+    out = tmp_path / "deck.apkg"
+
+    translated, lock = [], threading.Lock()
+
+    class Backend:
+        def __init__(self, fail_after=None):
+            self.fail_after = fail_after
+
+        def translate(self, text, src, dest):
+            with lock:
+                if self.fail_after is not None and len(translated) >= self.fail_after:
+                    raise KeyboardInterrupt
+                translated.append(text)
+            return f"{dest}:{text}"
+
+    def build(backend, resume):
+        cp = Checkpoint.for_run(book, {"top": 8}, resume=resume)
+        cli._build(book, None, None, 8, "en", out, Profiler(), backend, checkpoint=cp)
+        cp.delete()
+
+    with pytest.raises(KeyboardInterrupt):
+        build(Backend(fail_after=5), resume=False)
+    first = list(translated)
+    assert len(first) == 5 and not out.exists()
+
+    build(Backend(), resume=True)
+    assert lemmatized == [3]  # analysis came from the checkpoint
+    # every word and sentence was translated exactly once over both runs
+    assert len(translated) == len(set(translated)) > len(first)
+    assert set(first) <= set(translated)
+    assert out.exists() and not list((tmp_path / "checkpoints").iterdir())
+
+
+def test_failed_translations_are_retried_on_resume(tmp_path, monkeypatch):
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    monkeypatch.setenv("SMARTDECK_CHECKPOINT_DIR", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(
+        cli,
+        "tokenize_lemmas",
+        lambda texts, lang="en": [
+            {"lemma": w.lower(), "pos": "X", "text": w}
+            for t in texts
+            for w in re.findall(r"[A-Za-z]+", t)
+        ],
+    )
+    monkeypatch.setattr(
+        cli,
+        "IpaService",
+        lambda vault: IpaService(vault, transliterate=lambda l, xs: xs),
+    )
+    book = make_epub(tmp_path / "b.epub", chapters=3)
+    asked, lock = [], threading.Lock()
+
+    class Offline:
+        # the HTTP backend's answer during a network outage, then Ctrl-C
+        def translate(self, text, src, dest):
+            with lock:
+                asked.append(text)
+                if len(asked) > 6:
+                    raise KeyboardInterrupt
+            return None
+
+    class Online:
+        def translate(self, text, src, dest):
+            with lock:
+                asked.append(text)
+            return f"{dest}:{text}"
+
+    cp = Checkpoint.for_run(book, {})
+    with pytest.raises(KeyboardInterrupt):
+        cli._build(
+            book,
+            None,
+            None,
+            8,
+            "en",
+            tmp_path / "d.apkg",
+            Profiler(),
+            Offline(),
+            checkpoint=cp,
+        )
+    assert cp.translation_count == 0
+    cp.close()
+    failed, asked[:] = set(asked[:6]), []
+
+    cp = Checkpoint.for_run(book, {}, resume=True)
+    cli._build(
+        book,
+        None,
+        None,
+        8,
+        "en",
+        tmp_path / "d.apkg",
+        Profiler(),
+        Online(),
+        checkpoint=cp,
+    )
+    assert failed <= set(asked)
+    assert cp.translation_count == len(set(asked))
+    cp.delete()
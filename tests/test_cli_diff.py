@@ -1,8 +1,8 @@
 # tests/test_cli_diff.py
 
+import os
 import subprocess
 import sys
-import os
 from pathlib import Path
 
 
@@ -18,10 +18,12 @@ def test_diff_on_sample_epub(tmp_path):
         sys.executable,
         "-m",
         "smartdeck.cli",
-        "diff",             # specify the diff subcommand
+        "diff",  # specify the diff subcommand
         str(epub),
-        "--lang", "en",
-        "--top", "3",
+        "--lang",
+        "en",
+        "--top",
+        "3",
     ]
     result = subprocess.run(cmd, env=env, capture_output=True, text=True)
     assert result.returncode == 0, result.stderr
@@ -29,3 +31,116 @@ def test_diff_on_sample_epub(tmp_path):
     assert "Coverage:" in out
     assert "Tier:" in out
     assert "Unknown lemmas (top 3):" in out
+
+
+def test_diff_estimate_reports_interval(tmp_path):
+    epub = Path("tests/assets/sample.epub")
+    env = {**os.environ, "SMARTDECK_DB": str(tmp_path / "known.db")}
+    cmd = [
+        sys.executable,
+        "-m",
+        "smartdeck.cli",
+        "diff",
+        str(epub),
+        "--lang",
+        "en",
+        "--top",
+        "3",
+        "--estimate",
+    ]
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    out = result.stdout
+    assert "Coverage:" in out and "at 95%]" in out
+    assert "Tier: FRUSTRATING" in out
+    assert "Sampled " in out
+
+
+def test_diff_curve_writes_pages_and_chapters(tmp_path):
+    import json
+
+    epub = Path("tests/assets/sample.epub")
+    env = {**os.environ, "SMARTDECK_DB": str(tmp_path / "known.db")}
+    out = tmp_path / "curve.json"
+    cmd = [
+        sys.executable,
+        "-m",
+        "smartdeck.cli",
+        "diff",
+        str(epub),
+        "--lang",
+        "en",
+        "--curve",
+        str(out),
+    ]
+    result = subprocess.run(cmd, env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    curve = json.loads(out.read_text())
+    assert curve["pages"] and curve["chapters"]
+    assert f"{curve['coverage']:.1%}" in result.stdout
+    assert curve["pages"][-1]["cumulative_new"] == sum(p["new"] for p in curve["pages"])
+    # chapters are lemmatized whole either way, so --curve leaves coverage alone
+    plain = subprocess.run(cmd[:-2], env=env, capture_output=True, text=True)
+    assert plain.stdout.splitlines()[:2] == result.stdout.splitlines()[:2]
+    assert sum(p["tokens"] for p in curve["pages"]) == sum(
+        c["tokens"] for c in curve["chapters"]
+    )
+
+
+def test_diff_fast_uses_form_table(tmp_path):
+    epub = Path("tests/assets/sample.epub")
+    env = {
+        **os.environ,
+        "SMARTDECK_DB": str(tmp_path / "known.db"),
+        "HOME": str(tmp_path),
+    }
+    base = [sys.executable, "-m", "smartdeck.cli"]
+    missing = subprocess.run(
+        base + ["diff", str(epub), "--fast"], env=env, capture_output=True, text=True
+    )
+    assert missing.returncode == 1 and "forms build" in missing.stderr
+
+    built = subprocess.run(
+        base + ["forms", "build", str(epub), "--lang", "en"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert built.returncode == 0, built.stderr
+    assert (tmp_path / ".smartdeck" / "forms-en.sdfl").exists()
+    fast = subprocess.run(
+        base + ["diff", str(epub), "--fast", "--top", "3"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert fast.returncode == 0, fast.stderr
+    assert "Coverage:" in fast.stdout and "Unknown lemmas (top 3):" in fast.stdout
+
+
+def test_diff_stream_matches_in_memory_run(tmp_path):
+    epub = Path("tests/assets/sample.epub")
+    env = {**os.environ, "SMARTDECK_DB": str(tmp_path / "known.db")}
+    base = [sys.executable, "-m", "smartdeck.cli", "diff", str(epub), "--top", "3"]
+    plain = subprocess.run(base, env=env, capture_output=True, text=True)
+    streamed = subprocess.run(
+        base + ["--stream", "--memory-cap", "4096"],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert streamed.returncode == 0, streamed.stderr
+    assert streamed.stdout.splitlines()[:2] == plain.stdout.splitlines()[:2]
+    assert "Peak RSS:" in streamed.stdout and "(cap 4096 MB)" in streamed.stdout
+
+    both = subprocess.run(
+        base + ["--stream", "--estimate"], env=env, capture_output=True, text=True
+    )
+    assert both.returncode == 1 and "--stream" in both.stderr
+    for flags, message in (
+        (["--stream", "--in-db"], "--in-db"),
+        (["--estimate", "--in-db"], "--in-db"),
+        (["--memory-cap", "100"], "--memory-cap"),
+    ):
+        bad = subprocess.run(base + flags, env=env, capture_output=True, text=True)
+        assert bad.returncode == 1 and message in bad.stderr
@@ -0,0 +1,40 @@
+import csv
+import json
+
+from smartdeck.analysis.curve import coverage_curve, paginate_lemmas, write_curve
+
+
+def test_curve_pages_chapters_and_cumulative_new_words():
+    pages = [["a", "b", "x"], ["a", "x", "y"], ["b", "b"], ["z", "a"]]
+    curve = coverage_curve(pages, unknown={"x", "y", "z"}, chapter_starts=[0, 2])
+    assert [p["unknown"] for p in curve["pages"]] == [1, 2, 0, 1]
+    assert [p["new"] for p in curve["pages"]] == [1, 1, 0, 1]
+    assert [p["cumulative_new"] for p in curve["pages"]] == [1, 2, 2, 3]
+    assert [p["chapter"] for p in curve["pages"]] == [1, 1, 2, 2]
+    assert curve["pages"][1]["cumulative_coverage"] == 1 - 3 / 6
+    assert curve["coverage"] == 1 - 4 / 10
+    first, second = curve["chapters"]
+    assert (first["first_page"], first["last_page"], first["unknown"]) == (1, 2, 3)
+    assert (second["tokens"], second["new"], second["coverage"]) == (4, 1, 0.75)
+
+
+def test_no_chapters_and_empty_pages():
+    curve = coverage_curve([[], ["a"]], unknown=set())
+    assert curve["chapters"] == [] and curve["pages"][0]["chapter"] is None
+    assert curve["pages"][0]["coverage"] == 1.0
+
+
+def test_paginate_lemmas_records_chapter_starts():
+    chapters = [["a", "b", "c", "d", "e"], [], ["f", "g"]]
+    pages, starts = paginate_lemmas(chapters, tokens=2)
+    assert pages == [["a", "b"], ["c", "d"], ["e"], [], ["f", "g"]]
+    assert starts == [0, 3, 4]
+
+
+def test_write_curve_json_and_csv(tmp_path):
+    curve = coverage_curve([["a"], ["b"]], unknown={"b"}, chapter_starts=[0])
+    data = json.loads(write_curve(curve, tmp_path / "c.json").read_text())
+    assert data["chapters"][0]["unknown"] == 1
+    with open(write_curve(curve, tmp_path / "c.csv"), newline="") as fh:
+        rows = list(csv.DictReader(fh))
+    assert [r["cumulative_new"] for r in rows] == ["0", "1"]
@@ -1,6 +1,8 @@
 import pytest
+
 from smartdeck.vault import Vault
 
+
 def test_multiple_languages(tmp_path):
     v = Vault(tmp_path / "ml.db")
     v.add_words("en", ["hello"], kind="deck", ident="D1")
@@ -12,6 +14,7 @@ def test_multiple_languages(tmp_path):
     cov_cross, _, _ = v.coverage("en", ["hallo"])
     assert cov_cross == 0.0
 
+
 def test_remove_source_idempotent(tmp_path):
     v = Vault(tmp_path / "r.db")
     # removing twice is safe
@@ -19,3 +22,69 @@ def test_remove_source_idempotent(tmp_path):
     v.remove_source("deck", "NoSuch")
     assert v.coverage("en", ["any"])[0] == 0.0
 
+
+def test_in_db_coverage_matches_in_memory(tmp_path):
+    v = Vault(tmp_path / "sql.db")
+    v.add_words("en", ["the", "cat", "sat"], kind="deck", ident="D1")
+    v.add_words("de", ["mat"], kind="deck", ident="D2")
+    book = ["The", "cat", "sat", "on", "the", "Mat", "mat", "On", "dog", "on"]
+
+    expected = v.coverage("en", book)
+    got = v.coverage("en", book, in_db=True)
+    assert got == expected
+    # same insertion order, so ties in most_common() come out identically
+    assert got[1].most_common() == expected[1].most_common()
+
+
+def test_in_db_coverage_empty_book(tmp_path):
+    v = Vault(tmp_path / "sql.db")
+    assert v.coverage("en", [], in_db=True) == v.coverage("en", [])
+
+
+def test_browse_words_keyset_pages(tmp_path):
+    v = Vault(tmp_path / "browse.db")
+    words = [f"w{i:04d}" for i in range(1000)]
+    v.add_words("en", words[:600], kind="deck", ident="A")
+    v.add_words(
+        "de",
+        words[600:],
+        kind="deck",
+        ident="B",
+        occurrences={"w0700": ("an excerpt", "p. 3")},
+    )
+
+    seen, after = [], None
+    while page := v.browse_words(after=after, limit=128):
+        seen += [row["lemma"] for row in page]
+        after = page[-1]
+    assert seen == words
+    assert v.count_words() == 1000
+
+    desc = v.browse_words(sort="added", descending=True, limit=3)
+    assert [r["lemma"] for r in desc] == ["w0999", "w0998", "w0997"]
+
+    assert v.count_words(prefix="w01") == 100
+    assert v.count_words(lang="de", prefix="w01") == 0
+    assert v.count_words(source=("deck", "B")) == 400
+    row = v.browse_words(lang="de", prefix="w0700")[0]
+    assert tuple(row) == (row["id"], "de", "w0700", "an excerpt", "p. 3")
+    assert v.list_sources() == [("deck", "A"), ("deck", "B")]
+
+
+def test_rows_index_by_name_and_position(tmp_path):
+    v = Vault(tmp_path / "rows.db")
+    v.add_words(
+        "en", ["cat"], kind="deck", ident="D1", occurrences={"cat": ("a cat", "p. 1")}
+    )
+    with v._conn() as con:
+        row = con.execute("SELECT lemma, lang FROM known_words").fetchone()
+        other = con.execute("SELECT excerpt, location FROM occurrences").fetchone()
+        again = con.execute("SELECT lemma, lang FROM known_words").fetchone()
+    assert row["lemma"] == row[0] == "cat" and row["lang"] == row[-1] == "en"
+    assert row == ("cat", "en") and row[:1] == ("cat",)
+    assert other["location"] == "p. 1" and other.keys() == ["excerpt", "location"]
+    assert type(row) is type(again) and type(row) is not type(other)
+    assert not hasattr(row, "__dict__")
+    assert {row: 1}[("cat", "en")] == 1
+    with pytest.raises(KeyError):
+        row["missing"]
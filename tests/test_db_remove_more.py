@@ -1,15 +1,19 @@
 # tests/test_db_remove_more.py
 
 import sqlite3
-import pytest
 from collections import Counter
+
+import pytest
+
 from smartdeck.vault.db import Vault
 
+
 def make_vault(tmp_path):
     """Helper to create a fresh Vault backed by tmp_path/known.db"""
     db = tmp_path / "known.db"
     return Vault(db)
 
+
 def test_occurrences_persistence_across_sources(tmp_path):
     """
     Occurrences for a multi‑linked word should persist until the last source is removed.
@@ -40,6 +44,7 @@ def test_occurrences_persistence_across_sources(tmp_path):
         rows = con.execute("SELECT * FROM occurrences").fetchall()
     assert rows == []
 
+
 def test_mixed_kinds_do_not_interfere(tmp_path):
     """
     Removing a 'file' source should not touch a 'deck' source with the same ident.
@@ -59,3 +64,38 @@ def test_mixed_kinds_do_not_interfere(tmp_path):
         remaining = {r["lemma"] for r in con.execute("SELECT lemma FROM known_words")}
     assert remaining == {"y"}
 
+
+def test_schema_migrations_and_scoped_orphan_cleanup(tmp_path):
+    from smartdeck.vault.migrations import LATEST_VERSION
+
+    v = Vault(tmp_path / "mig.db")
+    with v._conn() as con:
+        assert con.execute("PRAGMA user_version").fetchone()[0] == LATEST_VERSION
+        indexes = {r["name"] for r in con.execute("PRAGMA index_list(word_sources)")}
+        plan = " ".join(
+            r["detail"]
+            for r in con.execute(
+                "EXPLAIN QUERY PLAN SELECT word_id FROM word_sources WHERE src_id=1"
+            )
+        )
+    assert "idx_word_sources_src" in indexes
+    assert "idx_word_sources_src" in plan
+
+    v.add_words(
+        "en",
+        ["a", "b"],
+        kind="deck",
+        ident="d1",
+        occurrences={"a": ("ex a", "1"), "b": ("ex b", "2")},
+    )
+    v.add_words("en", ["b", "c"], kind="deck", ident="d2")
+    v.remove_source("deck", "d1")
+    with v._conn() as con:
+        assert {r[0] for r in con.execute("SELECT lemma FROM known_words")} == {
+            "b",
+            "c",
+        }
+        assert con.execute("SELECT excerpt FROM occurrences").fetchall() == [("ex b",)]
+
+    # reopening an up-to-date vault runs nothing again
+    assert Vault(tmp_path / "mig.db").coverage("en", ["b"])[0] == 1.0
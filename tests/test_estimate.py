@@ -0,0 +1,77 @@
+import random
+
+from smartdeck.analysis.estimate import estimate_coverage, split_units
+
+
+def _book(pages, words, unknown_rate, seed=0):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(pages):
+        texts.append(
+            " ".join(
+                (
+                    f"rare{rng.randrange(10_000)}"
+                    if rng.random() < unknown_rate
+                    else f"common{rng.randrange(500)}"
+                )
+                for _ in range(words)
+            )
+        )
+    return texts
+
+
+KNOWN = {f"common{i}" for i in range(500)}
+
+
+def _lemmatize(calls):
+    def run(chunk):
+        calls.append(len(chunk))
+        return [w for text in chunk for w in text.split()]
+
+    return run
+
+
+def test_split_units_cuts_page_sized_chunks():
+    units = split_units(["a b c d e", "f g"], unit_words=2)
+    assert units == ["a b", "c d", "e", "f g"]
+
+
+def test_estimate_stops_early_with_a_ci_around_the_truth():
+    texts = _book(pages=400, words=300, unknown_rate=0.005)
+    calls = []
+    est = estimate_coverage(texts, KNOWN, _lemmatize(calls), seed=1)
+    assert est["determined"] and est["tier"] == "EASY"
+    assert not est["exact"]
+    assert est["sampled_units"] == len(calls) <= est["total_units"] // 10
+    assert est["low"] <= 0.995 <= est["high"]
+    assert est["unknowns"] and all(w.startswith("rare") for w in est["unknowns"])
+
+
+def test_estimate_near_a_threshold_reads_more_but_stays_bounded():
+    texts = _book(pages=200, words=300, unknown_rate=0.05)
+    est = estimate_coverage(texts, KNOWN, _lemmatize([]), max_units=60, seed=2)
+    assert est["sampled_units"] <= 60
+    assert est["low"] < 0.95 < est["high"] or est["determined"]
+
+
+def test_small_book_is_read_completely_and_exactly():
+    texts = _book(pages=3, words=300, unknown_rate=0.2)
+    est = estimate_coverage(texts, KNOWN, _lemmatize([]), seed=3)
+    tokens = [w for t in texts for w in t.split()]
+    truth = sum(w in KNOWN for w in tokens) / len(tokens)
+    assert est["exact"] and est["sampled_units"] == 3
+    assert abs(est["coverage"] - truth) < 1e-12
+    assert est["low"] == est["high"] == est["coverage"]
+
+
+def test_exact_estimate_agrees_with_vault_coverage(tmp_path):
+    from smartdeck.vault.db import Vault
+
+    vault = Vault(tmp_path / "v.db")
+    vault.add_words("en", ["haus", "the"], "manual", "t")
+    texts = ["The Haus and the Baum stand near Baum and baum"] * 3
+    est = estimate_coverage(texts, vault.known_lemmas("en"), _lemmatize([]), seed=0)
+    cov, unknowns, tier = vault.coverage("en", [w for t in texts for w in t.split()])
+    assert est["exact"]
+    assert est["coverage"] == cov and est["tier"] == tier
+    assert est["unknowns"] == unknowns and unknowns["baum"] == 9
@@ -1,26 +1,65 @@
 # tests/test_extract.py
 
-import pytest
 from pathlib import Path
+
+import pytest
+
 from smartdeck.extract import extract_epub, extract_pdf
 
+
 @pytest.fixture
 def ASSETS():
     return Path(__file__).parent / "assets"
 
+
 def test_epub_whole(ASSETS):
     pages = extract_epub(ASSETS / "sample.epub")
     assert isinstance(pages, list) and len(pages) >= 1
 
+
 def test_epub_pagespec(ASSETS):
     pages = extract_epub(ASSETS / "sample.epub", pages="1")
     assert len(pages) == 1
 
+
 def test_pdf_whole(ASSETS):
     pages = extract_pdf(ASSETS / "sample.pdf")
     assert isinstance(pages, list) and len(pages) >= 1
 
+
 def test_pdf_pagespec(ASSETS):
     pages = extract_pdf(ASSETS / "sample.pdf", pages="1-1")
     assert len(pages) == 1
 
+
+def test_epub_backends_agree(ASSETS):
+    fast = extract_epub(ASSETS / "sample.epub")
+    assert fast == extract_epub(ASSETS / "sample.epub", html_backend="bs4")
+
+
+def test_fast_html_matches_soup_get_text():
+    from smartdeck.extract.htmltext import html_to_text
+
+    html = (
+        b'<?xml version="1.0" encoding="utf-8"?><!DOCTYPE html><html>'
+        b"<head><title>T&amp;itle</title><style>p{x:1}</style></head><body>"
+        b"<!-- note --><p>Hello <b>wo</b>rld &nbsp; x&#233;&eacute;</p>"
+        b"<script>var a = 1;</script><template>hidden</template>"
+        b"<p>a<br/>b</p> &unknown; &amp x &#128; <![CDATA[raw]]></body></html>"
+    )
+    assert html_to_text(html) == html_to_text(html, backend="bs4")
+    assert html_to_text(html, skip_head=True) == html_to_text(
+        html, backend="bs4", skip_head=True
+    )
+    assert "itle" not in html_to_text(html, skip_head=True)
+
+
+def test_extraction_stops_when_cancelled(ASSETS):
+    from smartdeck.utils.cancel import Cancelled, CancelToken
+
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(Cancelled):
+        extract_epub(ASSETS / "sample.epub", cancel=token)
+    with pytest.raises(Cancelled):
+        extract_pdf(ASSETS / "sample.pdf", virtual_pages=50, cancel=token)
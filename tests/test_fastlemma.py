@@ -0,0 +1,71 @@
+import pytest
+
+from smartdeck.nlp.fastlemma import (
+    FastLemmatizer,
+    FormTable,
+    pairs_from_pipeline,
+    pairs_from_tsv,
+    write_form_table,
+)
+
+
+def _fake_full(calls):
+    def full(texts, lang):
+        calls.append(list(texts))
+        return [
+            [{"lemma": w.lower().rstrip("s"), "pos": "X", "text": w} for w in t.split()]
+            for t in texts
+        ]
+
+    return full
+
+
+def test_table_roundtrip_first_lemma_wins(tmp_path):
+    path = tmp_path / "en.sdfl"
+    pairs = [("Ran", "run"), ("running", "run"), ("mice", "mouse"), ("ran", "rain")]
+    assert write_form_table(pairs, path) == 3
+    with FormTable(path) as table:
+        assert len(table) == 3
+        assert table.get("ran") == "run" and table.get("mice") == "mouse"
+        assert table.get("cats") is None
+
+
+def test_unknown_forms_go_to_full_pipeline_once_per_batch(tmp_path):
+    path = tmp_path / "en.sdfl"
+    write_form_table([("the", "the"), ("mice", "mouse"), ("ran", "run")], path)
+    calls = []
+    with FormTable(path) as table:
+        lem = FastLemmatizer(table, "en", full=_fake_full(calls), batch_pages=2)
+        pages = lem.lemmatize(["The mice ran.", "Cats ran; cats!", "Dogs and cats"])
+        assert [[w["lemma"] for w in p] for p in pages] == [
+            ["the", "mouse", "run"],
+            ["cat", "run", "cat"],
+            ["dog", "and", "cat"],
+        ]
+        assert pages[1][0] == {"lemma": "cat", "pos": "", "text": "Cats"}
+        # one call per batch of pages, each unknown form sent once
+        assert calls == [["cats"], ["dogs", "and"]]
+        assert lem.fallback_forms == 3
+
+
+def test_pairs_from_pipeline_and_tsv(tmp_path):
+    pairs = dict(pairs_from_pipeline(["Cats cats Cat"], "en", full=_fake_full([])))
+    assert pairs == {"cats": "cat", "cat": "cat"}
+    tsv = tmp_path / "forms.tsv"
+    tsv.write_text("went\tgo\nbroken line\ngeese\tgoose\n", encoding="utf-8")
+    assert list(pairs_from_tsv(tsv)) == [("went", "go"), ("geese", "goose")]
+
+
+def test_rejects_other_files(tmp_path):
+    bogus = tmp_path / "x.sdfl"
+    bogus.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError):
+        FormTable(bogus)
+
+
+def test_full_table_needs_no_fallback(tmp_path):
+    path = tmp_path / "en.sdfl"
+    write_form_table([("geese", "goose"), ("fly", "fly")], path)
+    with FormTable(path) as table:
+        pages = FastLemmatizer(table, "en", full=pytest.fail).lemmatize(["Geese fly"])
+    assert [w["lemma"] for w in pages[0]] == ["goose", "fly"]
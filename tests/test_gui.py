@@ -1,31 +1,192 @@
-
 import pytest
 from PyQt6.QtWidgets import QApplication, QLineEdit, QPushButton
+
 from smartdeck.gui import MainWindow
 
+
 @pytest.fixture(scope="session")
 def app():
     """Provide a single QApplication instance for all GUI tests."""
     return QApplication([])
 
-def test_window_opens(app):
+
+def test_window_opens(app, qtbot):
     """MainWindow should instantiate and have the correct title."""
     win = MainWindow()
+    qtbot.addWidget(win)
     win.show()
     assert win.windowTitle() == "SmartDeck Maker"
 
-def test_diff_tab_layout(app):
+
+def test_diff_tab_layout(app, qtbot):
     """
     Difficulty tab should contain at least one QLineEdit for the file/pagespec
     and a QPushButton labeled 'Compute Difficulty'.
     """
     win = MainWindow()
+    qtbot.addWidget(win)
     tab = win.diff_tab
 
     # There must be a QLineEdit in the diff tab
-    assert tab.findChild(QLineEdit) is not None, "No QLineEdit found in the Difficulty tab"
+    assert (
+        tab.findChild(QLineEdit) is not None
+    ), "No QLineEdit found in the Difficulty tab"
 
     # There must be a button with the exact text "Compute Difficulty"
     buttons = tab.findChildren(QPushButton)
-    assert any(btn.text() == "Compute Difficulty" for btn in buttons), \
-        "Could not find a QPushButton with text 'Compute Difficulty'"
+    assert any(
+        btn.text() == "Compute Difficulty" for btn in buttons
+    ), "Could not find a QPushButton with text 'Compute Difficulty'"
+
+
+def _fake_tokenize(texts, lang="en", cancel=None):
+    out = []
+    for text in texts:
+        if cancel is not None:
+            cancel.check()
+        out.append(
+            [{"lemma": w.lower(), "pos": "X"} for w in text.split() if w.isalpha()]
+        )
+    return out
+
+
+def test_concurrent_diff_jobs(app, qtbot, tmp_path, monkeypatch):
+    """Several diff jobs run on the pool and report per-stage progress."""
+    import smartdeck.gui as gui
+    from benchmarks.synthetic import make_epub
+
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    monkeypatch.setattr(gui, "tokenize_pages", _fake_tokenize)
+    queue = gui.JobQueue(max_workers=2)
+    books = [
+        make_epub(tmp_path / f"book{i}.epub", chapters=3, seed=i) for i in range(2)
+    ]
+    jobs = [gui.Job(b, None, None, 5, "en", tmp_path, "diff") for b in books]
+    results, progress, curves = [], [], []
+    for job in jobs:
+        job.signals.finished.connect(results.append)
+        job.signals.progress.connect(progress.append)
+        job.signals.curve.connect(curves.append)
+
+    with qtbot.waitSignals([j.signals.finished for j in jobs], timeout=30_000):
+        for job in jobs:
+            queue.submit(job)
+
+    assert len(results) == 2 and all(r.startswith("Coverage:") for r in results)
+    assert max(progress) == 100
+    assert len(curves) == 2 and all(len(c["chapters"]) == 3 for c in curves)
+    widget = gui.CoverageCurveWidget()
+    qtbot.addWidget(widget)
+    widget.resize(300, 150)
+    widget.set_curve(curves[0])
+    assert not widget.grab().isNull()
+    qtbot.waitUntil(lambda: queue.jobs == [])
+
+
+def test_cancelled_job(app, qtbot, tmp_path, monkeypatch):
+    import smartdeck.gui as gui
+    from benchmarks.synthetic import make_epub
+
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    job = gui.Job(
+        make_epub(tmp_path / "b.epub", chapters=3),
+        None,
+        None,
+        5,
+        "en",
+        tmp_path / "out.apkg",
+        "build",
+    )
+    job.cancel()
+    queue = gui.JobQueue()
+    with qtbot.waitSignal(job.signals.cancelled, timeout=10_000):
+        queue.submit(job)
+    assert not (tmp_path / "out.apkg").exists()
+
+
+def test_word_model_fetches_pages(app, qtbot, tmp_path):
+    from PyQt6.QtCore import Qt
+
+    from smartdeck.gui import WordTableModel
+    from smartdeck.vault import Vault
+
+    vault = Vault(tmp_path / "words.db")
+    vault.add_words("en", [f"w{i:05d}" for i in range(5000)], kind="deck", ident="D")
+    model = WordTableModel(vault, page_size=200)
+    with qtbot.waitSignal(model.counted, timeout=5_000) as counted:
+        model.refresh()
+    assert counted.args == [5000] and model.total == 5000
+    assert model.rowCount() == 200
+    assert model.canFetchMore()
+    model.fetchMore()
+    assert model.rowCount() == 400
+    assert model.data(model.index(399, 0)) == "w00399"
+
+    model.sort(0, Qt.SortOrder.DescendingOrder)
+    assert model.rowCount() == 200
+    assert model.data(model.index(0, 0)) == "w04999"
+
+    # a column other than the lemma has no order of its own
+    model.sort(2, Qt.SortOrder.AscendingOrder)
+    assert model.data(model.index(0, 0)) == "w04999"
+
+    model.set_filter(prefix="w049")
+    assert model.total is None and model.rowCount() == 100
+    qtbot.waitUntil(lambda: model.total == 100, timeout=5_000)
+    assert not model.canFetchMore()
+
+
+def test_missing_models_are_greyed_out(app, qtbot, monkeypatch):
+    import smartdeck.gui as gui
+
+    monkeypatch.setattr(gui, "is_installed", lambda spec: spec.lang in ("de", "fr"))
+    monkeypatch.setattr(gui.models, "preload", lambda lang: None)
+    combo = gui._lang_combo()
+    qtbot.addWidget(combo)
+    enabled = [combo.model().item(i).isEnabled() for i in range(combo.count())]
+    assert enabled == [lang in ("de", "fr") for lang in gui.LANGUAGES]
+    assert combo.currentText() == "de"
+
+
+def test_diff_plots_only_the_last_book(app, qtbot, tmp_path, monkeypatch):
+    import smartdeck.gui as gui
+    from benchmarks.synthetic import make_epub
+
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    monkeypatch.setattr(gui, "tokenize_pages", _fake_tokenize)
+    books = [
+        make_epub(tmp_path / f"book{i}.epub", chapters=4 - i, seed=i) for i in range(3)
+    ]
+    win = MainWindow()
+    qtbot.addWidget(win)
+    win.diff_file.setText(";".join(str(b) for b in books))
+    win.on_diff()
+    qtbot.waitUntil(lambda: win.queue.jobs == [], timeout=30_000)
+    qtbot.waitUntil(lambda: win.diff_curve.curve is not None)
+    assert len(win.diff_curve.curve["chapters"]) == 2
+
+
+def test_word_filter_waits_for_typing_to_pause(app, qtbot, tmp_path, monkeypatch):
+    from PyQt6.QtCore import Qt
+
+    from smartdeck.vault import Vault
+
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "vault.db"))
+    Vault().add_words("en", ["apple", "apricot", "banana"], kind="deck", ident="D")
+    win = MainWindow()
+    qtbot.addWidget(win)
+    qtbot.waitUntil(lambda: win.words_count.text() == "3 words", timeout=5_000)
+    refreshes = []
+    monkeypatch.setattr(win.words_model, "refresh", lambda: refreshes.append(1))
+    qtbot.keyClicks(win.words_filter, "ap")
+    assert refreshes == []
+    qtbot.waitUntil(lambda: refreshes == [1], timeout=2_000)
+
+    # a header click moves the indicator before sectionClicked fires
+    header = win.words_view.horizontalHeader()
+    header.setSortIndicator(3, Qt.SortOrder.DescendingOrder)
+    win._sort_words(3)
+    assert (header.sortIndicatorSection(), header.sortIndicatorOrder()) == (
+        0,
+        Qt.SortOrder.AscendingOrder,
+    )
@@ -0,0 +1,75 @@
+from array import array
+from pathlib import Path
+
+import pytest
+
+from smartdeck.enrich.ipa import IpaService, _transliterate_ids
+from smartdeck.utils.profiling import Stage
+from smartdeck.vault import Vault
+
+CALLS: list[list[str]] = []
+
+
+def fake_transliterate(lang, lemmas):
+    CALLS.append(list(lemmas))
+    return [f"/{lang}:{lemma}/" for lemma in lemmas]
+
+
+@pytest.fixture
+def service(tmp_path):
+    CALLS.clear()
+    return IpaService(
+        Vault(tmp_path / "ipa.db"), workers=1, transliterate=fake_transliterate
+    )
+
+
+def test_seen_lemmas_are_not_transcribed_again(service):
+    first = service.transliterate_many("en", ["cat", "dog", "cat"])
+    assert first == {"cat": "/en:cat/", "dog": "/en:dog/"}
+
+    stage = Stage("ipa")
+    second = service.transliterate_many("en", ["dog", "owl"], stage=stage)
+    assert second == {"dog": "/en:dog/", "owl": "/en:owl/"}
+    assert CALLS == [["cat", "dog"], ["owl"]]
+    assert (stage.hits, stage.misses) == (1, 1)
+
+
+def test_cache_is_per_language_and_persistent(tmp_path, service):
+    service.transliterate_many("en", ["rot"])
+    # a new service on the same vault still sees the cache
+    again = IpaService(
+        Vault(service.vault.db_path), workers=1, transliterate=fake_transliterate
+    )
+    assert again.transliterate_many("en", ["rot"]) == {"rot": "/en:rot/"}
+    assert again.transliterate_many("de", ["rot"]) == {"rot": "/de:rot/"}
+    assert CALLS == [["rot"], ["rot"]]
+
+
+def test_large_batches_run_in_worker_processes(tmp_path):
+    svc = IpaService(
+        Vault(tmp_path / "ipa.db"),
+        workers=2,
+        parallel_threshold=3,
+        transliterate=fake_transliterate,
+    )
+    words = [f"w{i}" for i in range(7)]
+    with svc:
+        assert svc.transliterate_many("en", words) == {w: f"/en:{w}/" for w in words}
+        pool = svc._pool
+        more = [f"v{i}" for i in range(5)]
+        assert svc.transliterate_many("en", more) == {w: f"/en:{w}/" for w in more}
+        # one spawn-started pool serves every batch
+        assert svc._pool is pool and pool._mp_context.get_start_method() == "spawn"
+        # workers were sent vault ids, decoded through the exported table
+        assert svc.vault.intern_lemmas("en", words + more) == list(range(12))
+        tables = Path(svc._tables.name)
+        assert (tables / "en.lex").exists()
+    assert svc._pool is None and not tables.exists()
+
+
+def test_workers_decode_ids_through_the_mapped_table(tmp_path):
+    vault = Vault(tmp_path / "ipa.db")
+    ids = array("I", vault.intern_lemmas("de", ["Straße", "über", "Haus"]))
+    table = vault.export_lemma_table("de", tmp_path / "de.lex")
+    out = _transliterate_ids(fake_transliterate, "de", str(table), ids[1:])
+    assert out == ["/de:über/", "/de:Haus/"]
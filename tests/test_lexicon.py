@@ -0,0 +1,59 @@
+from array import array
+
+import pytest
+
+from smartdeck.vault import LemmaTable, MappedLemmaTable, Vault
+
+
+def test_intern_is_stable_and_dense_per_language(tmp_path):
+    v = Vault(tmp_path / "lex.db")
+    assert v.intern_lemmas("en", ["cat", "dog", "cat"]) == [0, 1, 0]
+    assert v.intern_lemmas("en", ["bird", "dog"]) == [2, 1]
+    # every language gets its own id space
+    assert v.intern_lemmas("de", ["hund"]) == [0]
+    assert v.lemma_table("en").lemmas == ["cat", "dog", "bird"]
+
+
+def test_added_words_are_interned(tmp_path):
+    v = Vault(tmp_path / "lex.db")
+    v.intern_lemmas("en", ["cat"])
+    v.add_words("en", iter(["dog", "cat", "dog"]), kind="deck", ident="D")
+    assert v.intern_lemmas("en", ["dog", "cat", "eel"]) == [1, 0, 2]
+
+
+def test_interned_ids_survive_source_removal(tmp_path):
+    v = Vault(tmp_path / "lex.db")
+    v.intern_lemmas("en", ["fox"])
+    v.add_words("en", ["wolf"], kind="deck", ident="D")
+    v.remove_source("deck", "D")
+    assert v.intern_lemmas("en", ["wolf", "fox"]) == [1, 0]
+
+
+def test_mapped_table_keeps_interned_ids(tmp_path):
+    v = Vault(tmp_path / "lex.db")
+    words = ["über", "apple", "zebra", "Apfel", "m"]
+    ids = v.intern_lemmas("en", words)
+    path = v.export_lemma_table("en", tmp_path / "en.lex")
+
+    with MappedLemmaTable(path) as table:
+        assert len(table) == len(words)
+        assert table.encode(words) == array("I", ids)
+        assert table.decode(ids) == words
+        assert "zebra" in table and "nope" not in table
+        assert table.get("nope") is None
+        with pytest.raises(KeyError):
+            table.encode(["nope"])
+
+
+def test_empty_table_maps(tmp_path):
+    path = LemmaTable().write(tmp_path / "empty.lex")
+    with MappedLemmaTable(path) as table:
+        assert len(table) == 0
+        assert table.get("x") is None
+
+
+def test_rejects_foreign_files(tmp_path):
+    bogus = tmp_path / "bogus.lex"
+    bogus.write_bytes(b"not a lemma table at all")
+    with pytest.raises(ValueError):
+        MappedLemmaTable(bogus)
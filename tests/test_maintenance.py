@@ -0,0 +1,106 @@
+import sqlite3
+
+from typer.testing import CliRunner
+
+from smartdeck import cli
+from smartdeck.vault import Vault, maintenance
+
+
+def _churned_vault(path, words=3000):
+    v = Vault(path)
+    v.add_words("en", [f"keep{i}" for i in range(100)], kind="deck", ident="keep")
+    v.add_words(
+        "en",
+        [f"word{i}-{'x' * 40}" for i in range(words)],
+        kind="deck",
+        ident="churn",
+        occurrences={f"word{i}-{'x' * 40}": ("e" * 200, "p") for i in range(words)},
+    )
+    v.remove_source("deck", "churn")
+    return v
+
+
+def test_new_vaults_use_incremental_vacuum(tmp_path):
+    v = Vault(tmp_path / "v.db")
+    with v._conn() as con:
+        assert con.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_optimize_reclaims_pages_and_checks(tmp_path):
+    v = _churned_vault(tmp_path / "v.db")
+    report = v.optimize()
+    assert report["before"]["freelist_count"] > 0
+    assert report["after"]["freelist_count"] == 0
+    assert report["after"]["page_count"] < report["before"]["page_count"]
+    assert report["after"]["size_bytes"] < report["before"]["size_bytes"]
+    assert report["vacuumed_pages"] == report["before"]["freelist_count"]
+    assert report["analyzed"] and report["problems"] == []
+    assert "known_words" in report["checked"] and report["unchecked"] == []
+    assert v.coverage("en", ["keep1"])[0] == 1.0
+    with v._conn() as con:
+        assert con.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+
+
+def test_zero_budget_resumes_integrity_checks(tmp_path):
+    v = Vault(tmp_path / "v.db")
+    first = v.optimize(budget=0)
+    assert first["checked"] == [] and not first["analyzed"]
+    assert first["unchecked"]
+
+
+def test_full_vacuum_converts_legacy_vault(tmp_path):
+    path = tmp_path / "legacy.db"
+    con = sqlite3.connect(path)
+    con.execute("CREATE TABLE t(x)")  # auto_vacuum is fixed from here on
+    con.close()
+    v = Vault(path)
+    assert v.optimize()["vacuumed_pages"] == 0
+    v.optimize(full=True)
+    with v._conn() as con:
+        assert con.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+
+
+def test_auto_trigger(tmp_path, monkeypatch):
+    calls = []
+    real = maintenance.optimize
+    monkeypatch.setattr(
+        maintenance, "optimize", lambda *a, **k: calls.append(k) or real(*a, **k)
+    )
+    _churned_vault(tmp_path / "off.db")
+    assert calls == []
+    monkeypatch.setenv("SMARTDECK_AUTO_OPTIMIZE", "1")
+    v = _churned_vault(tmp_path / "on.db")
+    assert calls and calls[0]["integrity"] is False
+    with v._conn() as con:
+        assert con.execute("PRAGMA freelist_count").fetchone()[0] == 0
+
+
+def test_cli_vault_optimize(tmp_path, monkeypatch):
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "cli.db"))
+    _churned_vault(tmp_path / "cli.db")
+    result = CliRunner().invoke(cli.app, ["vault", "optimize"])
+    assert result.exit_code == 0, result.output
+    assert "freelist_count" in result.output and "Integrity:" in result.output
+
+
+def test_optimize_on_a_vault_over_the_startup_backfill_threshold(tmp_path, monkeypatch):
+    from smartdeck.vault import migrations
+
+    db = tmp_path / "big.db"
+    con = sqlite3.connect(db)
+    con.executescript(migrations._BASE_SCHEMA)
+    con.executemany(
+        "INSERT INTO known_words(lang, lemma) VALUES('en', ?)",
+        ((f"w{i}",) for i in range(migrations.STARTUP_BACKFILL_ROWS + 10_000)),
+    )
+    con.execute("INSERT INTO sources(kind, ident) VALUES('deck', 'gone')")
+    con.commit()
+    con.close()
+
+    v = Vault(db)
+    assert [m.version for m in v.deferred_backfills] == [3]
+    assert v.optimize(budget=30)["problems"] == []
+    monkeypatch.setenv("SMARTDECK_AUTO_OPTIMIZE", "1")
+    monkeypatch.setattr(maintenance, "AUTO_FREE_RATIO", 0.0)
+    v.remove_source("deck", "gone")
+    assert v.list_sources() == []
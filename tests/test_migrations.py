@@ -0,0 +1,99 @@
+import sqlite3
+
+from typer.testing import CliRunner
+
+from smartdeck import cli
+from smartdeck.vault import Vault, migrations
+from smartdeck.vault.migrations import LATEST_VERSION
+
+
+def _legacy_vault(path, words):
+    """A pre-migration vault: base tables only, user_version 0."""
+    con = sqlite3.connect(path)
+    con.executescript(migrations._BASE_SCHEMA)
+    con.executemany(
+        "INSERT INTO known_words(lang, lemma) VALUES(?, ?)",
+        ((("en", "de")[i % 2], f"w{i}") for i in range(words)),
+    )
+    con.commit()
+    con.close()
+
+
+def _interned(path, lang):
+    with sqlite3.connect(path) as con:
+        return con.execute(
+            "SELECT COUNT(*) FROM lemma_ids WHERE lang=?", (lang,)
+        ).fetchone()[0]
+
+
+def test_new_vault_is_latest(tmp_path):
+    v = Vault(tmp_path / "new.db")
+    assert v.schema_version == LATEST_VERSION
+
+
+def test_startup_only_reads_version(tmp_path, monkeypatch):
+    Vault(tmp_path / "v.db")
+    calls = []
+    monkeypatch.setattr(migrations, "migrate", lambda *a, **k: calls.append(a))
+    Vault(tmp_path / "v.db")
+    assert calls == []
+
+
+def test_small_legacy_vault_migrates_on_open(tmp_path):
+    _legacy_vault(tmp_path / "old.db", 100)
+    v = Vault(tmp_path / "old.db")
+    assert v.schema_version == LATEST_VERSION
+    assert _interned(v.db_path, "en") == 50
+    assert v.intern_lemmas("de", ["w1", "new"]) == [0, 50]
+
+
+def test_large_backfill_is_deferred_then_batched(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrations, "STARTUP_BACKFILL_ROWS", 10)
+    _legacy_vault(tmp_path / "big.db", 1000)
+    v = Vault(tmp_path / "big.db")
+    # later schema steps still apply; only the backfill waits
+    assert v.schema_version == LATEST_VERSION
+    assert [m.version for m in v.deferred_backfills] == [3]
+    assert v.coverage("en", ["w0", "w1"])[0] == 0.5
+
+    seen = []
+    assert (
+        v.migrate(batch_size=300, progress=lambda m, n: seen.append(n))
+        == LATEST_VERSION
+    )
+    assert seen == [300, 600, 900, 1000]
+    assert _interned(v.db_path, "en") == _interned(v.db_path, "de") == 500
+    assert v.deferred_backfills == []
+    assert v.migrate() == LATEST_VERSION  # nothing left to do
+
+
+def test_deferred_backfill_counts_only_missing_rows_and_startup_stays_cheap(
+    tmp_path, monkeypatch
+):
+    monkeypatch.setattr(migrations, "STARTUP_BACKFILL_ROWS", 10)
+    _legacy_vault(tmp_path / "big.db", 100)
+    Vault(tmp_path / "big.db")
+    calls = []
+    monkeypatch.setattr(migrations, "migrate", lambda *a, **k: calls.append(a))
+    Vault(tmp_path / "big.db")
+    assert calls == []  # the deferral is remembered
+
+    con = sqlite3.connect(tmp_path / "big.db")
+    backlog = migrations.MIGRATIONS[2].backlog
+    assert con.execute(backlog).fetchone()[0] == 100
+    con.execute("INSERT INTO lemma_ids(lang, id, lemma) VALUES('en', 0, 'w0')")
+    assert con.execute(backlog).fetchone()[0] == 99
+    con.close()
+
+
+def test_cli_vault_migrate(tmp_path, monkeypatch):
+    monkeypatch.setattr(migrations, "STARTUP_BACKFILL_ROWS", 0)
+    db = tmp_path / "cli.db"
+    _legacy_vault(db, 20)
+    monkeypatch.setenv("SMARTDECK_DB", str(db))
+    runner = CliRunner()
+    result = runner.invoke(cli.app, ["vault", "migrate"])
+    assert result.exit_code == 0, result.output
+    assert "Ran deferred backfills (3)" in result.output
+    result = runner.invoke(cli.app, ["vault", "migrate"])
+    assert f"up to date (version {LATEST_VERSION})" in result.output
@@ -1,25 +1,50 @@
-from smartdeck.utils.pagespec import parse_pagespec, virtual_split
 import pytest
 
+from smartdeck.utils.pagespec import iter_virtual_pages, parse_pagespec, virtual_split
+
+
 def test_empty_and_whitespace_tokens():
     # stray commas or spaces are ignored
     assert parse_pagespec(" 1 ,  , 3-4 , ", total_pages=5) == [0, 2, 3]
 
+
 def test_out_of_range_pages_dropped():
     # pages beyond total_pages are silently removed
     assert parse_pagespec("1-10", total_pages=3) == [0, 1, 2]
 
+
 def test_invalid_format_raises():
     with pytest.raises(ValueError):
         parse_pagespec("abc,5")
 
+
 def test_virtual_split_exact():
     text = "a b c d"
     # exactly 2 words per chunk
     assert virtual_split(text, 2) == ["a b", "c d"]
 
+
 def test_virtual_split_tail():
     text = "one two three"
     # final chunk shorter than N is kept
     assert virtual_split(text, 2) == ["one two", "three"]
 
+
+def test_iter_virtual_pages_crosses_page_boundaries():
+    pages = ["a b c", "d", "e f g h"]
+    assert list(iter_virtual_pages(pages, 3)) == ["a b c", "d e f", "g h"]
+    # same result as joining everything up front
+    assert list(iter_virtual_pages(pages, 3)) == virtual_split(" ".join(pages), 3)
+
+
+def test_iter_virtual_pages_stops_after_requested_range():
+    consumed = []
+
+    def pages():
+        for text in ["a b", "c d", "e f", "g h"]:
+            consumed.append(text)
+            yield text
+
+    # virtual page 2 of 2-word pages lives entirely in the second source page
+    assert list(iter_virtual_pages(pages(), 2, "2")) == ["c d"]
+    assert consumed == ["a b", "c d"]
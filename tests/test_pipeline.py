@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from smartdeck.deck.excerpt import capture_excerpts
+from smartdeck.enrich.ipa import IpaService
+from smartdeck.pipeline import StagedExecutor, enrich_entries
+from smartdeck.utils.profiling import Profiler
+from smartdeck.vault import Vault
+
+
+def fake_ipa(lang, lemmas):
+    return [f"/{lemma}/" for lemma in lemmas]
+
+
+def fake_translate(text, src, dest):
+    return f"{dest}:{text[::-1]}"
+
+
+def test_all_items_pass_every_stage():
+    pipe = StagedExecutor(maxsize=2)
+    pipe.add_stage("double", lambda x: x * 2, workers=3)
+    pipe.add_stage("inc", lambda x: x + 1, workers=2)
+    assert sorted(pipe.run(range(100))) == [x * 2 + 1 for x in range(100)]
+
+
+def test_stages_overlap_with_the_source():
+    started = threading.Event()
+
+    def source():
+        yield 1
+        # the stage must pick item 1 up while the source is still running
+        assert started.wait(timeout=5)
+        yield 2
+
+    def stage(x):
+        started.set()
+        return x
+
+    assert sorted(StagedExecutor(maxsize=1).add_stage("s", stage).run(source())) == [
+        1,
+        2,
+    ]
+
+
+def test_stage_errors_propagate():
+    def boom(x):
+        if x == 3:
+            raise ValueError("bad item")
+        return x
+
+    pipe = StagedExecutor(maxsize=1).add_stage("boom", boom, workers=2)
+    with pytest.raises(ValueError, match="bad item"):
+        pipe.run(range(50))
+
+
+def test_enrich_entries_matches_sequential_build(tmp_path):
+    texts = [
+        "The quick fox jumps. A lazy dog sleeps!",
+        "Nobody saw the owl. Where is the fox?",
+    ]
+    top = ["owl", "dog", "fox", "zebra"]
+    pos = {"owl": "NOUN", "dog": "NOUN", "fox": "NOUN"}
+    ipa = IpaService(Vault(tmp_path / "p.db"), workers=1, transliterate=fake_ipa)
+
+    entries, occ = enrich_entries(
+        texts, top, pos, "en", fake_translate, ipa, Profiler(), workers=3, queue_size=1
+    )
+
+    expected_occ = capture_excerpts(texts, top)
+    assert occ == expected_occ
+    assert entries == [
+        (
+            lemma,
+            fake_translate(lemma, "en", "de"),
+            f"/{lemma}/",
+            pos.get(lemma, ""),
+            expected_occ[lemma][0],
+            fake_translate(expected_occ[lemma][0], "en", "de"),
+            expected_occ[lemma][1],
+        )
+        for lemma in top
+    ]
@@ -1,7 +1,9 @@
 # tests/test_processing.py
 
 import pytest
-from smartdeck.nlp.processing import tokenize_lemmas, WordInfo
+
+from smartdeck.nlp.processing import WordInfo, tokenize_lemmas
+
 
 def test_tokenize_simple_sentence():
     texts = ["Cats are running! 123"]
@@ -13,6 +15,7 @@ def test_tokenize_simple_sentence():
     # POS tags should be valid strings
     assert all(isinstance(w["pos"], str) for w in infos)
 
+
 def test_non_alpha_filtered_out():
     texts = ["hello #world 42!"]
     infos = tokenize_lemmas(texts, lang="en")
@@ -22,3 +25,85 @@ def test_non_alpha_filtered_out():
     # numeric tokens never appear
     assert not any(w["lemma"].isdigit() for w in infos)
 
+
+class _RecordingNLP:
+    """spaCy stand-in: one token per word, remembering every input length."""
+
+    def __init__(self):
+        self.sizes = []
+
+    def pipe(self, texts, batch_size=20):
+        import re
+        from types import SimpleNamespace as Tok
+
+        for text in texts:
+            self.sizes.append(len(text))
+            yield [
+                Tok(text=w, lemma_=w, pos_="X", is_alpha=True)
+                for w in re.findall(r"[A-Za-z]+", text)
+            ]
+
+
+def test_chunk_text_cuts_at_sentence_ends():
+    from smartdeck.nlp.processing import chunk_text
+
+    text = "One two three. Four five six! Seven eight nine? Ten"
+    chunks = chunk_text(text, limit=20)
+    assert "".join(chunks) == text
+    assert chunks[:3] == ["One two three. ", "Four five six! ", "Seven eight nine? "]
+    # no sentence end in reach: fall back to a space, then a hard cut
+    assert chunk_text("aaaa bbbb cccc", limit=6) == ["aaaa ", "bbbb ", "cccc"]
+    assert chunk_text("x" * 10, limit=4) == ["xxxx", "xxxx", "xx"]
+    assert chunk_text("short", limit=100) == ["short"]
+
+
+def test_oversized_pages_are_chunked_and_stitched(monkeypatch):
+    from smartdeck.nlp import processing
+
+    nlp = _RecordingNLP()
+    monkeypatch.setattr(processing, "_spacy_model", lambda lang: nlp)
+    big = " ".join(f"Sentence number{i} ends here." for i in range(500))
+    texts = ["Tiny page.", big, "", "Last page here."]
+    whole = processing.tokenize_pages(texts, lang="en")
+
+    monkeypatch.setattr(processing, "CHUNK_CHARS", 1000)
+    nlp.sizes.clear()
+    chunked = processing.tokenize_pages(texts, lang="en")
+    assert max(nlp.sizes) <= 1000 and len(nlp.sizes) > len(texts)
+    assert chunked == whole and len(chunked) == 4 and chunked[2] == []
+
+
+def test_one_model_is_never_run_by_two_threads_at_once(monkeypatch):
+    import threading
+    import time
+
+    from smartdeck.nlp import processing
+
+    class _Exclusive(_RecordingNLP):
+        active = peak = 0
+
+        def pipe(self, texts, batch_size=20):
+            _Exclusive.active += 1
+            _Exclusive.peak = max(_Exclusive.peak, _Exclusive.active)
+            time.sleep(0.01)
+            docs = list(super().pipe(texts, batch_size))
+            _Exclusive.active -= 1
+            return docs
+
+    monkeypatch.setattr(processing, "_spacy_model", lambda lang: _Exclusive())
+    monkeypatch.setattr(processing, "BATCH_CHUNKS", 2)
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(
+                processing.tokenize_pages([f"page {i}" for i in range(6)], lang="fr")
+            )
+        )
+        for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert len(results) == 4 and all(len(pages) == 6 for pages in results)
+    assert _Exclusive.peak == 1
@@ -0,0 +1,92 @@
+import json
+import pstats
+
+from smartdeck.utils.profiling import Profiler, profile_dump
+
+
+def test_stages_accumulate_counts_and_time():
+    prof = Profiler()
+    for _ in range(2):
+        with prof.stage("extract") as st:
+            st.add(3)
+    with prof.stage("ipa") as st:
+        st.hit(3)
+        st.miss()
+
+    extract, ipa = prof.stages["extract"], prof.stages["ipa"]
+    assert extract.calls == 2 and extract.items == 6
+    assert extract.wall >= 0 and extract.cpu >= 0
+    assert ipa.hit_rate == 0.75
+    assert list(prof.stages) == ["extract", "ipa"]
+
+
+def test_listeners_receive_start_and_end_events():
+    events = []
+    prof = Profiler(listeners=[events.append])
+    with prof.stage("coverage") as st:
+        st.add(10)
+    assert [(e["event"], e["stage"]) for e in events] == [
+        ("start", "coverage"),
+        ("end", "coverage"),
+    ]
+    assert events[-1]["items"] == 10
+
+
+def test_stage_recorded_even_when_it_raises():
+    prof = Profiler()
+    try:
+        with prof.stage("translate"):
+            raise RuntimeError("network down")
+    except RuntimeError:
+        pass
+    assert prof.stages["translate"].calls == 1
+
+
+def test_table_and_json_report(tmp_path):
+    prof = Profiler()
+    with prof.stage("lemmatize") as st:
+        st.add(42)
+    table = prof.format_table()
+    assert "lemmatize" in table and "42" in table and "total" in table
+
+    out = tmp_path / "profile.json"
+    prof.write_json(out)
+    data = json.loads(out.read_text())
+    assert data["stages"][0]["stage"] == "lemmatize"
+    assert data["stages"][0]["items"] == 42
+
+
+def test_cprofile_dump(tmp_path):
+    out = tmp_path / "run.prof"
+    with profile_dump(out):
+        sum(range(1000))
+    assert pstats.Stats(str(out)).total_calls > 0
+
+
+def test_concurrent_calls_count_wall_time_once_and_items_exactly():
+    import threading
+    import time
+
+    prof = Profiler()
+    barrier = threading.Barrier(4)
+
+    def work():
+        with prof.stage("translate") as st:
+            barrier.wait()
+            for _ in range(10_000):
+                st.add()
+            time.sleep(0.05)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    t0 = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - t0
+
+    st = prof.stages["translate"]
+    assert st.calls == 4 and st.items == 40_000
+    assert st.wall <= elapsed <= prof.total_wall
+    assert st.busy >= 4 * 0.05 > st.wall
+    assert "busy s" in prof.format_table()
@@ -0,0 +1,72 @@
+from smartdeck.deck.excerpt import capture_excerpts
+from smartdeck.deck.ranking import lemma_forms, rank_excerpts
+
+
+def test_prefers_sentence_where_target_is_only_unknown():
+    pages = [
+        "The zorble ate a quixotic flan. Cats chase mice all day.",
+        "We saw the zorble near the house today.",
+    ]
+    known = {
+        "the",
+        "ate",
+        "a",
+        "cats",
+        "chase",
+        "mice",
+        "all",
+        "day",
+        "we",
+        "see",
+        "near",
+        "house",
+        "today",
+    }
+    first = capture_excerpts(pages, ["zorble"])
+    ranked = rank_excerpts(pages, ["zorble"], known, forms={"saw": "see"})
+    assert first["zorble"][1] == "1:1"
+    assert ranked["zorble"] == ("We saw the zorble near the house today.", "2:1")
+
+
+def test_surface_forms_map_to_target_lemma():
+    pages = ["Run fast now please. The dogs were running home quickly today."]
+    known = {"the", "dog", "be", "home", "quickly", "today", "fast", "now", "please"}
+    forms = lemma_forms(
+        [
+            {"lemma": "dog", "pos": "NOUN", "text": "dogs"},
+            {"lemma": "be", "pos": "AUX", "text": "were"},
+            {"lemma": "run", "pos": "VERB", "text": "running"},
+            {"lemma": "run", "pos": "VERB", "text": "Run"},
+        ]
+    )
+    occ = rank_excerpts(pages, ["run"], known, forms)
+    assert occ["run"] == ("Run fast now please.", "1:1")
+
+
+def test_ties_prefer_longer_context_and_missing_lemmas_fall_back():
+    pages = ["Blorp. A blorp sat on the mat.", "Odd glimmerish text"]
+    occ = rank_excerpts(pages, ["blorp", "glimmer"], {"a", "sat", "on", "the", "mat"})
+    assert occ["blorp"][1] == "1:2"
+    assert occ["glimmer"][1] == "2:?"
+
+
+def test_clips_long_sentences_around_target():
+    sentence = "Lorem " + "a" * 200 + " gegessen Ende."
+    occ = rank_excerpts([sentence], ["gegessen"], set())
+    assert "gegessen" in occ["gegessen"][0] and len(occ["gegessen"][0]) <= 123
+
+
+def test_capitalised_german_noun_lemmas_match_their_sentences():
+    pages = ["Das Haus ist sehr alt und groß. Wir sehen Häuser und das Haus heute."]
+    forms = lemma_forms(
+        [
+            {"lemma": "Haus", "pos": "NOUN", "text": "Haus"},
+            {"lemma": "Haus", "pos": "NOUN", "text": "Häuser"},
+            {"lemma": "sehen", "pos": "VERB", "text": "sehen"},
+        ]
+    )
+    known = {"das", "ist", "sehr", "und", "wir", "sehen", "heute"}
+    occ = rank_excerpts(pages, ["Haus", "haus"], known, forms)
+    # "alt" and "groß" are unknown in the first sentence, nothing else in the second
+    expected = ("Wir sehen Häuser und das Haus heute.", "1:2")
+    assert occ["Haus"] == occ["haus"] == expected
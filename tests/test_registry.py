@@ -0,0 +1,102 @@
+import importlib.util
+import threading
+
+import pytest
+
+from smartdeck.nlp.registry import LANGUAGES, ModelRegistry, spec_for
+
+MB = 2**20
+
+
+class _FakeMemory:
+    """Loader + RSS probe where every model "costs" its configured size."""
+
+    def __init__(self, sizes):
+        self.sizes, self.rss, self.loads = sizes, 0, []
+
+    def load(self, spec):
+        self.loads.append(spec.lang)
+        self.rss += self.sizes[spec.lang]
+        return object()
+
+    def measure(self):
+        return self.rss
+
+
+def test_languages_are_declared_and_unknown_falls_back():
+    assert LANGUAGES["de"].backend == "stanza"
+    assert LANGUAGES["fr"].name == "fr_core_news_sm"
+    assert spec_for("XX").lang == "en" and spec_for("DE").lang == "de"
+
+
+def test_lazy_load_and_cache_hit():
+    mem = _FakeMemory({"en": 50 * MB})
+    reg = ModelRegistry(budget=None, loader=mem.load, measure=mem.measure)
+    assert reg.loaded() == []
+    model = reg.get("en")
+    assert reg.get("en") is model and reg.get("xx") is model
+    assert mem.loads == ["en"] and reg.loaded() == [("en", 50 * MB)]
+
+
+def test_lru_eviction_under_budget():
+    mem = _FakeMemory({"en": 60 * MB, "fr": 60 * MB, "es": 60 * MB, "de": 600 * MB})
+    reg = ModelRegistry(budget=150 * MB, loader=mem.load, measure=mem.measure)
+    reg.get("en")
+    reg.get("fr")
+    reg.get("en")  # fr is now LRU
+    reg.get("es")
+    assert [lang for lang, _ in reg.loaded()] == ["en", "es"]
+    # a model over budget on its own still loads, alone
+    reg.get("de")
+    assert [lang for lang, _ in reg.loaded()] == ["de"]
+
+
+def test_budget_from_environment(monkeypatch):
+    mem = _FakeMemory({"en": 60 * MB, "fr": 60 * MB})
+    reg = ModelRegistry(loader=mem.load, measure=mem.measure)
+    monkeypatch.setenv("SMARTDECK_MODEL_BUDGET_MB", "100")
+    reg.get("en")
+    reg.get("fr")
+    assert [lang for lang, _ in reg.loaded()] == ["fr"]
+    monkeypatch.setenv("SMARTDECK_MODEL_BUDGET_MB", "0")
+    reg.get("en")
+    assert len(reg.loaded()) == 2
+
+
+def test_preload_loads_once_in_background():
+    gate = threading.Event()
+    loads = []
+
+    def slow_load(spec):
+        gate.wait(5)
+        loads.append(spec.lang)
+        return spec.lang
+
+    reg = ModelRegistry(loader=slow_load, measure=lambda: None)
+    thread = reg.preload("fr")
+    gate.set()
+    assert reg.get("fr") == "fr"
+    thread.join(5)
+    assert loads == ["fr"]
+    assert reg.loaded() == [("fr", LANGUAGES["fr"].approx_mb * MB)]
+
+
+def test_load_errors_surface_on_get():
+    def broken(spec):
+        raise OSError(f"model {spec.name} not installed")
+
+    reg = ModelRegistry(loader=broken)
+    reg.preload("it").join(5)
+    with pytest.raises(OSError, match="it_core_news_sm"):
+        reg.get("it")
+
+
+def test_installed_models_are_detected(monkeypatch, tmp_path):
+    from smartdeck.nlp import registry
+
+    monkeypatch.setattr("spacy.util.is_package", lambda name: name == "fr_core_news_sm")
+    monkeypatch.setenv("STANZA_RESOURCES_DIR", str(tmp_path))
+    assert registry.installed_languages() == ["fr"]
+    if importlib.util.find_spec("stanza") is not None:
+        (tmp_path / "de").mkdir()
+        assert registry.installed_languages() == ["de", "fr"]
@@ -0,0 +1,105 @@
+import sqlite3
+
+import pytest
+from typer.testing import CliRunner
+
+from smartdeck import cli
+from smartdeck.vault import Vault
+from smartdeck.vault.snapshot import export_vault, import_vault
+
+
+def _contents(v):
+    with v._conn() as con:
+        return {
+            "words": con.execute(
+                "SELECT id, lang, lemma FROM known_words ORDER BY id"
+            ).fetchall(),
+            "links": con.execute(
+                "SELECT k.lemma, s.kind, s.ident FROM word_sources ws "
+                "JOIN known_words k ON k.id = ws.word_id "
+                "JOIN sources s ON s.id = ws.src_id ORDER BY 1, 2, 3"
+            ).fetchall(),
+            "occ": con.execute(
+                "SELECT k.lemma, o.excerpt, o.location FROM occurrences o "
+                "JOIN known_words k ON k.id = o.word_id ORDER BY 1"
+            ).fetchall(),
+        }
+
+
+@pytest.fixture
+def vault(tmp_path):
+    v = Vault(tmp_path / "src.db")
+    v.intern_lemmas("en", ["zebra", "apple"])
+    v.add_words(
+        "en",
+        [f"w{i}" for i in range(300)] + ["apple"],
+        kind="deck",
+        ident="A",
+        occurrences={"w3": ("the w3 excerpt", "p. 1"), "w7": ("ünïcode", None)},
+    )
+    v.add_words("en", ["w5", "x"], kind="book", ident="/books/b.epub")
+    v.add_words("de", ["haus"], kind="deck", ident="A-de")
+    v.remove_source("deck", "nothing")
+    return v
+
+
+@pytest.mark.parametrize("suffix", [".sdv", ".db"])
+def test_roundtrip(vault, tmp_path, suffix):
+    snap = export_vault(vault, tmp_path / f"snap{suffix}")
+    target = Vault(tmp_path / "dst.db")
+    target.add_words("en", ["stale"], kind="deck", ident="old")
+    import_vault(target, snap)
+
+    assert _contents(target) == _contents(vault)
+    assert target.list_sources() == vault.list_sources()
+    # interned ids travel with the snapshot
+    assert target.intern_lemmas("en", ["zebra", "apple"]) == [0, 1]
+    assert target.coverage("en", ["w1", "x", "nope"])[0] == pytest.approx(2 / 3)
+
+
+def test_columnar_keeps_single_and_empty_lemmas(tmp_path):
+    v = Vault(tmp_path / "src.db")
+    v.add_words("fr", [""], kind="deck", ident="F")
+    v.add_words("it", ["solo"], kind="deck", ident="I")
+    v.add_words("es", ["", "hola"], kind="deck", ident="E")
+    target = Vault(tmp_path / "dst.db")
+    import_vault(target, export_vault(v, tmp_path / "snap.sdv"))
+    assert _contents(target) == _contents(v)
+    assert target.intern_lemmas("fr", [""]) == [0]
+    assert target.intern_lemmas("es", ["hola", ""]) == [1, 0]
+
+
+def test_columnar_is_compact(vault, tmp_path):
+    sdv = export_vault(vault, tmp_path / "snap.sdv")
+    db = export_vault(vault, tmp_path / "snap.db")
+    assert sdv.stat().st_size * 10 < db.stat().st_size
+
+
+def test_rejects_foreign_files(vault, tmp_path):
+    bad = tmp_path / "bad.sdv"
+    bad.write_bytes(b"nope" * 10)
+    with pytest.raises(ValueError):
+        import_vault(vault, bad)
+    other = tmp_path / "other.db"
+    sqlite3.connect(other).execute("CREATE TABLE t(x)")
+    with pytest.raises(ValueError):
+        import_vault(vault, other)
+
+
+def test_cli_export_import(vault, tmp_path, monkeypatch):
+    runner = CliRunner()
+    monkeypatch.setenv("SMARTDECK_DB", str(vault.db_path))
+    result = runner.invoke(cli.app, ["vault", "export", str(tmp_path / "s.sdv")])
+    assert result.exit_code == 0, result.output
+
+    monkeypatch.setenv("SMARTDECK_DB", str(tmp_path / "new.db"))
+    Vault().add_words("en", ["old"], kind="deck", ident="x")
+    result = runner.invoke(
+        cli.app, ["vault", "import", str(tmp_path / "s.sdv")], input="n\n"
+    )
+    assert result.exit_code != 0
+    result = runner.invoke(
+        cli.app, ["vault", "import", str(tmp_path / "s.sdv"), "--yes"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "303 known words" in result.output
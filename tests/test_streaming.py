@@ -0,0 +1,99 @@
+import random
+from collections import Counter
+
+from smartdeck.analysis.streaming import SpillCounter, merge_join, stream_coverage
+from smartdeck.vault.db import Vault
+
+
+def _lemmas(n, seed=0):
+    rng = random.Random(seed)
+    words = [f"w{i}" for i in range(300)] + ["Paris", "paris", "Élan", "zebra"]
+    return [rng.choice(words) for _ in range(n)]
+
+
+def test_spill_counter_merges_runs_back_into_one_count(tmp_path):
+    lemmas = _lemmas(5_000)
+    with SpillCounter(tmp_path, max_entries=50) as counter:
+        counter.update(lemmas)
+        merged = list(counter.merged())
+        assert counter.spills > 1 and counter.total == len(lemmas)
+        assert list(tmp_path.iterdir())
+    assert not list(tmp_path.iterdir())  # run files are removed on close
+    assert merged == sorted(merged)
+    assert {raw: n for _, raw, n in merged} == Counter(lemmas)
+
+
+def test_memory_cap_forces_a_spill_before_max_entries(tmp_path):
+    rss = iter([10, 10, 500, 10, 10, 10])
+    counter = SpillCounter(
+        tmp_path,
+        max_entries=10**6,
+        memory_cap=100,
+        check_every=2,
+        measure=lambda: next(rss),
+    )
+    counter.update(["a", "b", "c", "d", "e", "f"])
+    assert counter.spills == 1
+    assert [n for _, _, n in counter.merged()] == [1] * 6
+    counter.close()
+
+
+def test_spills_that_free_nothing_back_off(tmp_path):
+    # a resident model keeps RSS over the cap whatever the counter drops
+    rss = [1000]
+    counter = SpillCounter(
+        tmp_path,
+        max_entries=10**6,
+        memory_cap=100,
+        check_every=2,
+        measure=lambda: rss[0],
+    )
+    counter.update(f"w{i}" for i in range(40))
+    assert counter.spills == 1
+    rss[0] = 1300  # grown past 1.25 × what the first spill left
+    counter.update(f"v{i}" for i in range(4))
+    assert counter.spills == 2
+    assert sum(n for _, _, n in counter.merged()) == 44
+    counter.close()
+
+
+def test_merge_join_groups_spellings_and_marks_known():
+    entries = [("apple", "Apple", 1), ("apple", "apple", 2), ("kiwi", "kiwi", 3)]
+    joined = list(merge_join(entries, ["aardvark", "kiwi", "zoo"]))
+    assert [(low, known) for low, _, known in joined] == [
+        ("apple", False),
+        ("kiwi", True),
+    ]
+    assert joined[0][1] == entries[:2]
+
+
+def test_stream_coverage_matches_in_memory_coverage(tmp_path):
+    vault = Vault(tmp_path / "v.db")
+    vault.add_words(
+        "en", [f"w{i}" for i in range(0, 300, 2)] + ["paris"], "manual", "t"
+    )
+    lemmas = _lemmas(20_000, seed=3)
+
+    cov, unknowns, tier = vault.coverage("en", lemmas)
+    res = stream_coverage(
+        iter(lemmas),
+        vault.iter_known_sorted("en"),
+        top=10,
+        spill_dir=tmp_path,
+        max_entries=40,
+    )
+    assert res["spills"] > 1
+    assert res["coverage"] == cov and res["tier"] == tier
+    assert res["total_tokens"] == len(lemmas)
+    assert res["unknown_tokens"] == round((1 - cov) * len(lemmas))
+    assert [n for _, n in res["unknowns"]] == [n for _, n in unknowns.most_common(10)]
+    assert all(unknowns[lemma] == n for lemma, n in res["unknowns"])
+    assert "Paris" not in dict(res["unknowns"])
+
+
+def test_known_lemmas_stream_in_python_string_order(tmp_path):
+    vault = Vault(tmp_path / "v.db")
+    words = ["zebra", "Apple", "apple", "élan", "eagle", "Zulu"]
+    vault.add_words("en", words, "manual", "t")
+    vault.add_words("de", ["aal"], "manual", "t")
+    assert list(vault.iter_known_sorted("en")) == sorted(words)
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+from typer.testing import CliRunner
+
+from smartdeck import cli
+from smartdeck.enrich.translate import (
+    ChainBackend,
+    DictionaryBackend,
+    import_dictionary,
+    make_backend,
+    translate,
+)
+
+TEI = """<?xml version="1.0" encoding="UTF-8"?>
+<TEI xmlns="http://www.tei-c.org/ns/1.0"><text><body>
+  <entry><form><orth>House</orth></form>
+    <sense><cit type="trans"><quote>Haus</quote></cit>
+           <cit type="trans"><quote>Gebäude</quote></cit></sense></entry>
+  <entry><form><orth>tree</orth></form>
+    <sense><cit type="trans"><quote>Baum</quote></cit></sense></entry>
+  <entry><form><orth>empty</orth></form></entry>
+</body></text></TEI>
+"""
+
+
+class Recorder:
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = []
+
+    def translate(self, text, src, dest):
+        self.calls.append(text)
+        return self.answer
+
+
+@pytest.fixture
+def dict_db(tmp_path):
+    tsv = tmp_path / "en-de.tsv"
+    tsv.write_text("# comment\nhouse\tHaus\ndog\tHund\tnoun\nDog\tKöter\nbroken\n")
+    db = tmp_path / "dict.db"
+    assert import_dictionary(tsv, "en", "de", db) == 2
+    return db
+
+
+def test_tsv_import_and_lookup(dict_db):
+    backend = DictionaryBackend(dict_db)
+    assert backend.translate("House", "en", "de") == "Haus"
+    assert backend.translate("dog", "en", "de") == "Hund"  # first entry wins
+    assert backend.translate("cat", "en", "de") is None
+    assert backend.translate("the dog", "en", "de") is None
+    assert backend.translate("dog", "de", "en") is None
+
+
+def test_tei_import(tmp_path):
+    tei = tmp_path / "eng-deu.tei"
+    tei.write_text(TEI, encoding="utf-8")
+    db = tmp_path / "dict.db"
+    assert import_dictionary(tei, "en", "de", db) == 2
+    backend = DictionaryBackend(db)
+    assert backend.translate("house", "en", "de") == "Haus"
+    assert backend.translate("tree", "en", "de") == "Baum"
+    assert backend.translate("empty", "en", "de") is None
+
+
+def test_chain_falls_back_only_on_miss(dict_db):
+    http = Recorder("online")
+    chain = ChainBackend([DictionaryBackend(dict_db), http])
+    assert translate("house", "en", "de", chain) == "Haus"
+    assert translate("cat", "en", "de", chain) == "online"
+    assert http.calls == ["cat"]
+
+
+def test_offline_backend_never_uses_http(dict_db, monkeypatch):
+    monkeypatch.setenv("SMARTDECK_DICT", str(dict_db))
+    backend = make_backend(offline=True)
+    assert translate("dog", "en", "de", backend) == "Hund"
+    assert translate("cat", "en", "de", backend) == ""
+
+    with pytest.raises(FileNotFoundError):
+        make_backend(dict_db.with_name("missing.db"))
+
+
+def test_thousand_lemmas_are_fast(tmp_path):
+    tsv = tmp_path / "big.tsv"
+    tsv.write_text("".join(f"word{i}\tWort{i}\n" for i in range(50_000)))
+    db = tmp_path / "dict.db"
+    import_dictionary(tsv, "en", "de", db)
+    backend = DictionaryBackend(db)
+    lemmas = [f"word{i * 37}" for i in range(1_000)]
+
+    t0 = time.perf_counter()
+    out = [backend.translate(lemma, "en", "de") for lemma in lemmas]
+    assert time.perf_counter() - t0 < 0.5
+    assert out[1] == "Wort37"
+
+
+def test_cli_dict_import(tmp_path):
+    tsv = tmp_path / "en-de.tsv"
+    tsv.write_text("house\tHaus\n")
+    db = tmp_path / "dict.db"
+    result = CliRunner().invoke(
+        cli.app,
+        ["dict", "import", str(tsv), "--src", "en", "--dest", "de", "--db", str(db)],
+    )
+    assert result.exit_code == 0, result.output
+    assert "Imported 1 en→de entries." in result.output
+    assert DictionaryBackend(db).translate("house", "en", "de") == "Haus"